@@ -14,8 +14,11 @@ from datetime import datetime
 
 from agents import Agent, Runner, function_tool
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from database.connection import engine
+from database.connection import engine, get_async_engine
+from database.reminder_schedule import sync_reminder_schedule
+from database.task_version import bump_task_version, record_task_deletions
 from models.todo_models import Task, TaskStatus, Message, MessageRole, Conversation
 
 
@@ -63,6 +66,10 @@ def add_task(user_id: str, title: str, description: str = "", due_date: str = No
                 due_date=parsed_due_date
             )
             session.add(task)
+            task.change_version = bump_task_version(session, task.user_id)
+            if task.due_date is not None:
+                session.flush()  # assign task.id
+                sync_reminder_schedule(session, task.user_id, [task.id])
             session.commit()
             session.refresh(task)
 
@@ -126,6 +133,44 @@ def list_tasks(user_id: str, status: str = "all") -> dict:
             return {"error": str(e), "tasks": []}
 
 
+@function_tool
+def search_tasks(user_id: str, query: str) -> dict:
+    """
+    Find tasks by words in their title or description, best matches first.
+
+    Args:
+        user_id: The ID of the user (required)
+        query: Words to look for, e.g. "dentist" (required)
+
+    Returns:
+        Array of matching task objects
+    """
+    from tasks_crud import search_user_tasks
+
+    with Session(engine) as session:
+        try:
+            user_id_int = int(user_id)
+        except ValueError:
+            return {"error": f"Invalid user_id: {user_id}", "tasks": []}
+
+        try:
+            page = search_user_tasks(session, user_id_int, query, limit=10)
+            return {
+                "tasks": [
+                    {
+                        "task_id": task.id,
+                        "title": task.title,
+                        "description": task.description,
+                        "status": task.status.value,
+                        "due_date": task.due_date.isoformat() if task.due_date else None
+                    }
+                    for task in page.items
+                ]
+            }
+        except Exception as e:
+            return {"error": str(e), "tasks": []}
+
+
 @function_tool
 def complete_task(user_id: str, task_id: int) -> dict:
     """
@@ -154,22 +199,17 @@ def complete_task(user_id: str, task_id: int) -> dict:
         try:
             task.status = TaskStatus.completed
             task.updated_at = datetime.utcnow()
+            task.version += 1
             session.add(task)
+            task.change_version = bump_task_version(session, task.user_id)
+            # task-completed event for recurring task processing, committed
+            # with the change and published by the outbox relay
+            from services.event_service import enqueue_task_event
+            from services.outbox_relay import wake_outbox_relay
+            enqueue_task_event(session, "task.completed", task)
+            sync_reminder_schedule(session, task.user_id, [task.id])
             session.commit()
-            session.refresh(task)
-
-            # Publish task-completed event for recurring task processing
-            # Run async event publishing in the background
-            import asyncio
-            from services.event_service import publish_task_completed_event
-
-            try:
-                # Try to get the running event loop
-                loop = asyncio.get_running_loop()
-                loop.create_task(publish_task_completed_event(task))
-            except RuntimeError:
-                # No event loop running, create a new one
-                asyncio.run(publish_task_completed_event(task))
+            wake_outbox_relay()
 
             return {"status": "completed", "task_id": task.id}
         except Exception as e:
@@ -204,6 +244,8 @@ def delete_task(user_id: str, task_id: int) -> dict:
 
         try:
             session.delete(task)
+            record_task_deletions(session, task.user_id, [task.id], bump_task_version(session, task.user_id))
+            sync_reminder_schedule(session, task.user_id, [task.id])
             session.commit()
             return {"status": "deleted", "task_id": task_id}
         except Exception as e:
@@ -250,7 +292,9 @@ def update_task(
                 task.description = description
 
             task.updated_at = datetime.utcnow()
+            task.version += 1
             session.add(task)
+            task.change_version = bump_task_version(session, task.user_id)
             session.commit()
             session.refresh(task)
 
@@ -294,6 +338,7 @@ AGENT_INSTRUCTIONS = """You are a Personal Task Assistant, an AI capable of mana
    - Example: "What do I have to do?" -> call list_tasks with status "pending"
    - Example: "Show all my tasks" -> call list_tasks with status "all"
    - Example: "What have I completed?" -> call list_tasks with status "completed"
+   - When the user refers to a task by its words rather than its ID (e.g. "the dentist one"), call `search_tasks` to find it.
 
 3. **Task Completion:** When a user says "done", "finished", "completed", or marks a task as done, call `complete_task`.
    - Example: "I finished task 3" -> call complete_task with task_id 3
@@ -339,7 +384,7 @@ def create_todo_agent() -> Agent:
     return Agent(
         name="Personal Task Assistant",
         instructions=AGENT_INSTRUCTIONS,
-        tools=[add_task, list_tasks, complete_task, delete_task, update_task],
+        tools=[add_task, list_tasks, search_tasks, complete_task, delete_task, update_task],
         model="gpt-4-turbo"
     )
 
@@ -365,7 +410,7 @@ class TodoAgentRunner:
         self.user_id = user_id
         self.agent = create_todo_agent()
 
-    def load_conversation_history(self, conversation_id: int) -> List[Dict[str, str]]:
+    async def load_conversation_history(self, conversation_id: int) -> List[Dict[str, str]]:
         """
         Load conversation history from the database.
 
@@ -375,11 +420,11 @@ class TodoAgentRunner:
         Returns:
             List of message dicts formatted for the agent
         """
-        with Session(engine) as session:
+        async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
             statement = select(Message).where(
                 Message.conversation_id == conversation_id
             ).order_by(Message.created_at)
-            messages = session.exec(statement).all()
+            messages = (await session.exec(statement)).all()
 
             formatted_messages = []
             for msg in messages:
@@ -391,7 +436,7 @@ class TodoAgentRunner:
 
             return formatted_messages
 
-    def save_message(self, conversation_id: int, role: str, content: str):
+    async def save_message(self, conversation_id: int, role: str, content: str):
         """
         Save a message to the conversation in the database.
 
@@ -400,7 +445,7 @@ class TodoAgentRunner:
             role: The role of the message sender ('user' or 'assistant')
             content: The message content
         """
-        with Session(engine) as session:
+        async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
             message_role = MessageRole.assistant if role == "assistant" else MessageRole.user
             message = Message(
                 conversation_id=conversation_id,
@@ -408,7 +453,7 @@ class TodoAgentRunner:
                 content=content
             )
             session.add(message)
-            session.commit()
+            await session.commit()
 
     async def run(self, user_input: str, conversation_id: int) -> Dict[str, Any]:
         """
@@ -423,7 +468,7 @@ class TodoAgentRunner:
         """
         try:
             # Load conversation history
-            history = self.load_conversation_history(conversation_id)
+            history = await self.load_conversation_history(conversation_id)
 
             # Get current datetime for the agent context
             current_dt = datetime.utcnow()
@@ -450,8 +495,8 @@ class TodoAgentRunner:
             response_text = result.final_output if hasattr(result, 'final_output') else str(result)
 
             # Save messages to database
-            self.save_message(conversation_id, "user", user_input)
-            self.save_message(conversation_id, "assistant", response_text)
+            await self.save_message(conversation_id, "user", user_input)
+            await self.save_message(conversation_id, "assistant", response_text)
 
             return {
                 "response": response_text,
@@ -460,7 +505,7 @@ class TodoAgentRunner:
 
         except Exception as e:
             error_msg = f"I encountered an issue processing your request. Please try again."
-            self.save_message(conversation_id, "assistant", error_msg)
+            await self.save_message(conversation_id, "assistant", error_msg)
             return {
                 "response": error_msg,
                 "conversation_id": conversation_id,
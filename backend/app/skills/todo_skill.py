@@ -10,6 +10,8 @@ from typing import Optional, List, Dict, Any
 from sqlmodel import Session, select
 from datetime import datetime
 
+from backend.database.reminder_schedule import sync_reminder_schedule
+from backend.database.task_version import bump_task_version, record_task_deletions
 from backend.models.todo_models import Task, TaskStatus
 
 
@@ -103,7 +105,11 @@ class TodoManagementSkill:
                 status=TaskStatus.pending,
                 due_date=parsed_due_date
             )
+            task.change_version = bump_task_version(self._session, self._user_id)
             self._session.add(task)
+            if task.due_date is not None:
+                self._session.flush()  # assign task.id
+                sync_reminder_schedule(self._session, self._user_id, [task.id])
             self._session.commit()
             self._session.refresh(task)
 
@@ -242,7 +248,11 @@ class TodoManagementSkill:
                     }
 
             task.updated_at = datetime.utcnow()
+            task.version += 1
             self._session.add(task)
+            task.change_version = bump_task_version(self._session, self._user_id)
+            if "status" in updates:
+                sync_reminder_schedule(self._session, self._user_id, [task.id])
             self._session.commit()
             self._session.refresh(task)
 
@@ -301,7 +311,10 @@ class TodoManagementSkill:
 
             task.status = TaskStatus.completed
             task.updated_at = datetime.utcnow()
+            task.version += 1
             self._session.add(task)
+            task.change_version = bump_task_version(self._session, self._user_id)
+            sync_reminder_schedule(self._session, self._user_id, [task.id])
             self._session.commit()
             self._session.refresh(task)
 
@@ -347,6 +360,8 @@ class TodoManagementSkill:
 
             task_title = task.title
             self._session.delete(task)
+            record_task_deletions(self._session, self._user_id, [task_id], bump_task_version(self._session, self._user_id))
+            sync_reminder_schedule(self._session, self._user_id, [task_id])
             self._session.commit()
 
             return {
@@ -0,0 +1,121 @@
+"""
+Benchmark: task list serialization, ORM + response_model vs. the fast path.
+
+Seeds a throwaway SQLite database with N tasks (two tags each) for one user
+and measures end-to-end rows/sec from query to JSON bytes for:
+
+    orm       select(Task) entities, TaskRead built with validation, then
+              FastAPI's response_model pass (validate, dump to JSON-compatible
+              Python, json.dumps) - the path GET /api/tasks used to take
+    fast      tasks_crud.get_user_tasks (column select, TaskRead.model_construct,
+              one tag query) encoded with serialization.dumps (orjson)
+
+Usage (from backend/):
+    python bench_task_serialization.py [sizes...]     default: 1000 10000 100000
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_db_dir = tempfile.mkdtemp(prefix="bench-tasks-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ["DB_ECHO"] = "false"
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert
+from sqlmodel import Session, select
+
+from database.connection import engine
+from database.migrations import run_migrations
+from models.todo_models import Task, TaskPriority, TaskRead, TaskStatus, TaskTag, User
+from serialization import dumps
+from tasks_crud import get_user_tasks
+
+_TASK_LIST = TypeAdapter(list[TaskRead])
+
+
+def seed(db: Session, user_id: int, count: int):
+    db.exec(delete(TaskTag))
+    db.exec(delete(Task))
+    now = datetime.utcnow()
+    db.exec(insert(Task), params=[
+        {
+            "title": f"Task {i}",
+            "description": f"Description for task {i}",
+            "status": TaskStatus.completed if i % 3 == 0 else TaskStatus.pending,
+            "priority": list(TaskPriority)[i % 4],
+            "due_date": now + timedelta(hours=i),
+            "reminder_sent": False,
+            "version": 1,
+            "change_version": 0,
+            "user_id": user_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ])
+    ids = db.exec(select(Task.id).where(Task.user_id == user_id)).all()
+    db.exec(insert(TaskTag), params=[
+        {"task_id": task_id, "tag": tag, "user_id": user_id} for task_id in ids for tag in ("home", "work")
+    ])
+    db.commit()
+
+
+def orm_path(db: Session, user_id: int) -> bytes:
+    tasks = db.exec(select(Task).where(Task.user_id == user_id).order_by(Task.id)).all()
+    items = [
+        TaskRead(
+            id=task.id, title=task.title, description=task.description, status=task.status,
+            priority=task.priority, due_date=task.due_date, tags=task.tag_names,
+            recurrence=task.recurrence, reminder_sent=task.reminder_sent, version=task.version,
+            user_id=task.user_id, created_at=task.created_at, updated_at=task.updated_at,
+        )
+        for task in tasks
+    ]
+    # What FastAPI does with response_model=List[TaskRead] and JSONResponse
+    validated = _TASK_LIST.validate_python(items)
+    content = _TASK_LIST.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def fast_path(db: Session, user_id: int) -> bytes:
+    return dumps(get_user_tasks(db, user_id))
+
+
+def measure(fn, user_id: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        # Fresh session each run so the ORM path gets no identity-map reuse
+        with Session(engine) as db:
+            start = time.perf_counter()
+            fn(db, user_id)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes):
+    run_migrations(engine)
+    with Session(engine) as db:
+        user = User(email="bench@example.com", name="Bench", password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    print(f"{'tasks':>8} {'orm rows/s':>12} {'fast rows/s':>12} {'speedup':>8}")
+    for count in sizes:
+        with Session(engine) as db:
+            seed(db, user_id, count)
+            assert json.loads(orm_path(db, user_id)) == json.loads(fast_path(db, user_id))
+
+        repeat = 5 if count <= 10000 else 2
+        orm = measure(orm_path, user_id, repeat)
+        fast = measure(fast_path, user_id, repeat)
+        print(f"{count:>8} {count / orm:>12,.0f} {count / fast:>12,.0f} {orm / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,57 @@
+"""
+Schema migrations (Alembic).
+
+The app brings the database up to the latest revision on startup instead of
+calling SQLModel.metadata.create_all, so schema changes such as new indexes
+are versioned and applied exactly once per database.
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+# Revision matching the schema that create_all used to produce
+BASELINE_REVISION = "0001"
+
+
+def get_alembic_config(engine: Engine) -> Config:
+    """
+    Alembic config that runs migrations on the given (shared) engine.
+    """
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.attributes["engine"] = engine
+    return config
+
+
+def run_migrations(engine: Optional[Engine] = None):
+    """
+    Upgrade the database to the latest revision.
+
+    Databases created by the old create_all startup path have the baseline
+    tables but no alembic_version table; they are stamped at the baseline
+    first so only the newer revisions run against them.
+
+    Args:
+        engine: Engine to migrate (defaults to the shared engine)
+    """
+    if engine is None:
+        from .connection import engine
+
+    config = get_alembic_config(engine)
+    tables = set(inspect(engine).get_table_names())
+
+    if "alembic_version" not in tables and "users" in tables:
+        logger.info(f"Existing schema without migration history, stamping revision {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+
+    command.upgrade(config, "head")
@@ -0,0 +1,90 @@
+"""
+Transactional outbox for Dapr events.
+
+Writers call enqueue_events inside the transaction that makes the change;
+the events become visible to the relay (services/outbox_relay.py) exactly
+when the change commits, and vanish with it on rollback. Nothing on the
+request path waits for the sidecar.
+
+Each event is given an event_id when it is written, so every delivery of
+it, including the relay's retries and the broker's redeliveries, carries
+the same ID and subscribers can recognize repeats.
+
+Events are enqueued by the API, the agent tools and the MCP servers, and
+read back by the relay, so _outbox describes just the columns they touch
+with table() instead of going through the OutboxEvent model.
+"""
+
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import DateTime, column, delete, insert, select, table
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+_outbox = table(
+    "outbox", column("id"), column("user_id"), column("topic"), column("payload"), column("created_at", DateTime)
+)
+
+
+def with_event_id(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The payload with a new event_id, unless it already has one
+    """
+    if payload.get("event_id"):
+        return payload
+    return {"event_id": uuid.uuid4().hex, **payload}
+
+
+def _outbox_rows(user_id: int, topic: str, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    return [
+        {"user_id": int(user_id), "topic": topic, "payload": json.dumps(with_event_id(payload)), "created_at": now}
+        for payload in payloads
+    ]
+
+
+def enqueue_events(db: Session, user_id: int, topic: str, payloads: List[Dict[str, Any]]) -> None:
+    """
+    Add events to the outbox inside the caller's transaction.
+
+    Args:
+        db: Database session making the change the events describe
+        user_id: User the events belong to (the relay keeps each user's events in order)
+        topic: Dapr topic to publish to
+        payloads: JSON-serializable event payloads, in publish order
+    """
+    rows = _outbox_rows(user_id, topic, payloads)
+    if rows:
+        with db.no_autoflush:
+            db.exec(insert(_outbox), params=rows)
+
+
+async def enqueue_events_async(db: AsyncSession, user_id: int, topic: str, payloads: List[Dict[str, Any]]) -> None:
+    """
+    Async variant of enqueue_events
+    """
+    rows = _outbox_rows(user_id, topic, payloads)
+    if rows:
+        with db.no_autoflush:
+            await db.exec(insert(_outbox), params=rows)
+
+
+def pending_events_statement(limit: int, skip_users: Iterable[int] = ()):
+    """
+    Oldest outbox rows first, leaving out the given users: (id, user_id, topic, payload)
+    """
+    query = select(_outbox.c.id, _outbox.c.user_id, _outbox.c.topic, _outbox.c.payload)
+    skip_users = list(skip_users)
+    if skip_users:
+        query = query.where(_outbox.c.user_id.notin_(skip_users))
+    return query.order_by(_outbox.c.id).limit(limit)
+
+
+def delete_events_statement(ids: List[int]):
+    """
+    Remove published rows from the outbox
+    """
+    return delete(_outbox).where(_outbox.c.id.in_(ids))
@@ -0,0 +1,227 @@
+"""
+Connection pooling profile for the SQLModel engines.
+
+Pool sizing is chosen by environment settings so the same image can run
+against local SQLite, Neon's direct endpoint or a PgBouncer / Neon pooler
+endpoint without code changes.
+
+Settings (all optional):
+    DB_POOL_PROFILE     default | neon | pgbouncer
+    DB_POOL_SIZE        persistent connections kept per process
+    DB_MAX_OVERFLOW     extra connections allowed above DB_POOL_SIZE
+    DB_POOL_TIMEOUT     seconds to wait for a free connection
+    DB_POOL_RECYCLE     seconds before a connection is replaced (-1 disables)
+    DB_POOL_PRE_PING    true/false, test connections on checkout
+    DB_PGBOUNCER        true/false, disable server-side prepared statements
+    DB_ECHO             true/false, log every SQL statement
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict
+
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlmodel import create_engine
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    pgbouncer: bool = False
+    echo: bool = True
+
+
+# Named profiles; individual DB_* settings override the chosen profile.
+# Neon closes idle connections after ~5 minutes, so recycle before that
+# instead of paying a failed checkout plus a fresh TLS handshake.
+POOL_PROFILES: Dict[str, PoolSettings] = {
+    "default": PoolSettings(),
+    "neon": PoolSettings(pool_size=10, max_overflow=20, pool_recycle=240),
+    "pgbouncer": PoolSettings(pool_size=10, max_overflow=20, pool_recycle=240, pgbouncer=True),
+}
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def load_pool_settings() -> PoolSettings:
+    """
+    Build the pool settings from DB_POOL_PROFILE and the DB_* overrides.
+    """
+    profile = os.getenv("DB_POOL_PROFILE", "default").strip().lower()
+    if profile not in POOL_PROFILES:
+        raise ValueError(
+            f"Unknown DB_POOL_PROFILE '{profile}', expected one of {sorted(POOL_PROFILES)}"
+        )
+    base = POOL_PROFILES[profile]
+
+    return replace(
+        base,
+        pool_size=int(os.getenv("DB_POOL_SIZE", base.pool_size)),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", base.max_overflow)),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", base.pool_timeout)),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", base.pool_recycle)),
+        pool_pre_ping=_env_bool("DB_POOL_PRE_PING", base.pool_pre_ping),
+        pgbouncer=_env_bool("DB_PGBOUNCER", base.pgbouncer),
+        echo=_env_bool("DB_ECHO", base.echo),
+    )
+
+
+# =============================================================================
+# Instrumented pools
+# =============================================================================
+
+class _CheckoutTimingMixin:
+    """
+    Records how long callers wait to check a connection out of the pool.
+
+    SQLAlchemy exposes checked-out and overflow counts directly, but not the
+    time spent blocked in the queue, which is what tells us a replica needs
+    a bigger pool (or the database needs more replicas).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._wait_count = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self._wait_count += 1
+                self._wait_total += waited
+                if waited > self._wait_max:
+                    self._wait_max = waited
+
+    def recreate(self):
+        # Keep accumulated timing across pool recreation (e.g. engine.dispose()).
+        pool = super().recreate()
+        pool._wait_count = self._wait_count
+        pool._wait_total = self._wait_total
+        pool._wait_max = self._wait_max
+        pool._timeouts = self._timeouts
+        return pool
+
+    def wait_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            count = self._wait_count
+            return {
+                "checkouts": count,
+                "wait_total_ms": round(self._wait_total * 1000, 3),
+                "wait_avg_ms": round(self._wait_total * 1000 / count, 3) if count else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+                "timeouts": self._timeouts,
+            }
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# =============================================================================
+# Engine construction
+# =============================================================================
+
+def connect_args_for(database_url: str, settings: PoolSettings) -> Dict[str, Any]:
+    """
+    Driver-level connect args for the given URL and pool settings.
+
+    In PgBouncer mode (transaction pooling, including Neon's -pooler
+    endpoints) a server connection is not pinned to our client connection,
+    so server-side prepared statements must be turned off. psycopg2 never
+    prepares statements, psycopg 3 and asyncpg do by default.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    driver = url.get_driver_name()
+
+    if backend == "sqlite":
+        return {"check_same_thread": False} if driver != "aiosqlite" else {}
+
+    if not settings.pgbouncer:
+        return {}
+    if driver == "psycopg":
+        return {"prepare_threshold": None}
+    if driver == "asyncpg":
+        return {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    return {}
+
+
+def engine_kwargs(database_url: str, settings: PoolSettings, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Keyword arguments for create_engine / create_async_engine.
+    """
+    url = make_url(database_url)
+    kwargs: Dict[str, Any] = {
+        "echo": settings.echo,
+        "connect_args": connect_args_for(database_url, settings),
+        "pool_pre_ping": settings.pool_pre_ping,
+    }
+
+    # In-memory SQLite keeps a single connection per thread; sizing does not apply.
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return kwargs
+
+    kwargs.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        pool_recycle=settings.pool_recycle,
+    )
+    return kwargs
+
+
+def create_pooled_engine(database_url: str, settings: PoolSettings = None) -> Engine:
+    """
+    Create a synchronous engine using the configured pooling profile.
+    """
+    settings = settings or load_pool_settings()
+    return create_engine(database_url, **engine_kwargs(database_url, settings))
+
+
+def pool_stats(engine: Engine) -> Dict[str, Any]:
+    """
+    Live pool gauges for an engine: size, checked-out, overflow and wait time.
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update(
+            pool_size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, _CheckoutTimingMixin):
+        stats.update(pool.wait_stats())
+
+    return stats
@@ -0,0 +1,126 @@
+"""
+Reminder schedule: one row per task and lead time.
+
+A pending task with a due date gets a reminder at the due date (lead 0,
+unless tasks.reminder_sent says it went out already) and one at each of
+its owner's lead times (users.reminder_leads) that is still ahead. Rows
+carry the minute bucket they fall in, so the reminder sweep and the
+in-process scheduler read due reminders with an index range scan over
+buckets instead of scanning tasks, and they record which lead times were
+sent.
+
+Writers call sync_reminder_schedule inside the transaction that changes a
+task's due date or status, deletes it, or changes the user's lead times.
+The timers it computed are left in session.info under SCHEDULED_TIMERS_KEY
+for the reminder scheduler to pick up once the transaction commits.
+
+Task writes from the agent's task service land here as well as the API's,
+so the schedule, task and user columns are named with table() rather than
+taken from the ReminderSchedule and Task models.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Boolean, DateTime, column, delete, insert, select, table, update
+from sqlmodel import Session
+
+# session.info key: {task_id: [(lead_minutes, remind_at), ...]} written this transaction
+SCHEDULED_TIMERS_KEY = "reminder_timers"
+
+_schedule = table(
+    "reminder_schedule",
+    column("task_id"), column("lead_minutes"), column("user_id"),
+    column("remind_at", DateTime), column("bucket", DateTime), column("sent", Boolean),
+)
+_tasks = table("tasks", column("id"), column("user_id"), column("status"), column("due_date", DateTime), column("reminder_sent", Boolean))
+_users = table("users", column("id"), column("reminder_leads"))
+
+
+def reminder_bucket(moment: datetime) -> datetime:
+    """
+    Minute bucket a reminder time falls in
+    """
+    return moment.replace(second=0, microsecond=0)
+
+
+def parse_reminder_leads(value: Optional[str]) -> List[int]:
+    """
+    Lead times stored in users.reminder_leads, largest first
+    """
+    return sorted({int(lead) for lead in (value or "").split(",") if lead.strip()}, reverse=True)
+
+
+def get_reminder_leads(db: Session, user_id: int) -> List[int]:
+    """
+    A user's lead times in minutes (the due-time reminder is implied)
+    """
+    return parse_reminder_leads(db.exec(select(_users.c.reminder_leads).where(_users.c.id == user_id)).scalar_one_or_none())
+
+
+def set_reminder_leads(db: Session, user_id: int, leads: List[int]) -> List[int]:
+    """
+    Store a user's lead times and reschedule their pending tasks, inside the
+    caller's transaction
+
+    Returns:
+        List[int]: The stored lead times, largest first
+    """
+    leads = parse_reminder_leads(",".join(str(lead) for lead in leads))
+    db.exec(update(_users).where(_users.c.id == user_id).values(reminder_leads=",".join(str(lead) for lead in leads)))
+    sync_reminder_schedule(db, user_id)
+    return leads
+
+
+def sync_reminder_schedule(db: Session, user_id: int, task_ids: Optional[List[int]] = None) -> None:
+    """
+    Rewrite the reminder rows of a user's tasks from their current state,
+    inside the caller's transaction.
+
+    Lead-time reminders whose time has already passed are not scheduled, so
+    a reminder that was sent is not repeated unless the due date moves it
+    ahead again.
+
+    Args:
+        db: Database session making the change (pending ORM changes are flushed)
+        user_id: Owner of the tasks
+        task_ids: Written or deleted tasks; None for all of the user's tasks
+    """
+    if task_ids is not None and not task_ids:
+        return
+    db.flush()
+
+    scope = [_schedule.c.user_id == user_id]
+    tasks_query = select(_tasks.c.id, _tasks.c.due_date, _tasks.c.reminder_sent).where(
+        _tasks.c.user_id == user_id,
+        _tasks.c.status == "pending",
+        _tasks.c.due_date.isnot(None)
+    )
+    if task_ids is not None:
+        scope.append(_schedule.c.task_id.in_(task_ids))
+        tasks_query = tasks_query.where(_tasks.c.id.in_(task_ids))
+
+    removed = db.exec(delete(_schedule).where(*scope).returning(_schedule.c.task_id)).scalars().all()
+    timers: Dict[int, List[Tuple[int, datetime]]] = {task_id: [] for task_id in [*removed, *(task_ids or [])]}
+
+    leads = get_reminder_leads(db, user_id)
+    now = datetime.utcnow()
+    rows = []
+    for task in db.exec(tasks_query).all():
+        for lead in [*leads, 0]:
+            remind_at = task.due_date - timedelta(minutes=lead)
+            if (task.reminder_sent if lead == 0 else remind_at <= now):
+                continue
+            rows.append({
+                "task_id": task.id,
+                "lead_minutes": lead,
+                "user_id": user_id,
+                "remind_at": remind_at,
+                "bucket": reminder_bucket(remind_at),
+                "sent": False,
+            })
+            timers.setdefault(task.id, []).append((lead, remind_at))
+    if rows:
+        db.exec(insert(_schedule), params=rows)
+
+    db.info.setdefault(SCHEDULED_TIMERS_KEY, {}).update(timers)
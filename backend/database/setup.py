@@ -1,11 +1,11 @@
-from sqlmodel import SQLModel
 from .connection import engine
+from .migrations import run_migrations
 
 def create_tables():
     """
-    Create all database tables
+    Create all database tables by applying pending migrations
     """
-    SQLModel.metadata.create_all(engine)
+    run_migrations(engine)
 
 if __name__ == "__main__":
     create_tables()
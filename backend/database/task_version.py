@@ -0,0 +1,150 @@
+"""
+Per-user task change version.
+
+users.task_version is bumped in the same transaction as every write to a
+user's tasks, so it changes whenever any of their task listings could.
+List endpoints use it as a strong ETag and answer If-None-Match with 304
+after a single primary-key lookup, without touching the tasks table.
+
+Written tasks are stamped with the new version (tasks.change_version) and
+deleted ones leave a tombstone carrying it, which is what the delta sync
+endpoint pages through. Tombstones are kept for TOMBSTONE_RETENTION_DAYS
+and purged, at most once an hour per process, by the deletion that finds
+them due; the hour only starts counting once that deletion commits. Sync
+cursors older than SYNC_CURSOR_MAX_AGE are refused so a client resyncs
+instead of missing a purged deletion.
+
+Bump first, then write: the bump takes the user's row lock until commit,
+so versions become visible in the order they were handed out and a client
+cursor never skips a later-committing write.
+
+The statements are built on lightweight table() constructs rather than
+the models so they work from every entry point (the API, the agent tools
+and the MCP servers import the models under different package roots).
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import DateTime, column, delete, event, insert, select, table, update
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# How long tombstones are kept
+TOMBSTONE_RETENTION_DAYS = float(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+
+# Oldest sync cursor accepted; a day short of the retention, which covers
+# deletions still in flight when the cursor was issued
+SYNC_CURSOR_MAX_AGE = timedelta(days=TOMBSTONE_RETENTION_DAYS) - timedelta(days=1)
+
+# Seconds between tombstone purges in one process
+_PURGE_INTERVAL = 3600.0
+_next_purge = 0.0
+# session.info key: the transaction purged expired tombstones
+_PURGED_KEY = "tombstones_purged"
+
+_users = table("users", column("id"), column("task_version"))
+_tombstones = table(
+    "task_tombstones", column("task_id"), column("user_id"), column("change_version"), column("deleted_at", DateTime)
+)
+
+
+def _bump_statement(user_id: int):
+    return (
+        update(_users)
+        .where(_users.c.id == user_id)
+        .values(task_version=_users.c.task_version + 1)
+        .returning(_users.c.task_version)
+    )
+
+
+def _get_statement(user_id: int):
+    return select(_users.c.task_version).where(_users.c.id == user_id)
+
+
+def bump_task_version(db: Session, user_id: int) -> Optional[int]:
+    """
+    Bump a user's task version inside the caller's transaction.
+
+    Pending ORM changes are not flushed first, so rows added or modified
+    before the call can still be stamped with the returned version and go
+    out in the commit's single flush.
+
+    Args:
+        db: Database session for the task write
+        user_id: Owner of the written tasks
+
+    Returns:
+        Optional[int]: The new version, or None if the user does not exist
+    """
+    with db.no_autoflush:
+        return db.exec(_bump_statement(int(user_id))).scalar_one_or_none()
+
+
+async def bump_task_version_async(db: AsyncSession, user_id: int) -> Optional[int]:
+    """
+    Async variant of bump_task_version
+    """
+    with db.no_autoflush:
+        return (await db.exec(_bump_statement(int(user_id)))).scalar_one_or_none()
+
+
+def get_task_version(db: Session, user_id: int) -> int:
+    """
+    Current task version for a user (0 if they have never written a task)
+    """
+    return db.exec(_get_statement(int(user_id))).scalar_one_or_none() or 0
+
+
+def record_task_deletions(db: Session, user_id: int, task_ids: Iterable[int], version: int) -> None:
+    """
+    Leave tombstones for deleted tasks so delta sync clients drop them.
+
+    Args:
+        db: Database session that deletes the tasks
+        user_id: Owner of the deleted tasks
+        task_ids: IDs of the deleted tasks
+        version: The user's task version bumped for this write
+    """
+    now = datetime.utcnow()
+    rows = [
+        {"task_id": task_id, "user_id": int(user_id), "change_version": version, "deleted_at": now}
+        for task_id in task_ids
+    ]
+    if rows:
+        with db.no_autoflush:
+            db.exec(insert(_tombstones), params=rows)
+            _purge_expired_tombstones(db)
+
+
+def purge_task_tombstones(db: Session, before: datetime) -> None:
+    """
+    Delete tombstones written before a point in time, inside the caller's transaction
+    """
+    db.exec(delete(_tombstones).where(_tombstones.c.deleted_at < before))
+
+
+def _purge_expired_tombstones(db: Session) -> None:
+    if time.monotonic() < _next_purge:
+        return
+    purge_task_tombstones(db, datetime.utcnow() - timedelta(days=TOMBSTONE_RETENTION_DAYS))
+    db.info[_PURGED_KEY] = True
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _schedule_next_purge(session: OrmSession):
+    """
+    Start the purge interval once a purge has committed; a rolled back one
+    is retried by the next deletion
+    """
+    global _next_purge
+    if session.info.pop(_PURGED_KEY, False):
+        _next_purge = time.monotonic() + _PURGE_INTERVAL
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_rolled_back_purge(session: OrmSession):
+    session.info.pop(_PURGED_KEY, None)
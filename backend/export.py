@@ -0,0 +1,138 @@
+"""
+Streaming exports of a user's tasks and conversations.
+
+Rows are read through a server-side cursor (yield_per) and encoded one
+batch at a time as NDJSON or CSV, so memory stays flat however much is
+exported. Exports are in ID order; a client whose download was cut off
+resumes with ?after= set to the ID of the last record it received (CSV
+resumes without the header row).
+
+The generators open their own session: a StreamingResponse body is
+consumed after the route returns, so it cannot borrow the request's.
+"""
+
+import csv
+import enum
+import io
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlmodel import Session, select
+
+from db import engine
+from models.todo_models import ExportFormat, Message
+from serialization import dumps
+from tasks_crud import EXPORT_BATCH_SIZE, TASK_FIELDS, iter_user_task_batches
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+_MESSAGE_COLUMNS = (Message.id, Message.conversation_id, Message.role, Message.content, Message.created_at)
+MESSAGE_FIELDS = tuple(column.key for column in _MESSAGE_COLUMNS)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return ",".join(value)
+    return value
+
+
+def _field_values(item: Any) -> Dict[str, Any]:
+    # TaskRead models keep their field values in __dict__, sparse items are dicts
+    return item if isinstance(item, dict) else item.__dict__
+
+
+def encode_batches(
+    batches: Iterable[List[Any]],
+    export_format: ExportFormat,
+    fields: Sequence[str],
+    header: bool = True
+) -> Iterator[bytes]:
+    """
+    Encode batches of records as NDJSON lines or CSV rows, one chunk per batch
+
+    Args:
+        batches: Lists of models or dicts to export
+        export_format: NDJSON or CSV
+        fields: CSV columns, in order
+        header: Whether to start CSV output with a header row
+    """
+    if export_format == ExportFormat.ndjson:
+        for batch in batches:
+            yield b"".join(dumps(item) + b"\n" for item in batch)
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(fields)
+    for batch in batches:
+        for item in batch:
+            values = _field_values(item)
+            writer.writerow([_csv_value(values.get(name)) for name in fields])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_tasks(
+    user_id: int,
+    export_format: ExportFormat,
+    after: Optional[int] = None,
+    fields: Optional[Tuple[str, ...]] = None
+) -> Iterator[bytes]:
+    """
+    Stream a user's tasks as NDJSON or CSV
+
+    Args:
+        user_id: Owner of the tasks
+        export_format: NDJSON or CSV
+        after: Resume after this task ID
+        fields: Sparse fieldset (see tasks_crud.parse_task_fields)
+    """
+    with Session(engine) as db:
+        batches = iter_user_task_batches(db, user_id, after=after, fields=fields)
+        yield from encode_batches(batches, export_format, fields or TASK_FIELDS, header=after is None)
+
+
+def _iter_message_batches(db: Session, conversation_id: int, after: Optional[int]) -> Iterator[List[Dict[str, Any]]]:
+    query = select(*_MESSAGE_COLUMNS).where(Message.conversation_id == conversation_id).order_by(Message.id)
+    if after is not None:
+        query = query.where(Message.id > after)
+
+    result = db.connection().execution_options(yield_per=EXPORT_BATCH_SIZE).execute(query)
+    try:
+        for rows in result.partitions():
+            yield [dict(zip(MESSAGE_FIELDS, row)) for row in rows]
+    finally:
+        result.close()
+
+
+def export_conversation(
+    conversation_id: int,
+    export_format: ExportFormat,
+    after: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Stream a conversation's messages, oldest first, as NDJSON or CSV
+
+    The caller checks that the conversation belongs to the user.
+
+    Args:
+        conversation_id: Conversation to export
+        export_format: NDJSON or CSV
+        after: Resume after this message ID
+    """
+    with Session(engine) as db:
+        batches = _iter_message_batches(db, conversation_id, after)
+        yield from encode_batches(batches, export_format, MESSAGE_FIELDS, header=after is None)
@@ -1,16 +1,37 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Form, Body, Request
+from fastapi import FastAPI, Depends, HTTPException, status, Form, Body, Request, Query, Header, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlmodel import Session, select
-from typing import List, Dict, Any, Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple
 import os
 import asyncio
 import logging
 
-from db import get_session, engine
-from models.todo_models import Task, TaskCreate, TaskUpdate, TaskRead, User, Conversation, Message, MessageRole
-from tasks_crud import get_user_tasks, get_task_by_id, create_task_for_user, update_task, delete_task
+from db import get_session, get_async_session, get_async_engine, engine
+from database.connection import dispose_engines
+from database.pool import pool_stats
+from models.todo_models import Task, TaskCreate, TaskUpdate, TaskRead, TaskPage, TaskChanges, TaskFilters, TagCount, TaskBulkRequest, TaskBulkResponse, TaskImportResult, ExportFormat, ReminderSettings, User, Conversation, Message, MessageRole
+from tasks_crud import (
+    get_user_tasks, get_user_tasks_page, search_user_tasks, get_task_changes, get_user_tag_counts, get_task_by_id, create_task_for_user, update_task, delete_task,
+    bulk_mutate_tasks, MAX_BULK_OPERATIONS, VersionConflictError, InvalidFieldsError, parse_task_fields,
+    get_user_tasks_async, get_task_by_id_async, create_task_for_user_async, update_task_async, delete_task_async,
+)
 from auth import get_current_user
-from sqlmodel import SQLModel
-from services.event_service import handle_recurring_task, publish_task_reminder_event
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ExpiredCursorError, InvalidCursorError
+from serialization import ORJSONModelResponse
+from export import MEDIA_TYPES, export_conversation, export_tasks
+from task_import import InvalidImportError, TaskImporter, iter_ndjson_chunks
+from database.migrations import run_migrations
+from services.dapr_publisher import start_publisher, stop_publisher
+from services.outbox_relay import start_outbox_relay, stop_outbox_relay, wake_outbox_relay
+from services.event_service import create_recurring_task_async, enqueue_tasks_imported_event
+from services.event_dedupe import claim_event, is_duplicate_event, remember_event
+from services.keyed_executor import ExecutorBusyError, start_event_executor, stop_event_executor, submit_event_job
+from services.reminder_scheduler import start_reminder_scheduler, stop_reminder_scheduler
+from services.reminder_service import send_due_reminders
+from database.reminder_schedule import get_reminder_leads, set_reminder_leads
+from database.task_version import get_task_version
 from datetime import timedelta
 
 # Configure logging
@@ -28,6 +49,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all methods
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["ETag"],  # Let the frontend read task and list versions
 )
 
 # JWT and password hashing setup
@@ -52,11 +74,11 @@ def create_access_token(data: dict):
 
 def create_tables():
     """
-    Create all database tables if they don't exist.
+    Bring the database schema up to date by applying pending migrations.
     NOTE: Removed drop_all() - that was deleting all users on every restart!
     """
-    # Only create tables if they don't exist (preserves existing data)
-    SQLModel.metadata.create_all(engine)
+    # Migrations only add what is missing (preserves existing data)
+    run_migrations(engine)
 
 
 def create_default_users(db: Session):
@@ -116,8 +138,25 @@ def on_startup():
 
 # Register the startup event
 @app.on_event("startup")
-def startup_event():
-    on_startup()
+async def startup_event():
+    await run_in_threadpool(on_startup)
+    # One keep-alive HTTP session to the Dapr sidecar for every publish
+    await start_publisher()
+    await start_outbox_relay()
+    # Reminders fire from in-process timers; /reminder-cron is only a safety sweep
+    await start_reminder_scheduler()
+    # Subscription routes hand events to per-user workers
+    await start_event_executor()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await stop_event_executor()
+    await stop_reminder_scheduler()
+    await stop_outbox_relay()
+    await stop_publisher()
+    # Release the shared pools' connections instead of leaving them to Neon's idle timeout
+    await dispose_engines()
 
 # Define Pydantic models for request body
 from pydantic import BaseModel
@@ -147,75 +186,239 @@ class ChatResponse(BaseModel):
 # DAPR PUB/SUB ENDPOINTS
 # ============================================================================
 
+# Dapr bulk subscription: messages delivered per request, and how long the
+# sidecar waits to fill a batch
+EVENT_BULK_MAX_MESSAGES = int(os.getenv("EVENT_BULK_MAX_MESSAGES", "100"))
+EVENT_BULK_MAX_AWAIT_MS = int(os.getenv("EVENT_BULK_MAX_AWAIT_MS", "40"))
+
+
 @app.get("/dapr/subscribe")
 def dapr_subscribe():
     """
     Dapr subscription discovery endpoint.
     Returns the list of topics and routes that this app subscribes to.
+
+    Both subscriptions use bulk delivery: the sidecar posts up to
+    EVENT_BULK_MAX_MESSAGES events per request, which the handlers apply in
+    one transaction and answer with a status per event.
     """
+    bulk_subscribe = {
+        "enabled": True,
+        "maxMessagesCount": EVENT_BULK_MAX_MESSAGES,
+        "maxAwaitDurationMs": EVENT_BULK_MAX_AWAIT_MS
+    }
     subscriptions = [
         {
             "pubsubname": "todo-pubsub",
             "topic": "task-events",
-            "route": "/api/events/task-completed"
+            "route": "/api/events/task-completed",
+            "bulkSubscribe": bulk_subscribe
         },
         {
             "pubsubname": "todo-pubsub",
             "topic": "reminders",
-            "route": "/api/events/task-reminder"
+            "route": "/api/events/task-reminder",
+            "bulkSubscribe": bulk_subscribe
         }
     ]
     logger.info(f"Dapr subscribe endpoint called, returning {len(subscriptions)} subscriptions")
     return subscriptions
 
 
-@app.post("/api/events/task-completed")
-async def handle_task_completed_event(
-    request: Request,
-    db: Session = Depends(get_session)
-):
+# processed_events consumer names of the subscription endpoints
+TASK_COMPLETED_CONSUMER = "task-completed"
+TASK_REMINDER_CONSUMER = "task-reminder"
+
+# Handles one event in the caller's transaction and returns its result
+EventHandler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+# Status given to Dapr for events that find their worker's queue full:
+# RETRY (redeliver after the sidecar's backoff) or DROP
+EVENT_OVERFLOW_STATUS = os.getenv("EVENT_OVERFLOW_STATUS", "RETRY").upper()
+
+
+async def _already_processed(db: AsyncSession, consumer: str, event_data: Dict[str, Any]) -> bool:
     """
-    Dapr subscription endpoint for task completion events.
+    Whether an event was handled before; if not, it is claimed in the
+    caller's transaction. Events without an event_id are always handled.
+    """
+    event_id = event_data.get("event_id")
+    if not event_id:
+        return False
+    if await is_duplicate_event(db, consumer, event_id) or not await claim_event(db, consumer, event_id):
+        logger.info(f"Skipping already processed event {event_id} ({consumer})")
+        return True
+    return False
 
-    When a task is marked as completed and has a recurrence pattern,
-    this endpoint creates a new task with the next due date.
 
-    This endpoint is called by Dapr when events are published to the
-    task-events topic.
+def _remember_handled(consumer: str, event_data: Dict[str, Any], result: Dict[str, Any]):
+    """Put a committed event in the dedupe LRU"""
+    event_id = event_data.get("event_id")
+    if event_id and result.get("status") != "ignored":
+        remember_event(consumer, event_id)
+
+
+def _bulk_entry_event(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The event data of a bulk delivery entry (a CloudEvent or a raw payload)"""
+    event = entry.get("event")
+    if isinstance(event, dict):
+        event_data = event.get("data", event)
+        if isinstance(event_data, dict):
+            return event_data
+    return None
+
+
+def _event_user_key(event_data: Dict[str, Any]) -> Optional[int]:
+    """
+    The executor key of an event: its user_id as an int, so 1 and "1" share
+    a worker and an order; None if the event has no usable user_id
+    """
+    try:
+        return int(event_data.get("user_id"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _entry_status(result: Dict[str, Any]) -> str:
+    """Bulk delivery status of an event's result"""
+    status = result.get("status")
+    if status in ("RETRY", "DROP"):
+        return status
+    return "DROP" if status == "error" else "SUCCESS"
+
+
+async def _apply_event(db: AsyncSession, consumer: str, handle_event: EventHandler, event_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply one event in its own transaction; an event that fails is
+    reported as an error (dropped), one whose commit fails is retried
+    """
+    try:
+        result = await handle_event(db, event_data)
+    except Exception as e:
+        logger.error(f"Error handling {consumer} event {event_data.get('event_id')}: {str(e)}")
+        await db.rollback()
+        return {"status": "error", "message": str(e)}
+    try:
+        await db.commit()
+    except Exception as e:
+        logger.error(f"Failed to commit {consumer} event {event_data.get('event_id')}: {str(e)}")
+        await db.rollback()
+        return {"status": "RETRY", "message": str(e)}
+    _remember_handled(consumer, event_data, result)
+    return result
+
+
+async def _apply_events(consumer: str, handle_event: EventHandler, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Apply events (one user's, in order) in one transaction of their own
+    session. If any of them fails, the transaction is rolled back and the
+    events are applied again one transaction each, so a bad event does not
+    hold back the rest.
+
+    Returns:
+        List[Dict[str, Any]]: Each event's result
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as db:
+        if len(events) > 1:
+            try:
+                results = [await handle_event(db, event_data) for event_data in events]
+                await db.commit()
+            except Exception as e:
+                logger.warning(f"Batch of {len(events)} {consumer} events failed ({str(e)}); handling them one at a time")
+                await db.rollback()
+            else:
+                for event_data, result in zip(events, results):
+                    _remember_handled(consumer, event_data, result)
+                return results
+        return [await _apply_event(db, consumer, handle_event, event_data) for event_data in events]
+
+
+async def _dispatch_events(consumer: str, handle_event: EventHandler, user_id: int, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Apply one user's events on the user's worker of the event executor,
+    behind the user's earlier events
+
+    Returns:
+        List[Dict[str, Any]]: Each event's result; EVENT_OVERFLOW_STATUS for
+        all of them if the worker's queue is full
+    """
+    try:
+        job = submit_event_job(user_id, lambda: _apply_events(consumer, handle_event, events))
+    except ExecutorBusyError as e:
+        logger.warning(f"Event queue busy ({str(e)}); answering {EVENT_OVERFLOW_STATUS} for {len(events)} {consumer} events")
+        return [{"status": EVENT_OVERFLOW_STATUS, "message": "event queue is full"} for _ in events]
+    return await job
+
+
+async def _handle_event_batch(body: Dict[str, Any], consumer: str, handle_event: EventHandler) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Handle a Dapr bulk delivery and report a status per entry.
+
+    The entries are grouped by user (see _event_user_key; entries without a
+    usable user_id are dropped, like malformed ones). Each user's events go
+    to that user's worker of the event executor and are applied in order in
+    one transaction (see _apply_events), while other users' events run in
+    parallel. Entries whose event fails on its own are dropped (the
+    single-event routes answer 200 on errors for the same reason), ones
+    whose commit fails are retried, and ones that find their worker's queue
+    full get EVENT_OVERFLOW_STATUS.
+
+    Args:
+        body: The bulk envelope ({"entries": [{"entryId", "event", ...}]})
+        consumer: processed_events consumer name of the route
+        handle_event: Handles one event in the caller's transaction
+
+    Returns:
+        {"statuses": [{"entryId", "status": SUCCESS | RETRY | DROP}]} in entry order
+    """
+    entries = [(entry.get("entryId"), _bulk_entry_event(entry)) for entry in body.get("entries") or []]
+    statuses = {index: "DROP" for index, (_, event_data) in enumerate(entries) if event_data is None}
+
+    by_user: Dict[int, List[int]] = {}
+    for index, (_, event_data) in enumerate(entries):
+        if index in statuses:
+            continue
+        user_id = _event_user_key(event_data)
+        if user_id is None:
+            statuses[index] = "DROP"
+        else:
+            by_user.setdefault(user_id, []).append(index)
+
+    user_results = await asyncio.gather(*(
+        _dispatch_events(consumer, handle_event, user_id, [entries[index][1] for index in indexes])
+        for user_id, indexes in by_user.items()
+    ))
+    for indexes, results in zip(by_user.values(), user_results):
+        for index, result in zip(indexes, results):
+            statuses[index] = _entry_status(result)
+
+    logger.info(f"Handled bulk delivery of {len(entries)} events for {len(by_user)} users ({consumer})")
+    return {"statuses": [{"entryId": entry_id, "status": statuses[index]} for index, (entry_id, _) in enumerate(entries)]}
+
+
+async def _handle_event_request(request: Request, consumer: str, handle_event: EventHandler) -> Dict[str, Any]:
+    """
+    Handle a Dapr delivery, single or bulk, on a subscription route
     """
     try:
         # Parse the event data from Dapr
         body = await request.json()
+        if isinstance(body.get("entries"), list):
+            return await _handle_event_batch(body, consumer, handle_event)
 
         # Dapr wraps the data in a specific format
         # The actual event data is in the 'data' field
         event_data = body.get("data", body)
 
-        logger.info(f"Received task.completed event: {event_data}")
-
-        # Check event type
-        event_type = event_data.get("event_type")
-        if event_type != "task.completed":
-            logger.warning(f"Unexpected event type: {event_type}")
-            return {"status": "ignored", "reason": "unknown event type"}
-
-        # Handle recurring task logic
-        new_task = handle_recurring_task(event_data, db)
-
-        if new_task:
-            return {
-                "status": "success",
-                "message": f"Created recurring task {new_task.id}",
-                "new_task_id": new_task.id
-            }
-        else:
-            return {
-                "status": "success",
-                "message": "Task has no recurrence, no action taken"
-            }
+        user_id = _event_user_key(event_data)
+        if user_id is None:
+            logger.warning(f"Dropping {consumer} event without a valid user_id: {event_data}")
+            return {"status": "DROP", "message": "event has no valid user_id"}
+        [result] = await _dispatch_events(consumer, handle_event, user_id, [event_data])
+        return result
 
     except Exception as e:
-        logger.error(f"Error handling task.completed event: {str(e)}")
+        logger.error(f"Error handling {consumer} event: {str(e)}")
         # Return 200 even on error to prevent Dapr from retrying
         # Log the error for debugging
         return {
@@ -224,12 +427,61 @@ async def handle_task_completed_event(
         }
 
 
-def get_or_create_conversation(db: Session, user_id: int) -> Conversation:
+async def _task_completed_event(db: AsyncSession, event_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Handle one task.completed event in the caller's transaction
+    """
+    logger.info(f"Received task.completed event: {event_data}")
+
+    # Check event type
+    event_type = event_data.get("event_type")
+    if event_type != "task.completed":
+        logger.warning(f"Unexpected event type: {event_type}")
+        return {"status": "ignored", "reason": "unknown event type"}
+
+    if await _already_processed(db, TASK_COMPLETED_CONSUMER, event_data):
+        return {"status": "success", "message": "Event already processed", "duplicate": True}
+
+    # Handle recurring task logic
+    new_task = await create_recurring_task_async(event_data, db)
+    if new_task:
+        return {
+            "status": "success",
+            "message": f"Created recurring task {new_task.id}",
+            "new_task_id": new_task.id
+        }
+    else:
+        return {
+            "status": "success",
+            "message": "Task has no recurrence, no action taken"
+        }
+
+
+@app.post("/api/events/task-completed")
+async def handle_task_completed_event(request: Request):
+    """
+    Dapr subscription endpoint for task completion events.
+
+    When a task is marked as completed and has a recurrence pattern,
+    this endpoint creates a new task with the next due date. Redelivered
+    events are recognized by their event_id and skipped, so a recurring
+    task is created once per completion. Events run on their user's worker
+    of the event executor, in order per user; bulk deliveries are applied
+    in one transaction per user and answered with a status per event.
+
+    This endpoint is called by Dapr when events are published to the
+    task-events topic.
+    """
+    return await _handle_event_request(request, TASK_COMPLETED_CONSUMER, _task_completed_event)
+
+
+async def get_or_create_conversation(db: AsyncSession, user_id: int) -> Conversation:
     """
-    Get the most recent conversation for a user, or create a new one if none exists.
+    Get the most recent conversation for a user, or create a new one if none
+    exists (in the caller's transaction).
 
     Args:
-        db: Database session
+        db: Async database session
         user_id: The user ID
 
     Returns:
@@ -240,174 +492,162 @@ def get_or_create_conversation(db: Session, user_id: int) -> Conversation:
         Conversation.user_id == user_id
     ).order_by(Conversation.updated_at.desc())
 
-    conversation = db.exec(statement).first()
+    conversation = (await db.exec(statement)).first()
 
     if not conversation:
         # Create a new conversation
         conversation = Conversation(user_id=user_id)
         db.add(conversation)
-        db.commit()
-        db.refresh(conversation)
+        await db.flush()
         logger.info(f"Created new conversation {conversation.id} for user {user_id}")
 
     return conversation
 
 
-@app.post("/api/events/task-reminder")
-async def handle_task_reminder_event(
-    request: Request,
-    db: Session = Depends(get_session)
-):
-    """
-    Dapr subscription endpoint for task reminder events.
+# Tasks listed in one reminder message; the rest are only counted
+MAX_REMINDER_MESSAGE_TASKS = 20
 
-    This endpoint receives reminder events published by the cron job,
-    logs the notification, and stores it in the conversation history.
 
-    This endpoint is called by Dapr when events are published to the
-    reminders topic.
+def _due_text(minutes: int) -> str:
+    """When a task is due, relative to a reminder"""
+    if minutes <= 0:
+        return "now"
+    if minutes == 1:
+        return "in 1 minute"
+    if minutes % 1440 == 0:
+        days = minutes // 1440
+        return "in 1 day" if days == 1 else f"in {days} days"
+    if minutes % 60 == 0:
+        hours = minutes // 60
+        return "in 1 hour" if hours == 1 else f"in {hours} hours"
+    return f"in {minutes} minutes"
+
+
+def _reminder_content(reminders: List[Dict[str, Any]]) -> str:
+    """One chat message covering every reminder of an event"""
+    if len(reminders) == 1:
+        reminder = reminders[0]
+        return f"⏰ REMINDER: Your task '{reminder.get('title')}' is due {_due_text(reminder.get('minutes_until_due', 0))}!"
+
+    lines = [f"⏰ REMINDER: You have {len(reminders)} task reminders:"]
+    for reminder in reminders[:MAX_REMINDER_MESSAGE_TASKS]:
+        lines.append(f"- '{reminder.get('title')}' is due {_due_text(reminder.get('minutes_until_due', 0))}")
+    if len(reminders) > MAX_REMINDER_MESSAGE_TASKS:
+        lines.append(f"...and {len(reminders) - MAX_REMINDER_MESSAGE_TASKS} more")
+    return "\n".join(lines)
+
+
+async def _task_reminder_event(db: AsyncSession, event_data: Dict[str, Any]) -> Dict[str, Any]:
     """
-    try:
-        # Parse the event data from Dapr
-        body = await request.json()
+    Handle one reminder event in the caller's transaction
+    """
+    # Check event type
+    event_type = event_data.get("event_type")
+    if event_type == "task.reminders":
+        reminders = event_data.get("reminders") or []
+    elif event_type == "task.reminder":
+        reminders = [event_data]
+    else:
+        logger.warning(f"Unexpected event type: {event_type}")
+        return {"status": "ignored", "reason": "unknown event type"}
+    if not reminders:
+        return {"status": "ignored", "reason": "no reminders"}
 
-        # Dapr wraps the data in a specific format
-        # The actual event data is in the 'data' field
-        event_data = body.get("data", body)
+    if await _already_processed(db, TASK_REMINDER_CONSUMER, event_data):
+        return {"status": "success", "message": "Event already processed", "duplicate": True}
 
-        logger.info(f"Received task.reminder event: task_id={event_data.get('task_id')}, due in {event_data.get('minutes_until_due')} minutes")
-
-        # Check event type
-        event_type = event_data.get("event_type")
-        if event_type != "task.reminder":
-            logger.warning(f"Unexpected event type: {event_type}")
-            return {"status": "ignored", "reason": "unknown event type"}
-
-        # Extract event data
-        task_id = event_data.get("task_id")
-        task_title = event_data.get("title")
-        user_id = event_data.get("user_id")
-        minutes = event_data.get("minutes_until_due")
-        due_date = event_data.get("due_date")
-
-        # Log the reminder notification to console
-        logger.info(f"🔔 Sending reminder for Task ID {task_id}")
-        logger.info(f"REMINDER: User {user_id} has task '{task_title}' due in {minutes} minutes")
-
-        # Get or create a conversation for the user
-        conversation = get_or_create_conversation(db, user_id)
-
-        # Create reminder message content
-        if minutes <= 0:
-            time_text = "now"
-        elif minutes == 1:
-            time_text = "in 1 minute"
-        else:
-            time_text = f"in {minutes} minutes"
+    user_id = event_data.get("user_id")
+    task_ids = [reminder.get("task_id") for reminder in reminders]
 
-        reminder_content = f"⏰ REMINDER: Your task '{task_title}' is due {time_text}!"
+    # Log the reminder notification to console
+    logger.info(f"🔔 Sending {len(reminders)} reminders to user {user_id}: task IDs {task_ids}")
 
-        # Store the reminder in the conversation history
-        reminder_message = Message(
-            conversation_id=conversation.id,
-            role=MessageRole.assistant,
-            content=reminder_content
-        )
-        db.add(reminder_message)
+    # Get or create a conversation for the user
+    conversation = await get_or_create_conversation(db, user_id)
 
-        # Update conversation timestamp
-        conversation.updated_at = datetime.utcnow()
-        db.add(conversation)
+    # Store the reminders in the conversation history
+    reminder_message = Message(
+        conversation_id=conversation.id,
+        role=MessageRole.assistant,
+        content=_reminder_content(reminders)
+    )
+    db.add(reminder_message)
 
-        db.commit()
+    # Update conversation timestamp
+    conversation.updated_at = datetime.utcnow()
+    db.add(conversation)
 
-        logger.info(f"✓ Reminder stored in conversation {conversation.id} for user {user_id}")
+    logger.info(f"✓ Reminder stored in conversation {conversation.id} for user {user_id}")
 
-        return {
-            "status": "success",
-            "message": f"Reminder processed for task {task_id}",
-            "conversation_id": conversation.id,
-            "reminder_sent": True
-        }
+    return {
+        "status": "success",
+        "message": f"Reminder processed for {len(reminders)} tasks",
+        "conversation_id": conversation.id,
+        "task_ids": task_ids,
+        "reminder_sent": True
+    }
 
-    except Exception as e:
-        logger.error(f"Error handling task.reminder event: {str(e)}")
-        db.rollback()
-        return {
-            "status": "error",
-            "message": str(e)
-        }
+
+@app.post("/api/events/task-reminder")
+async def handle_task_reminder_event(request: Request):
+    """
+    Dapr subscription endpoint for task reminder events.
+
+    This endpoint receives reminder events published by the reminder
+    scheduler (at the due date and at each of the user's lead times before
+    it), logs the notification, and stores it in the conversation history.
+    Reminders are coalesced per user: a task.reminders event carries all of
+    a user's reminders claimed together and is stored as one message.
+    Single task.reminder events are still accepted. Redelivered events are
+    recognized by their event_id and skipped. Events run on their user's
+    worker of the event executor, in order per user; bulk deliveries are
+    applied in one transaction per user and answered with a status per
+    event.
+
+    This endpoint is called by Dapr when events are published to the
+    reminders topic.
+    """
+    return await _handle_event_request(request, TASK_REMINDER_CONSUMER, _task_reminder_event)
 
 
 @app.post("/reminder-cron")
 async def reminder_cron_handler(
     request: Request,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """
     Dapr cron binding handler for task reminders.
 
-    Triggered by Dapr cron every minute. Queries the database for
-    incomplete tasks where due_date is in the past (overdue) and
-    reminder_sent is False, publishes reminder events, and marks
-    tasks as reminder_sent.
+    Reminders normally fire on time from the in-process reminder scheduler
+    (services/reminder_scheduler.py); this is the safety sweep, triggered
+    by Dapr cron every 30 minutes on every replica. Pages through the
+    unsent reminder_schedule buckets up to the current minute, and marks
+    the due reminders of pending tasks as sent together with their reminder
+    events in the outbox, committing page by page (see
+    services/reminder_service.py).
 
     This endpoint is called by the Dapr cron binding component.
     """
     try:
         logger.info("Reminder cron triggered")
 
-        # Get current time
-        from datetime import datetime
-        now = datetime.utcnow()
-
-        # Query for pending tasks that are overdue AND reminder_sent = False
-        from models.todo_models import TaskStatus
-        query = select(Task).where(
-            Task.status == TaskStatus.pending,
-            Task.due_date.isnot(None),
-            Task.due_date < now,  # Overdue tasks (due_date in the past)
-            Task.reminder_sent == False  # Only tasks without reminders sent
-        )
-
-        overdue_tasks = db.exec(query).all()
-
-        logger.info(f"Found {len(overdue_tasks)} overdue tasks needing reminders")
-
-        # Publish reminder event for each overdue task and mark as sent
-        reminders_sent = 0
-        for task in overdue_tasks:
-            # Calculate how many minutes overdue
-            time_diff = now - task.due_date
-            minutes_overdue = int(time_diff.total_seconds() / 60)
-
-            # Log reminder message
-            logger.info(f"🔔 Sending Reminder for Task ID {task.id}: '{task.title}' (overdue by {minutes_overdue} minutes)")
+        result = await send_due_reminders(db)
+        if result is None:
+            logger.info("Previous reminder run still in progress; skipping this tick")
+            return {"status": "skipped", "reason": "previous run still in progress"}
 
-            # Publish reminder event to Dapr pub/sub
-            success = await publish_task_reminder_event(task, -minutes_overdue)  # Negative indicates overdue
-
-            if success:
-                # Mark reminder as sent to prevent spam
-                task.reminder_sent = True
-                task.updated_at = datetime.utcnow()
-                db.add(task)
-                reminders_sent += 1
-
-        # Commit all updates
-        db.commit()
-
-        logger.info(f"Published {reminders_sent} task reminder events and marked as sent")
+        tasks_found, reminders_sent = result
+        logger.info(f"Queued {reminders_sent} of {tasks_found} due reminders")
 
         return {
             "status": "success",
-            "tasks_found": len(overdue_tasks),
+            "tasks_found": tasks_found,
             "reminders_sent": reminders_sent
         }
 
     except Exception as e:
         logger.error(f"Error in reminder cron handler: {str(e)}")
-        db.rollback()
+        await db.rollback()
         return {
             "status": "error",
             "message": str(e)
@@ -474,15 +714,294 @@ def login_user(
 
     return {"access_token": access_token, "token_type": "bearer", "user": {"id": user.id, "email": user.email, "name": user.name}}
 
-@app.get("/api/tasks", response_model=List[TaskRead])
+def _list_etag(db: Session, user_id: int) -> str:
+    """
+    Strong ETag for a user's task listings: their task change version.
+
+    Read before the listing itself, so a write racing the read can only
+    make the ETag older than the body (costing one extra full response),
+    never newer.
+    """
+    return f'"tasks-{get_task_version(db, user_id)}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header names the given ETag (or is "*")"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == etag
+        for candidate in candidates
+    )
+
+
+def _list_cache_headers(db: Session, user_id: int) -> Dict[str, str]:
+    """
+    ETag and cache headers for a user's task listings
+    """
+    # Cache privately but revalidate every time, so browsers send If-None-Match
+    return {"ETag": _list_etag(db, user_id), "Cache-Control": "private, no-cache"}
+
+
+def _not_modified(if_none_match: Optional[str], headers: Dict[str, str]) -> Optional[Response]:
+    """
+    304 response when the client's copy of a listing is still current
+    """
+    if _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
+
+
+def _task_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a ?fields= sparse fieldset, rejecting unknown fields with 400
+    """
+    try:
+        return parse_task_fields(fields)
+    except InvalidFieldsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@app.get("/api/tasks", response_model=TaskPage)
 def list_tasks(
-    status_filter: str = "all",
+    filters: TaskFilters = Depends(),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     current_user_id: str = Depends(get_current_user),
     db: Session = Depends(get_session)
 ):
-    """List all tasks for authenticated user."""
-    tasks = get_user_tasks(db, current_user_id, status_filter)
-    return tasks
+    """
+    List tasks for authenticated user, one page at a time.
+
+    Filters (status_filter, priority, due_before/due_after, overdue, tag,
+    recurrence) and sort (created_at, due_date, priority; prefix "-" for
+    descending) are applied in SQL. Pass the returned next_cursor as
+    ?cursor= with the same filters to fetch the following page; next_cursor
+    is null on the last page.
+
+    Pass ?fields= with a comma-separated subset of task fields (e.g.
+    fields=id,title,status,due_date) to get only those back; the query
+    then reads only those columns, and tags only when asked for.
+
+    Responses carry an ETag; send it back as If-None-Match to get 304 when
+    none of the user's tasks changed. The overdue filter depends on the
+    clock as well, so those listings are never answered with 304.
+    """
+    user_id = int(current_user_id)
+    task_fields = _task_fields(fields)
+    headers = {}
+    if filters.overdue is None:
+        headers = _list_cache_headers(db, user_id)
+        not_modified = _not_modified(if_none_match, headers)
+        if not_modified:
+            return not_modified
+
+    try:
+        page = get_user_tasks_page(db, user_id, filters, limit, cursor, fields=task_fields)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return ORJSONModelResponse(page, headers=headers)
+
+
+@app.get("/api/tasks/search", response_model=TaskPage)
+def search_tasks(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user_id: str = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """
+    Full-text search over the authenticated user's tasks.
+
+    Matches words in titles and descriptions, best matches first. Pass the
+    returned next_cursor as ?cursor= with the same q for the next page.
+    Supports ?fields= and If-None-Match like GET /api/tasks.
+    """
+    user_id = int(current_user_id)
+    task_fields = _task_fields(fields)
+    headers = _list_cache_headers(db, user_id)
+    not_modified = _not_modified(if_none_match, headers)
+    if not_modified:
+        return not_modified
+
+    try:
+        page = search_user_tasks(db, user_id, q, limit, cursor, fields=task_fields)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return ORJSONModelResponse(page, headers=headers)
+
+
+@app.get("/api/tasks/changes", response_model=TaskChanges)
+def list_task_changes(
+    since: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    current_user_id: str = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """
+    Delta sync: tasks created or updated, and IDs of tasks deleted, since a cursor.
+
+    Call without since for a full snapshot. Apply deleted, then changed, and
+    pass the returned cursor as ?since=; while has_more is true, call again
+    right away to fetch the rest of the delta. Supports ?fields= like
+    GET /api/tasks. A cursor older than the tombstone retention gets 410;
+    start over without since.
+    """
+    task_fields = _task_fields(fields)
+    try:
+        changes = get_task_changes(db, int(current_user_id), since, limit, fields=task_fields)
+    except ExpiredCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=f"{e}; resync without since"
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return ORJSONModelResponse(changes)
+
+
+def _export_response(body, export_format: ExportFormat, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'}
+    )
+
+
+@app.get("/api/tasks/export")
+def export_user_tasks(
+    format: ExportFormat = ExportFormat.ndjson,
+    after: Optional[int] = Query(None, ge=0),
+    fields: Optional[str] = None,
+    current_user_id: str = Depends(get_current_user)
+):
+    """
+    Export all of the authenticated user's tasks as NDJSON or CSV.
+
+    The export is streamed in task ID order with flat memory use, however
+    many tasks there are. If a download is cut off, resume it with ?after=
+    set to the last task ID received. Supports ?fields= like GET /api/tasks.
+    """
+    task_fields = _task_fields(fields)
+    return _export_response(export_tasks(int(current_user_id), format, after, task_fields), format, "tasks")
+
+
+@app.get("/api/conversations/{conversation_id}/export")
+def export_user_conversation(
+    conversation_id: int,
+    format: ExportFormat = ExportFormat.ndjson,
+    after: Optional[int] = Query(None, ge=0),
+    current_user_id: str = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """
+    Export a conversation's messages, oldest first, as NDJSON or CSV.
+
+    Streamed like GET /api/tasks/export; resume with ?after= set to the
+    last message ID received.
+    """
+    conversation = db.get(Conversation, conversation_id)
+    if not conversation or conversation.user_id != int(current_user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversation not found"
+        )
+
+    return _export_response(
+        export_conversation(conversation_id, format, after), format, f"conversation-{conversation_id}"
+    )
+
+
+@app.get("/api/tags", response_model=List[TagCount])
+def list_tags(
+    if_none_match: Optional[str] = Header(None),
+    current_user_id: str = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """
+    Tag facets for the authenticated user: each tag with its task count.
+    Use GET /api/tasks?tag= to list the tasks carrying a tag.
+    Supports If-None-Match like GET /api/tasks.
+    """
+    user_id = int(current_user_id)
+    headers = _list_cache_headers(db, user_id)
+    not_modified = _not_modified(if_none_match, headers)
+    if not_modified:
+        return not_modified
+
+    return ORJSONModelResponse(get_user_tag_counts(db, user_id), headers=headers)
+
+
+@app.get("/api/settings/reminders", response_model=ReminderSettings)
+def get_reminder_settings(
+    current_user_id: str = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """
+    Lead times, in minutes, at which the user is reminded before each due
+    date. The reminder at the due date itself is always sent.
+    """
+    return ReminderSettings(lead_minutes=get_reminder_leads(db, int(current_user_id)))
+
+
+@app.put("/api/settings/reminders", response_model=ReminderSettings)
+def update_reminder_settings(
+    settings: ReminderSettings,
+    current_user_id: str = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """
+    Replace the user's reminder lead times (e.g. {"lead_minutes": [1440, 15]}
+    for a day and 15 minutes before). Reminders of the user's pending tasks
+    are rescheduled right away.
+    """
+    leads = set_reminder_leads(db, int(current_user_id), settings.lead_minutes)
+    db.commit()
+    return ReminderSettings(lead_minutes=leads)
+
+
+def _task_etag(version: int) -> str:
+    """Strong ETag for one version of a task"""
+    return f'"{version}"'
+
+
+def _if_match_version(if_match: Optional[str]) -> Optional[int]:
+    """
+    Task version required by an If-Match header, or None when the write is
+    unconditional (no header, or "*").
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    value = if_match.strip()
+    if len(value) > 2 and value[0] == value[-1] == '"' and value[1:-1].isdigit():
+        return int(value[1:-1])
+    # Weak or foreign entity tags can never match a task version
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="If-Match does not match the current task version"
+    )
 
 
 @app.post("/api/tasks", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
@@ -492,19 +1011,95 @@ def create_task(
     db: Session = Depends(get_session)
 ):
     """Create a new task."""
-    task = create_task_for_user(db, task_data, current_user_id)
-    return task
+    task = create_task_for_user(db, task_data, int(current_user_id))
+    return ORJSONModelResponse(task, status_code=status.HTTP_201_CREATED, headers={"ETag": _task_etag(task.version)})
+
+
+@app.post("/api/tasks/bulk", response_model=TaskBulkResponse)
+def bulk_tasks(
+    request: TaskBulkRequest,
+    current_user_id: str = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """
+    Apply a list of create/update/delete operations in one transaction.
+
+    Each operation is {"op": "create"|"update"|"delete", "task_id": ..., "data": {...}}.
+    The response has one result per operation, in request order; items that
+    are invalid or not found are reported and skipped without failing the rest.
+    """
+    if len(request.operations) > MAX_BULK_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_OPERATIONS} operations per request"
+        )
+
+    return bulk_mutate_tasks(db, int(current_user_id), request.operations)
+
+
+def _record_import(db: Session, importer: TaskImporter):
+    # Discard anything a failed chunk left behind; earlier chunks are committed
+    db.rollback()
+    enqueue_tasks_imported_event(db, importer.user_id, importer.imported, importer.failed)
+    db.commit()
+
+
+@app.post("/api/tasks/import", response_model=TaskImportResult)
+async def import_tasks(
+    request: Request,
+    current_user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Import tasks from a streamed NDJSON body, one TaskCreate object per line.
+
+    Lines are validated and inserted in chunks of IMPORT_CHUNK_SIZE, each
+    committed on its own. Invalid lines are skipped and reported by line
+    number. One tasks.imported event, written through the outbox, summarizes
+    the import instead of a task.created event per task.
+
+    The body is read on the event loop and each chunk is written through
+    the async session (run_sync), so the import never blocks the loop.
+    """
+    importer = TaskImporter(int(current_user_id))
+    try:
+        async for lines in iter_ndjson_chunks(request.stream()):
+            await db.run_sync(importer.add, lines)
+    except InvalidImportError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{e} ({importer.imported} tasks were imported before the error)"
+        )
+    finally:
+        if importer.imported:
+            await db.run_sync(_record_import, importer)
+            wake_outbox_relay()
+
+    return importer.result()
 
 
 @app.put("/api/tasks/{task_id}", response_model=TaskRead)
 def update_task_endpoint(
     task_id: int,
     task_update: TaskUpdate,
+    if_match: Optional[str] = Header(None),
     current_user_id: str = Depends(get_current_user),
     db: Session = Depends(get_session)
 ):
-    """Update a task."""
-    task = update_task(db, task_id, current_user_id, task_update)
+    """
+    Update a task.
+
+    Send the task's version as If-Match ("3") to make the update conditional;
+    a stale version gets 412 and the task is left unchanged.
+    """
+    try:
+        task = update_task(db, task_id, int(current_user_id), task_update, _if_match_version(if_match))
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=str(e),
+            headers={"ETag": _task_etag(e.current_version)}
+        )
 
     if not task:
         raise HTTPException(
@@ -512,17 +1107,29 @@ def update_task_endpoint(
             detail="Task not found"
         )
 
-    return task
+    return ORJSONModelResponse(task, headers={"ETag": _task_etag(task.version)})
 
 
 @app.delete("/api/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_task_endpoint(
     task_id: int,
+    if_match: Optional[str] = Header(None),
     current_user_id: str = Depends(get_current_user),
     db: Session = Depends(get_session)
 ):
-    """Delete a task."""
-    success = delete_task(db, task_id, current_user_id)
+    """
+    Delete a task.
+
+    Send the task's version as If-Match to delete only if it is unchanged.
+    """
+    try:
+        success = delete_task(db, task_id, int(current_user_id), _if_match_version(if_match))
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=str(e),
+            headers={"ETag": _task_etag(e.current_version)}
+        )
 
     if not success:
         raise HTTPException(
@@ -544,11 +1151,23 @@ def health_check():
     return {"status": "healthy", "message": "Todo API is running!"}
 
 
+@app.get("/health/db-pool")
+def db_pool_health():
+    """
+    Live connection pool gauges (checked-out, overflow, checkout wait time)
+    for sizing replicas and DB_POOL_* settings.
+    """
+    return {
+        "sync": pool_stats(engine),
+        "async": pool_stats(get_async_engine().sync_engine),
+    }
+
+
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat_with_assistant(
     chat_request: ChatRequest,
     current_user_id: str = Depends(get_current_user),
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """
     Stateless chat endpoint that processes messages via OpenAI Agent.
@@ -575,16 +1194,16 @@ async def chat_with_assistant(
     if not conversation_id:
         conversation = Conversation(user_id=user_id_int)
         db.add(conversation)
-        db.commit()
-        db.refresh(conversation)
+        await db.commit()
+        await db.refresh(conversation)
         conversation_id = conversation.id
     else:
         # Verify conversation exists and belongs to user
-        conversation = db.exec(
+        conversation = (await db.exec(
             select(Conversation)
             .where(Conversation.id == conversation_id)
             .where(Conversation.user_id == user_id_int)
-        ).first()
+        )).first()
         if not conversation:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -610,10 +1229,10 @@ async def chat_with_assistant(
         
         # Fallback to simple processing if agent fails
         try:
-            response_text = process_user_message_fallback(user_message, current_user_id, db)
+            response_text = await process_user_message_fallback(user_message, current_user_id, db)
             
             # Save messages to DB
-            save_chat_messages(db, conversation_id, user_message, response_text)
+            await save_chat_messages(db, conversation_id, user_message, response_text)
             
             return ChatResponse(
                 response=response_text,
@@ -625,7 +1244,7 @@ async def chat_with_assistant(
             generic_response = f"I received your message: '{user_message}'. I'm having trouble processing it right now. Try 'Add task [name]' or 'List tasks'."
             
             try:
-                save_chat_messages(db, conversation_id, user_message, generic_response)
+                await save_chat_messages(db, conversation_id, user_message, generic_response)
             except:
                 pass  # Silently fail on DB error
             
@@ -640,7 +1259,7 @@ async def run_agent_for_chat(
     user_id: int,
     user_message: str,
     conversation_id: int,
-    db: Session
+    db: AsyncSession
 ) -> Dict[str, Any]:
     """
     Run the OpenAI Agent for chat processing.
@@ -660,7 +1279,7 @@ async def run_agent_for_chat(
     return result
 
 
-def save_chat_messages(db: Session, conversation_id: int, user_message: str, assistant_response: str):
+async def save_chat_messages(db: AsyncSession, conversation_id: int, user_message: str, assistant_response: str):
     """Save user and assistant messages to the database."""
     # Save user message
     user_msg = Message(
@@ -677,10 +1296,10 @@ def save_chat_messages(db: Session, conversation_id: int, user_message: str, ass
         content=assistant_response
     )
     db.add(assistant_msg)
-    db.commit()
+    await db.commit()
 
 
-def process_user_message_fallback(message: str, user_id: str, db: Session) -> str:
+async def process_user_message_fallback(message: str, user_id: str, db: AsyncSession) -> str:
     """
     Fallback message processor when OpenAI Agent is unavailable.
     Uses simple pattern matching for basic task operations.
@@ -700,11 +1319,11 @@ def process_user_message_fallback(message: str, user_id: str, db: Session) -> st
             return "Please specify what task you'd like to add. For example: 'Add task Buy groceries'"
 
         task_data = TaskCreate(title=task_title, description="Added via chat")
-        task = create_task_for_user(db, task_data, user_id_int)
+        task = await create_task_for_user_async(db, task_data, user_id_int)
         return f"Task '{task.title}' has been added successfully!"
 
     elif "list task" in message_lower or "show task" in message_lower or "my task" in message_lower:
-        tasks = get_user_tasks(db, user_id_int, "all")
+        tasks = await get_user_tasks_async(db, user_id_int, "all")
         if not tasks:
             return "You don't have any tasks yet. Try adding one!"
 
@@ -720,10 +1339,10 @@ def process_user_message_fallback(message: str, user_id: str, db: Session) -> st
         task_id_match = re.search(r'\d+', message)
         if task_id_match:
             task_id = int(task_id_match.group())
-            task = get_task_by_id(db, task_id, user_id_int)
+            task = await get_task_by_id_async(db, task_id, user_id_int)
             if task:
                 task_update = TaskUpdate(status="completed")
-                updated_task = update_task(db, task_id, user_id_int, task_update)
+                updated_task = await update_task_async(db, task_id, user_id_int, task_update)
                 if updated_task:
                     return f"Task '{updated_task.title}' has been marked as completed!"
                 return f"Failed to update task {task_id}."
@@ -735,9 +1354,9 @@ def process_user_message_fallback(message: str, user_id: str, db: Session) -> st
         task_id_match = re.search(r'\d+', message)
         if task_id_match:
             task_id = int(task_id_match.group())
-            task = get_task_by_id(db, task_id, user_id_int)
+            task = await get_task_by_id_async(db, task_id, user_id_int)
             if task:
-                success = delete_task(db, task_id, user_id_int)
+                success = await delete_task_async(db, task_id, user_id_int)
                 if success:
                     return f"Task '{task.title}' has been deleted successfully!"
                 return f"Failed to delete task {task_id}."
@@ -1,23 +1,12 @@
 import asyncio
-from contextlib import contextmanager
 from mcp import Server
+from sqlmodel import Session
 from backend.app.skills.todo_skill import TodoManagementSkill
-from backend.database.connection import Session, engine
+from backend.database.deps import get_db_session
 
 # Create MCP server instance
 server = Server("todo-mcp-server")
 
-@contextmanager
-def get_db_session():
-    """
-    Context manager for database sessions
-    """
-    with Session(engine) as session:
-        try:
-            yield session
-        finally:
-            session.close()
-
 
 def get_skill(session: Session, user_id: int = 1) -> TodoManagementSkill:
     """
@@ -0,0 +1,77 @@
+"""
+Alembic environment.
+
+When migrations are applied by the app (database/migrations.py) the shared
+engine is handed over in config.attributes; when run from the alembic CLI
+the engine comes from the registry for DATABASE_URL.
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlmodel import SQLModel
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Autogenerate compares against the SQLModel metadata. Only import the models
+# if nothing has registered them yet (they may already be loaded under the
+# backend.* package path, and importing them twice redefines the tables).
+if not SQLModel.metadata.tables:
+    import models.todo_models  # noqa: F401
+
+target_metadata = SQLModel.metadata
+
+# Search index objects are created by raw DDL in migrations and are not part
+# of the SQLModel metadata; keep autogenerate from proposing to drop them.
+SEARCH_INDEX_OBJECTS = {"search_vector", "ix_tasks_search_vector"}
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    if reflected and compare_to is None:
+        if name in SEARCH_INDEX_OBJECTS or (name or "").startswith("tasks_fts"):
+            return False
+    return True
+
+
+def _get_engine():
+    engine = config.attributes.get("engine")
+    if engine is None:
+        from database.connection import get_engine
+        engine = get_engine()
+    return engine
+
+
+def run_migrations_offline():
+    """
+    Emit SQL to stdout instead of running it (alembic upgrade --sql).
+    """
+    context.configure(
+        url=_get_engine().url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with _get_engine().connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite cannot ALTER most things in place; batch mode rebuilds tables
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,81 @@
+"""baseline schema (users, tasks, conversations, messages)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15
+
+Databases created earlier by SQLModel.metadata.create_all are stamped at
+this revision instead of running it (see database/migrations.py).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("status", sa.Enum("pending", "completed", name="taskstatus"), nullable=False),
+        sa.Column(
+            "priority",
+            sa.Enum("low", "medium", "high", "urgent", name="taskpriority"),
+            nullable=False,
+        ),
+        sa.Column("due_date", sa.DateTime(), nullable=True),
+        sa.Column("tags", sa.String(), nullable=True),
+        sa.Column(
+            "recurrence",
+            sa.Enum("daily", "weekly", "monthly", "yearly", name="taskrecurrence"),
+            nullable=True,
+        ),
+        sa.Column("reminder_sent", sa.Boolean(), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+    op.create_table(
+        "conversations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+    op.create_table(
+        "messages",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("conversation_id", sa.Integer(), sa.ForeignKey("conversations.id"), nullable=False),
+        sa.Column("role", sa.Enum("user", "assistant", name="messagerole"), nullable=False),
+        sa.Column("content", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("messages")
+    op.drop_table("conversations")
+    op.drop_table("tasks")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_table("users")
+    for enum_name in ("messagerole", "taskrecurrence", "taskpriority", "taskstatus"):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,52 @@
+"""hot-path composite and partial indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+
+- tasks(user_id, status): get_user_tasks
+- tasks(due_date, id) WHERE pending AND NOT reminder_sent: /reminder-cron
+- messages(conversation_id, created_at): load_conversation_history
+- conversations(user_id, updated_at): get_or_create_conversation
+
+On Postgres the indexes are built with CREATE INDEX CONCURRENTLY outside a
+transaction, so writes to the tables are not blocked while they build.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_user_id_status", "tasks", ["user_id", "status"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_pending_reminder_due", "tasks", ["due_date", "id"],
+            postgresql_where=sa.text("status = 'pending' AND reminder_sent = false AND due_date IS NOT NULL"),
+            sqlite_where=sa.text("status = 'pending' AND reminder_sent = 0 AND due_date IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_messages_conversation_id_created_at", "messages", ["conversation_id", "created_at"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_conversations_user_id_updated_at", "conversations", ["user_id", "updated_at"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_conversations_user_id_updated_at", table_name="conversations", postgresql_concurrently=True)
+        op.drop_index("ix_messages_conversation_id_created_at", table_name="messages", postgresql_concurrently=True)
+        op.drop_index("ix_tasks_pending_reminder_due", table_name="tasks", postgresql_concurrently=True)
+        op.drop_index("ix_tasks_user_id_status", table_name="tasks", postgresql_concurrently=True)
@@ -0,0 +1,40 @@
+"""task keyset pagination indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15
+
+GET /api/tasks pages by (user_id, [status,] id). tasks(user_id, status) is
+replaced by tasks(user_id, status, id), which serves the same filters and
+also returns rows already in page order.
+"""
+
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_user_id_id", "tasks", ["user_id", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_user_id_status_id", "tasks", ["user_id", "status", "id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_tasks_user_id_status", table_name="tasks", postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_user_id_status", "tasks", ["user_id", "status"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_tasks_user_id_status_id", table_name="tasks", postgresql_concurrently=True)
+        op.drop_index("ix_tasks_user_id_id", table_name="tasks", postgresql_concurrently=True)
@@ -0,0 +1,35 @@
+"""task filter and sort indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15
+
+Backs the sort= and due/priority filters of GET /api/tasks with
+(user_id, <sort column>, id) indexes, which also serve keyset pagination
+within each sort order.
+"""
+
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_tasks_user_id_due_date_id", ["user_id", "due_date", "id"]),
+    ("ix_tasks_user_id_created_at_id", ["user_id", "created_at", "id"]),
+    ("ix_tasks_user_id_priority_id", ["user_id", "priority", "id"]),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, "tasks", columns, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name="tasks", postgresql_concurrently=True)
@@ -0,0 +1,76 @@
+"""full-text search over task titles and descriptions
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15
+
+Postgres: a stored generated tsvector column with a GIN index.
+SQLite: an external-content FTS5 table kept in sync by triggers.
+
+Either way the database maintains the index on every insert, update and
+delete of a task, whichever code path writes it.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+TSVECTOR_EXPRESSION = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        op.add_column(
+            "tasks",
+            sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(TSVECTOR_EXPRESSION, persisted=True)),
+        )
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_tasks_search_vector", "tasks", ["search_vector"],
+                postgresql_using="gin", postgresql_concurrently=True,
+            )
+
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+            "title, description, content='tasks', content_rowid='id')"
+        )
+        op.execute(
+            "CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+            "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+            "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+            "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+            "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+            "END"
+        )
+        op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index("ix_tasks_search_vector", table_name="tasks", postgresql_concurrently=True)
+        op.drop_column("tasks", "search_vector")
+
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS tasks_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS tasks_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS tasks_fts_ai")
+        op.execute("DROP TABLE IF EXISTS tasks_fts")
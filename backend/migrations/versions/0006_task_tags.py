@@ -0,0 +1,67 @@
+"""normalize task tags into task_tags
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-15
+
+Moves tags out of the tasks.tags JSON string into one task_tags row per
+tag, indexed by (user_id, tag, task_id) for tag filters and tag counts.
+Existing tags are copied over in SQL before the JSON column is dropped.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "task_tags",
+        sa.Column("task_id", sa.Integer(), sa.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("tag", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+    )
+    op.create_index("ix_task_tags_user_id_tag_task_id", "task_tags", ["user_id", "tag", "task_id"])
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            "INSERT INTO task_tags (task_id, tag, user_id) "
+            "SELECT DISTINCT t.id, j.tag, t.user_id "
+            "FROM tasks t, jsonb_array_elements_text(t.tags::jsonb) AS j(tag) "
+            "WHERE t.tags IS NOT NULL AND t.tags <> ''"
+        )
+    elif dialect == "sqlite":
+        op.execute(
+            "INSERT INTO task_tags (task_id, tag, user_id) "
+            "SELECT DISTINCT t.id, j.value, t.user_id "
+            "FROM tasks t, json_each(t.tags) AS j "
+            "WHERE t.tags IS NOT NULL AND json_valid(t.tags)"
+        )
+
+    op.drop_column("tasks", "tags")
+
+
+def downgrade():
+    op.add_column("tasks", sa.Column("tags", sa.String(), nullable=True, server_default="[]"))
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            "UPDATE tasks SET tags = agg.tags FROM ("
+            "SELECT task_id, json_agg(tag ORDER BY tag)::text AS tags FROM task_tags GROUP BY task_id"
+            ") AS agg WHERE agg.task_id = tasks.id"
+        )
+    elif dialect == "sqlite":
+        op.execute(
+            "UPDATE tasks SET tags = ("
+            "SELECT json_group_array(tag) FROM (SELECT tag FROM task_tags WHERE task_id = tasks.id ORDER BY tag)"
+            ") WHERE EXISTS (SELECT 1 FROM task_tags WHERE task_id = tasks.id)"
+        )
+
+    op.drop_index("ix_task_tags_user_id_tag_task_id", table_name="task_tags")
+    op.drop_table("task_tags")
@@ -0,0 +1,26 @@
+"""task row version for optimistic concurrency
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-15
+
+Adds tasks.version, bumped by every update. Writes from clients that send
+If-Match are guarded by it in the UPDATE / DELETE itself, so conflicting
+edits get 412 without a read-before-write or row locks.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("tasks", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade():
+    op.drop_column("tasks", "version")
@@ -0,0 +1,26 @@
+"""per-user task change version
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-15
+
+Adds users.task_version, bumped with every write to the user's tasks. Task
+list endpoints serve it as their ETag so unchanged lists are answered with
+304 from a primary-key lookup.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("users", sa.Column("task_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade():
+    op.drop_column("users", "task_version")
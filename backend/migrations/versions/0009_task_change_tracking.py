@@ -0,0 +1,52 @@
+"""task change tracking for delta sync
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-15
+
+Stamps tasks with the users.task_version of the write that last touched
+them and keeps a tombstone per deleted task, so GET /api/tasks/changes can
+page through everything after a client's cursor with an index range scan.
+Existing tasks start at change_version 0, which every cursor is past.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("tasks", sa.Column("change_version", sa.Integer(), nullable=False, server_default="0"))
+    op.create_table(
+        "task_tombstones",
+        sa.Column("task_id", sa.Integer(), primary_key=True),
+        sa.Column("change_version", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_task_tombstones_user_id_change_version_task_id",
+        "task_tombstones",
+        ["user_id", "change_version", "task_id"],
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_user_id_change_version_id",
+            "tasks",
+            ["user_id", "change_version", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_tasks_user_id_change_version_id", table_name="tasks", postgresql_concurrently=True)
+
+    op.drop_index("ix_task_tombstones_user_id_change_version_task_id", table_name="task_tombstones")
+    op.drop_table("task_tombstones")
+    op.drop_column("tasks", "change_version")
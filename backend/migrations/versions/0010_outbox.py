@@ -0,0 +1,33 @@
+"""transactional outbox for task events
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-15
+
+Task writes insert their events into outbox in the same transaction; the
+relay (services/outbox_relay.py) publishes them in ID order and deletes
+them, so a crash between commit and publish can no longer lose an event.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("topic", sa.String(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("outbox")
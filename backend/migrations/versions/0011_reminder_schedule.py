@@ -0,0 +1,70 @@
+"""reminder schedule with lead times
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-15
+
+Reminders move from a scan of tasks to reminder_schedule: one row per task
+and lead time, keyed for reading by the minute bucket it falls in, and
+marked sent once claimed. users.reminder_leads holds each user's extra
+lead times. Existing pending tasks get their due-time row; the partial
+tasks index the old reminder scan used is dropped.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("users", sa.Column("reminder_leads", sa.String(), nullable=False, server_default=""))
+    op.create_table(
+        "reminder_schedule",
+        sa.Column("task_id", sa.Integer(), sa.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("lead_minutes", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("remind_at", sa.DateTime(), nullable=False),
+        sa.Column("bucket", sa.DateTime(), nullable=False),
+        sa.Column("sent", sa.Boolean(), nullable=False),
+    )
+    op.create_index(
+        "ix_reminder_schedule_unsent_bucket",
+        "reminder_schedule",
+        ["bucket", "task_id", "lead_minutes"],
+        postgresql_where=sa.text("sent = false"),
+        sqlite_where=sa.text("sent = 0"),
+    )
+    op.create_index("ix_reminder_schedule_user_id_task_id", "reminder_schedule", ["user_id", "task_id"])
+
+    if op.get_bind().dialect.name == "postgresql":
+        bucket, false = "date_trunc('minute', due_date)", "false"
+    else:
+        # Same text format SQLAlchemy writes, so buckets compare correctly
+        bucket, false = "strftime('%Y-%m-%d %H:%M:00.000000', due_date)", "0"
+    op.execute(
+        "INSERT INTO reminder_schedule (task_id, lead_minutes, user_id, remind_at, bucket, sent) "
+        f"SELECT id, 0, user_id, due_date, {bucket}, {false} FROM tasks "
+        f"WHERE status = 'pending' AND reminder_sent = {false} AND due_date IS NOT NULL"
+    )
+
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_tasks_pending_reminder_due", table_name="tasks", postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_pending_reminder_due", "tasks", ["due_date", "id"],
+            postgresql_where=sa.text("status = 'pending' AND reminder_sent = false AND due_date IS NOT NULL"),
+            sqlite_where=sa.text("status = 'pending' AND reminder_sent = 0 AND due_date IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+    op.drop_index("ix_reminder_schedule_user_id_task_id", table_name="reminder_schedule")
+    op.drop_index("ix_reminder_schedule_unsent_bucket", table_name="reminder_schedule")
+    op.drop_table("reminder_schedule")
+    op.drop_column("users", "reminder_leads")
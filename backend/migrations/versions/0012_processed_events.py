@@ -0,0 +1,33 @@
+"""processed events for idempotent subscribers
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-15
+
+Every published event now carries an event_id. Subscribers record the IDs
+they have handled in processed_events, in the same transaction as their
+work, and skip redeliveries. Entries expire after a retention period.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "processed_events",
+        sa.Column("consumer", sa.String(), primary_key=True),
+        sa.Column("event_id", sa.String(), primary_key=True),
+        sa.Column("processed_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_processed_events_processed_at", "processed_events", ["processed_at"])
+
+
+def downgrade():
+    op.drop_index("ix_processed_events_processed_at", table_name="processed_events")
+    op.drop_table("processed_events")
@@ -0,0 +1,30 @@
+"""task tombstone retention
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-15
+
+Tombstones older than TOMBSTONE_RETENTION_DAYS are purged; the index on
+deleted_at keeps the purge a range scan. Sync cursors older than the
+retention period are refused, so no client misses a purged deletion.
+"""
+
+from alembic import op
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_task_tombstones_deleted_at", "task_tombstones", ["deleted_at"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_task_tombstones_deleted_at", table_name="task_tombstones", postgresql_concurrently=True)
@@ -1,8 +1,13 @@
 from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional, List
+from sqlalchemy import Index, Text, text
+from typing import Annotated, Any, Dict, Optional, List, Union
 from datetime import datetime
 import enum
 
+# Lead times a user can ask to be reminded at, before each due date
+MAX_REMINDER_LEADS = 5
+MAX_REMINDER_LEAD_MINUTES = 7 * 24 * 60
+
 # Define the TaskStatus enum
 class TaskStatus(str, enum.Enum):
     pending = "pending"
@@ -22,6 +27,26 @@ class TaskRecurrence(str, enum.Enum):
     monthly = "monthly"
     yearly = "yearly"
 
+# Sort orders for task listing; a leading "-" sorts descending
+class TaskSort(str, enum.Enum):
+    created_at = "created_at"
+    created_at_desc = "-created_at"
+    due_date = "due_date"
+    due_date_desc = "-due_date"
+    priority = "priority"
+    priority_desc = "-priority"
+
+# Formats offered by the export endpoints
+class ExportFormat(str, enum.Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+# Operation kinds accepted by POST /api/tasks/bulk
+class BulkOperationType(str, enum.Enum):
+    create = "create"
+    update = "update"
+    delete = "delete"
+
 # User model
 class User(SQLModel, table=True):
     __tablename__ = "users"
@@ -30,12 +55,29 @@ class User(SQLModel, table=True):
     email: str = Field(unique=True, index=True)
     name: str
     password: str
+    # Bumped with every write to the user's tasks; ETag of the task listings
+    task_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # Extra reminders, in minutes before the due date, comma-separated ("1440,15")
+    reminder_leads: str = Field(default="", sa_column_kwargs={"server_default": ""})
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 # Task model
 class Task(SQLModel, table=True):
     __tablename__ = "tasks"
+    # Indexes are created by migrations (see migrations/versions); they are
+    # declared here too so autogenerate sees no difference.
+    __table_args__ = (
+        # Keyset pagination of a user's tasks, with and without a status filter
+        Index("ix_tasks_user_id_id", "user_id", "id"),
+        Index("ix_tasks_user_id_status_id", "user_id", "status", "id"),
+        # Sorted listings and due-window / priority filters
+        Index("ix_tasks_user_id_due_date_id", "user_id", "due_date", "id"),
+        Index("ix_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_tasks_user_id_priority_id", "user_id", "priority", "id"),
+        # Delta sync: a user's tasks changed after a given version
+        Index("ix_tasks_user_id_change_version_id", "user_id", "change_version", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
@@ -43,9 +85,12 @@ class Task(SQLModel, table=True):
     status: TaskStatus = Field(default=TaskStatus.pending)
     priority: TaskPriority = Field(default=TaskPriority.medium)
     due_date: Optional[datetime] = None
-    tags: Optional[str] = Field(default="[]")  # JSON string for array of tags
     recurrence: Optional[TaskRecurrence] = None
-    reminder_sent: bool = Field(default=False)  # Track if reminder has been sent
+    reminder_sent: bool = Field(default=False)  # Track if the due-time reminder has been sent
+    # Bumped on every update; clients send it back in If-Match to guard writes
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+    # users.task_version of the write that last touched this task (delta sync)
+    change_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     user_id: int = Field(foreign_key="users.id")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -53,9 +98,109 @@ class Task(SQLModel, table=True):
     # Relationship to user
     user: User = Relationship()
 
+    # Tags live in task_tags; loaded with one batched IN query per result set
+    tag_links: List["TaskTag"] = Relationship(
+        sa_relationship_kwargs={
+            "cascade": "all, delete-orphan",
+            "lazy": "selectin",
+            "order_by": "TaskTag.tag",
+        }
+    )
+
+    @property
+    def tag_names(self) -> List[str]:
+        return [link.tag for link in self.tag_links]
+
+    def set_tags(self, tags: Optional[List[str]]):
+        """
+        Replace the task's tags, keeping the rows for tags that stay
+        """
+        wanted = list(dict.fromkeys(tags or []))
+        kept = [link for link in self.tag_links if link.tag in wanted]
+        existing = {link.tag for link in kept}
+        self.tag_links = kept + [
+            TaskTag(tag=tag, user_id=self.user_id) for tag in wanted if tag not in existing
+        ]
+
+# Task tag model (one row per tag on a task)
+class TaskTag(SQLModel, table=True):
+    __tablename__ = "task_tags"
+    __table_args__ = (
+        # Tasks by tag and tag counts per user
+        Index("ix_task_tags_user_id_tag_task_id", "user_id", "tag", "task_id"),
+    )
+
+    task_id: int = Field(foreign_key="tasks.id", primary_key=True, ondelete="CASCADE")
+    tag: str = Field(primary_key=True)
+    user_id: int = Field(foreign_key="users.id")
+
+# Deleted task marker, kept so delta sync clients learn about deletions
+class TaskTombstone(SQLModel, table=True):
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_user_id_change_version_task_id", "user_id", "change_version", "task_id"),
+        # Expiry of old tombstones
+        Index("ix_task_tombstones_deleted_at", "deleted_at"),
+    )
+
+    task_id: int = Field(primary_key=True)
+    change_version: int = Field(primary_key=True)
+    user_id: int = Field(foreign_key="users.id")
+    deleted_at: datetime = Field(default_factory=datetime.utcnow)
+
+# One reminder of a task: at the due date (lead 0) or one of the user's
+# lead times before it. Rows are rewritten whenever the task's due date or
+# status or the user's lead times change, and marked sent when claimed.
+class ReminderSchedule(SQLModel, table=True):
+    __tablename__ = "reminder_schedule"
+    __table_args__ = (
+        # Unsent reminders by minute bucket (/reminder-cron, scheduler reloads)
+        Index(
+            "ix_reminder_schedule_unsent_bucket", "bucket", "task_id", "lead_minutes",
+            postgresql_where=text("sent = false"),
+            sqlite_where=text("sent = 0"),
+        ),
+        # A user's rows, rewritten when their lead times change
+        Index("ix_reminder_schedule_user_id_task_id", "user_id", "task_id"),
+    )
+
+    task_id: int = Field(foreign_key="tasks.id", primary_key=True, ondelete="CASCADE")
+    lead_minutes: int = Field(primary_key=True)
+    user_id: int = Field(foreign_key="users.id")
+    # When the reminder is due (due_date - lead_minutes) and its minute
+    remind_at: datetime
+    bucket: datetime
+    sent: bool = Field(default=False)
+
+# Event written in the same transaction as the change it describes;
+# the outbox relay publishes it to Dapr and deletes it
+class OutboxEvent(SQLModel, table=True):
+    __tablename__ = "outbox"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int
+    topic: str
+    payload: str = Field(sa_type=Text)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+# Event a subscriber has handled, kept for a while so redeliveries are skipped
+class ProcessedEvent(SQLModel, table=True):
+    __tablename__ = "processed_events"
+    __table_args__ = (
+        # Expiry of old entries
+        Index("ix_processed_events_processed_at", "processed_at"),
+    )
+
+    consumer: str = Field(primary_key=True)
+    event_id: str = Field(primary_key=True)
+    processed_at: datetime = Field(default_factory=datetime.utcnow)
+
 # Conversation model (from specs)
 class Conversation(SQLModel, table=True):
     __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ix_conversations_user_id_updated_at", "user_id", "updated_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id")
@@ -69,6 +214,9 @@ class MessageRole(str, enum.Enum):
 
 class Message(SQLModel, table=True):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_conversation_id_created_at", "conversation_id", "created_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     conversation_id: int = Field(foreign_key="conversations.id")
@@ -108,6 +256,84 @@ class TaskRead(SQLModel):
     tags: List[str] = []
     recurrence: Optional[TaskRecurrence] = None
     reminder_sent: bool = False
+    version: int = 1
     user_id: int
     created_at: datetime
-    updated_at: datetime
\ No newline at end of file
+    updated_at: datetime
+
+class TaskFilters(SQLModel):
+    """Query parameters accepted by GET /api/tasks."""
+    status_filter: str = "all"
+    priority: Optional[TaskPriority] = None
+    due_before: Optional[datetime] = None
+    due_after: Optional[datetime] = None
+    overdue: Optional[bool] = None
+    tag: Optional[str] = None
+    recurrence: Optional[TaskRecurrence] = None
+    sort: Optional[TaskSort] = None
+
+class TagCount(SQLModel):
+    tag: str
+    count: int
+
+class TaskPage(SQLModel):
+    """
+    One page of tasks; pass next_cursor back as ?cursor= for the next page.
+    With ?fields=, items carry only the requested fields.
+    """
+    items: List[Union[TaskRead, Dict[str, Any]]]
+    next_cursor: Optional[str] = None
+
+class TaskBulkOperation(SQLModel):
+    """
+    One item of a bulk request. data holds TaskCreate fields for create and
+    TaskUpdate fields for update; task_id is required for update and delete.
+    """
+    op: BulkOperationType
+    task_id: Optional[int] = None
+    data: Optional[Dict[str, Any]] = None
+
+class TaskBulkRequest(SQLModel):
+    operations: List[TaskBulkOperation]
+
+class TaskBulkResult(SQLModel):
+    """Outcome of one bulk item: created, updated, deleted, not_found or invalid."""
+    index: int
+    op: BulkOperationType
+    status: str
+    task_id: Optional[int] = None
+    task: Optional[TaskRead] = None
+    error: Optional[str] = None
+
+class TaskBulkResponse(SQLModel):
+    results: List[TaskBulkResult]
+
+class ReminderSettings(SQLModel):
+    """
+    Reminders a user gets before each due date, on top of the one at the
+    due date itself
+    """
+    lead_minutes: List[Annotated[int, Field(ge=1, le=MAX_REMINDER_LEAD_MINUTES)]] = Field(
+        default_factory=list, max_length=MAX_REMINDER_LEADS
+    )
+
+class TaskChanges(SQLModel):
+    """
+    Task changes after a sync cursor. Apply deleted before changed, then pass
+    cursor back as ?since= (immediately if has_more, otherwise on the next sync).
+    """
+    changed: List[Union[TaskRead, Dict[str, Any]]]  # only the requested fields with ?fields=
+    deleted: List[int]
+    cursor: str
+    has_more: bool = False
+
+class TaskImportError(SQLModel):
+    """An NDJSON import line that was skipped (lines are numbered from 1)."""
+    line: int
+    error: str
+
+class TaskImportResult(SQLModel):
+    """Outcome of POST /api/tasks/import; errors lists the first skipped lines only."""
+    imported: int
+    failed: int
+    errors: List[TaskImportError]
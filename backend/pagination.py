@@ -0,0 +1,49 @@
+"""
+Opaque cursors for keyset pagination.
+
+A cursor carries the sort key of the last row on a page; the next page is
+fetched with a WHERE clause on that key instead of an OFFSET, so the cost of
+a page does not grow with how deep the client has paged.
+"""
+
+import base64
+import json
+from typing import Any, Dict
+
+# Page size limits for list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor that was not issued by us."""
+
+
+class ExpiredCursorError(InvalidCursorError):
+    """Raised when a sync cursor is older than the deletions kept for it."""
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """
+    Encode a sort-key payload as an opaque, URL-safe cursor string
+    """
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+    if not isinstance(payload, dict):
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+    return payload
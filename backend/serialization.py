@@ -0,0 +1,38 @@
+"""
+Fast JSON encoding for task responses.
+
+Task read models are built from trusted database rows without validation
+(see tasks_crud), so FastAPI's response_model pass (validate, serialize to
+JSON-compatible Python, then json.dumps) is pure overhead for them. Routes
+return ORJSONModelResponse instead, which hands the models' field values
+straight to orjson; enums and datetimes are encoded natively.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    # Non-table models keep their field values in __dict__
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode models, lists and dicts of them to JSON bytes
+    """
+    return orjson.dumps(content, default=_default)
+
+
+class ORJSONModelResponse(JSONResponse):
+    """
+    JSON response for pydantic / SQLModel content, encoded with orjson
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,171 @@
+"""
+Process-wide async publisher for Dapr pub/sub.
+
+Events go to the sidecar's HTTP publish API over one long-lived aiohttp
+session, so publishes reuse keep-alive connections instead of opening a
+gRPC channel per event, and never block the event loop.
+
+The app starts the publisher on startup and closes it on shutdown; the
+outbox relay (services/outbox_relay.py) publishes through it. Processes
+that never start one (scripts, MCP servers) fall back to a short-lived
+session per publish.
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+# Sidecar HTTP endpoint (same variables the Dapr SDKs read)
+DAPR_HTTP_ENDPOINT = os.getenv(
+    "DAPR_HTTP_ENDPOINT", f"http://{os.getenv('DAPR_RUNTIME_HOST', '127.0.0.1')}:{os.getenv('DAPR_HTTP_PORT', '3500')}"
+)
+DAPR_API_TOKEN = os.getenv("DAPR_API_TOKEN")
+
+# Seconds allowed for one publish call
+DAPR_PUBLISH_TIMEOUT = float(os.getenv("DAPR_PUBLISH_TIMEOUT", "5"))
+
+# Keep-alive connections held open to the sidecar
+DAPR_PUBLISH_CONNECTIONS = int(os.getenv("DAPR_PUBLISH_CONNECTIONS", "20"))
+
+
+class DaprPublisher:
+    """
+    Publishes events through the Dapr HTTP API on one shared aiohttp session.
+    """
+
+    def __init__(self, endpoint: str = DAPR_HTTP_ENDPOINT, timeout: float = DAPR_PUBLISH_TIMEOUT):
+        self.endpoint = endpoint.rstrip("/")
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self):
+        headers = {"dapr-api-token": DAPR_API_TOKEN} if DAPR_API_TOKEN else None
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=DAPR_PUBLISH_CONNECTIONS),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=headers,
+        )
+        self.loop = asyncio.get_running_loop()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "DaprPublisher":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def publish(self, pubsub_name: str, topic: str, data: Dict[str, Any]) -> None:
+        """
+        Publish one JSON event
+
+        Raises:
+            aiohttp.ClientError: If the sidecar cannot be reached or rejects the event
+        """
+        url = f"{self.endpoint}/v1.0/publish/{pubsub_name}/{topic}"
+        async with self._session.post(url, json=data) as response:
+            if response.status >= 300:
+                raise aiohttp.ClientResponseError(
+                    response.request_info, response.history, status=response.status, message=await response.text()
+                )
+
+    async def publish_bulk(self, pubsub_name: str, topic: str, events: List[Dict[str, Any]]) -> List[int]:
+        """
+        Publish several JSON events in one bulk publish call
+
+        Returns:
+            List[int]: Indexes (into events) of the events the sidecar reported as failed
+
+        Raises:
+            aiohttp.ClientError: If the sidecar cannot be reached
+        """
+        url = f"{self.endpoint}/v1.0-alpha1/publish/bulk/{pubsub_name}/{topic}"
+        entries = [
+            {"entryId": str(index), "event": event, "contentType": "application/json"}
+            for index, event in enumerate(events)
+        ]
+        async with self._session.post(url, json=entries) as response:
+            if response.status < 300:
+                return []
+            try:
+                body = await response.json(content_type=None)
+            except ValueError:
+                body = None
+            if isinstance(body, dict) and "failedEntries" in body:
+                return sorted(int(entry["entryId"]) for entry in body["failedEntries"])
+            raise aiohttp.ClientResponseError(
+                response.request_info, response.history, status=response.status, message=str(body)
+            )
+
+
+_publisher: Optional[DaprPublisher] = None
+
+async def start_publisher() -> DaprPublisher:
+    """
+    Create the process-wide publisher on the running loop (app startup)
+    """
+    global _publisher
+    if _publisher is None:
+        publisher = DaprPublisher()
+        await publisher.start()
+        _publisher = publisher
+    return _publisher
+
+
+async def stop_publisher():
+    """
+    Close the process-wide publisher (app shutdown)
+    """
+    global _publisher
+    publisher, _publisher = _publisher, None
+    if publisher is not None:
+        await publisher.close()
+
+
+def _current_publisher() -> Optional[DaprPublisher]:
+    """
+    The shared publisher, if it was started on the loop running in this thread
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    if _publisher is not None and _publisher.loop is loop:
+        return _publisher
+    return None
+
+
+async def publish_event(pubsub_name: str, topic: str, data: Dict[str, Any], publisher: Optional[DaprPublisher] = None) -> None:
+    """
+    Publish one event with the given publisher, the shared one, or a short-lived one
+    """
+    publisher = publisher or _current_publisher()
+    if publisher is not None:
+        await publisher.publish(pubsub_name, topic, data)
+        return
+    async with DaprPublisher() as temporary:
+        await temporary.publish(pubsub_name, topic, data)
+
+
+async def publish_events(
+    pubsub_name: str, topic: str, events: List[Dict[str, Any]], publisher: Optional[DaprPublisher] = None
+) -> List[int]:
+    """
+    Bulk-publish events with the given publisher, the shared one, or a short-lived one
+
+    Returns:
+        List[int]: Indexes of the events the sidecar reported as failed
+    """
+    publisher = publisher or _current_publisher()
+    if publisher is not None:
+        return await publisher.publish_bulk(pubsub_name, topic, events)
+    async with DaprPublisher() as temporary:
+        return await temporary.publish_bulk(pubsub_name, topic, events)
+
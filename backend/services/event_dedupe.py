@@ -0,0 +1,139 @@
+"""
+Dedupe store for idempotent event subscribers.
+
+todo-pubsub delivers at least once, so a subscriber can see the same event
+again after a relay retry or a broker redelivery. Published events carry a
+stable event_id (see database/outbox.py), and subscribers record the IDs
+they handled in processed_events, keyed by (consumer, event_id):
+
+    1. is_duplicate_event: an in-process LRU of recently handled IDs, then
+       one primary-key lookup; a redelivery stops here, without a write
+    2. claim_event: INSERT ... ON CONFLICT DO NOTHING in the subscriber's
+       own transaction, right before its writes; it returns False when a
+       concurrent delivery got there first, so the work commits (or rolls
+       back) together with the record of having done it
+    3. remember_event after the commit, so the next redelivery is answered
+       from memory
+
+Entries older than PROCESSED_EVENT_TTL_HOURS are deleted, at most once an
+hour per process, by the claim that finds them due; the hour only starts
+counting once that claim's transaction commits.
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Tuple
+
+from sqlalchemy import delete, event
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models.todo_models import ProcessedEvent
+
+logger = logging.getLogger(__name__)
+
+# Event IDs remembered in memory per process
+DEDUPE_CACHE_SIZE = int(os.getenv("DEDUPE_CACHE_SIZE", "10000"))
+
+# How long handled event IDs are kept; longer than the broker redelivers
+PROCESSED_EVENT_TTL_HOURS = float(os.getenv("PROCESSED_EVENT_TTL_HOURS", str(7 * 24)))
+
+# Seconds between expiry runs in one process
+_PURGE_INTERVAL = 3600.0
+
+_recent: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+_next_purge = 0.0
+# session.info key: the transaction purged expired entries
+_PURGED_KEY = "processed_events_purged"
+
+
+def remember_event(consumer: str, event_id: str) -> None:
+    """
+    Note a handled event in the in-process LRU
+    """
+    key = (consumer, event_id)
+    _recent[key] = None
+    _recent.move_to_end(key)
+    while len(_recent) > DEDUPE_CACHE_SIZE:
+        _recent.popitem(last=False)
+
+
+async def is_duplicate_event(db: AsyncSession, consumer: str, event_id: str) -> bool:
+    """
+    Whether a consumer has already handled an event.
+
+    Args:
+        db: Async database session (only read)
+        consumer: Name of the subscriber
+        event_id: The event's event_id
+
+    Returns:
+        bool: True if the event was handled before
+    """
+    key = (consumer, event_id)
+    if key in _recent:
+        _recent.move_to_end(key)
+        return True
+    found = (await db.exec(
+        select(ProcessedEvent.event_id).where(ProcessedEvent.consumer == consumer, ProcessedEvent.event_id == event_id)
+    )).first()
+    if found is None:
+        return False
+    remember_event(consumer, event_id)
+    return True
+
+
+async def claim_event(db: AsyncSession, consumer: str, event_id: str) -> bool:
+    """
+    Record an event as handled inside the subscriber's transaction.
+
+    Args:
+        db: Async database session doing the subscriber's work (the caller commits)
+        consumer: Name of the subscriber
+        event_id: The event's event_id
+
+    Returns:
+        bool: False if the event is already recorded, in which case the
+        caller should roll back and skip it
+    """
+    insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    claimed = (await db.exec(
+        insert(ProcessedEvent)
+        .values(consumer=consumer, event_id=event_id, processed_at=datetime.utcnow())
+        .on_conflict_do_nothing()
+        .returning(ProcessedEvent.event_id)
+    )).first()
+    if claimed is None:
+        return False
+    await _purge_expired(db)
+    return True
+
+
+async def _purge_expired(db: AsyncSession) -> None:
+    if time.monotonic() < _next_purge:
+        return
+    cutoff = datetime.utcnow() - timedelta(hours=PROCESSED_EVENT_TTL_HOURS)
+    await db.exec(delete(ProcessedEvent).where(ProcessedEvent.processed_at < cutoff))
+    db.info[_PURGED_KEY] = True
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _schedule_next_purge(session: OrmSession):
+    """
+    Start the purge interval once a purge has committed; a rolled back one
+    is retried by the next claim
+    """
+    global _next_purge
+    if session.info.pop(_PURGED_KEY, False):
+        _next_purge = time.monotonic() + _PURGE_INTERVAL
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_rolled_back_purge(session: OrmSession):
+    session.info.pop(_PURGED_KEY, None)
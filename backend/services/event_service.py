@@ -1,18 +1,23 @@
 """
 Event Service for Dapr Pub/Sub Integration
 
-This module provides stateless event publishing and handling
-using the Dapr SDK for distributed pub/sub messaging.
+This module builds the Dapr pub/sub event payloads and handles incoming
+events. Events are only ever written to the transactional outbox
+(database/outbox.py) in the transaction that makes the change; the outbox
+relay publishes them.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
-from dapr.clients import DaprClient
+from itertools import groupby
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 import logging
 
 from models.todo_models import Task, TaskRecurrence, TaskPriority, TaskStatus
-import json
+from database.reminder_schedule import sync_reminder_schedule
+from database.task_version import bump_task_version
+from database.outbox import enqueue_events, enqueue_events_async
 
 logger = logging.getLogger(__name__)
 
@@ -22,136 +27,142 @@ TASK_EVENTS_TOPIC = "task-events"
 REMINDERS_TOPIC = "reminders"
 
 
-async def publish_task_event(
-    event_type: str,
-    task: Task,
-    dapr_client: Optional[DaprClient] = None
-) -> bool:
+def build_task_event(event_type: str, task: Task) -> Dict[str, Any]:
     """
-    Publish a task event to Dapr pub/sub.
+    Build the task-events payload for a task.
 
     Args:
         event_type: The type of event (task.created, task.updated, task.completed)
         task: The task object
-        dapr_client: Optional DaprClient instance (for testing)
 
     Returns:
-        bool: True if published successfully, False otherwise
+        Dict[str, Any]: The JSON-serializable event payload
     """
-    try:
-        # Prepare event payload
-        event_data = {
-            "event_type": event_type,
-            "task_id": task.id,
-            "user_id": task.user_id,
-            "title": task.title,
-            "description": task.description,
-            "status": task.status.value if task.status else "pending",
-            "priority": task.priority.value if task.priority else "medium",
-            "due_date": task.due_date.isoformat() if task.due_date else None,
-            "tags": json.loads(task.tags) if task.tags else [],
-            "recurrence": task.recurrence.value if task.recurrence else None,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-
-        # Add completed_at for completed events
-        if event_type == "task.completed":
-            event_data["completed_at"] = event_data["timestamp"]
-
-        # Use provided client or create a new one
-        client = dapr_client or DaprClient()
-
-        # Publish event to Dapr
-        client.publish_event(
-            pubsub_name=DAPR_PUBSUB_NAME,
-            topic_name=TASK_EVENTS_TOPIC,
-            data=json.dumps(event_data),
-            data_content_type="application/json"
-        )
-
-        logger.info(f"Published {event_type} event for task_id={task.id}")
-
-        # Close client if we created it
-        if not dapr_client:
-            client.close()
-
-        return True
+    event_data = {
+        "event_type": event_type,
+        "task_id": task.id,
+        "user_id": task.user_id,
+        "title": task.title,
+        "description": task.description,
+        "status": task.status.value if task.status else "pending",
+        "priority": task.priority.value if task.priority else "medium",
+        "due_date": task.due_date.isoformat() if task.due_date else None,
+        "tags": task.tag_names,
+        "recurrence": task.recurrence.value if task.recurrence else None,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+    # Add completed_at for completed events
+    if event_type == "task.completed":
+        event_data["completed_at"] = event_data["timestamp"]
+
+    return event_data
+
+
+def enqueue_task_events(db: Session, events: List[Tuple[str, Task]]) -> None:
+    """
+    Write task events to the outbox inside the caller's transaction.
 
-    except Exception as e:
-        logger.error(f"Failed to publish {event_type} event: {str(e)}")
-        # Don't fail the request if event publishing fails
-        return False
+    They are published by the outbox relay once the transaction commits;
+    call wake_outbox_relay() after the commit to publish right away.
+
+    Args:
+        db: Database session making the task changes
+        events: (event_type, task) pairs, in publish order
+    """
+    for user_id, group in groupby(events, key=lambda event: event[1].user_id):
+        enqueue_events(db, user_id, TASK_EVENTS_TOPIC, [build_task_event(event_type, task) for event_type, task in group])
 
 
-async def publish_task_completed_event(
-    task: Task,
-    dapr_client: Optional[DaprClient] = None
-) -> bool:
+def enqueue_task_event(db: Session, event_type: str, task: Task) -> None:
+    """
+    Write one task event to the outbox inside the caller's transaction
     """
-    Publish a task.completed event to Dapr pub/sub.
+    enqueue_task_events(db, [(event_type, task)])
+
+
+def enqueue_tasks_imported_event(db: Session, user_id: int, imported: int, failed: int) -> None:
+    """
+    Write one tasks.imported event summarizing a bulk import to the outbox,
+    instead of a task.created event per imported task.
 
     Args:
-        task: The completed task
-        dapr_client: Optional DaprClient instance (for testing)
+        db: Database session (the caller commits)
+        user_id: Owner of the imported tasks
+        imported: Number of tasks inserted
+        failed: Number of lines skipped
+    """
+    event_data = {
+        "event_type": "tasks.imported",
+        "user_id": user_id,
+        "imported": imported,
+        "failed": failed,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    enqueue_events(db, user_id, TASK_EVENTS_TOPIC, [event_data])
 
-    Returns:
-        bool: True if published successfully, False otherwise
+
+def build_reminder_event(task: Task, minutes_until_due: int, lead_minutes: int = 0) -> Dict[str, Any]:
     """
-    return await publish_task_event("task.completed", task, dapr_client)
+    Build the reminders payload for a task.
 
+    Args:
+        task: The task with an upcoming (or past) due date
+        minutes_until_due: Minutes until the task is due (negative if overdue)
+        lead_minutes: Lead time the reminder was scheduled for (0 for the due date)
 
-async def publish_task_reminder_event(
-    task: Task,
-    minutes_until_due: int,
-    dapr_client: Optional[DaprClient] = None
-) -> bool:
+    Returns:
+        Dict[str, Any]: The JSON-serializable event payload
+    """
+    return {
+        "event_type": "task.reminder",
+        "task_id": task.id,
+        "user_id": task.user_id,
+        "title": task.title,
+        "description": task.description,
+        "priority": task.priority.value if task.priority else "medium",
+        "due_date": task.due_date.isoformat() if task.due_date else None,
+        "tags": task.tag_names,
+        "minutes_until_due": minutes_until_due,
+        "lead_minutes": lead_minutes
+    }
+
+
+def build_reminders_event(user_id: int, reminders: List[Tuple[Task, int, int]]) -> Dict[str, Any]:
     """
-    Publish a task.reminder event to Dapr pub/sub.
+    Build one task.reminders payload covering several reminders of a user.
 
     Args:
-        task: The task with an upcoming due date
-        minutes_until_due: Minutes until the task is due
-        dapr_client: Optional DaprClient instance (for testing)
+        user_id: The user the reminders belong to
+        reminders: (task, minutes_until_due, lead_minutes) triples, in order
 
     Returns:
-        bool: True if published successfully, False otherwise
+        Dict[str, Any]: The JSON-serializable event payload; each entry of
+        "reminders" has the fields of a task.reminder event
     """
-    try:
-        # Prepare event payload
-        event_data = {
-            "event_type": "task.reminder",
-            "task_id": task.id,
-            "user_id": task.user_id,
-            "title": task.title,
-            "description": task.description,
-            "priority": task.priority.value if task.priority else "medium",
-            "due_date": task.due_date.isoformat() if task.due_date else None,
-            "tags": json.loads(task.tags) if task.tags else [],
-            "minutes_until_due": minutes_until_due
-        }
-
-        # Use provided client or create a new one
-        client = dapr_client or DaprClient()
-
-        # Publish event to Dapr
-        client.publish_event(
-            pubsub_name=DAPR_PUBSUB_NAME,
-            topic_name=REMINDERS_TOPIC,
-            data=json.dumps(event_data),
-            data_content_type="application/json"
-        )
-
-        logger.info(f"Published task.reminder event for task_id={task.id}, due in {minutes_until_due} minutes")
-
-        # Close client if we created it
-        if not dapr_client:
-            client.close()
-
-        return True
+    return {
+        "event_type": "task.reminders",
+        "user_id": user_id,
+        "count": len(reminders),
+        "reminders": [build_reminder_event(task, minutes, lead) for task, minutes, lead in reminders],
+        "timestamp": datetime.utcnow().isoformat()
+    }
 
-    except Exception as e:
-        logger.error(f"Failed to publish task.reminder event: {str(e)}")
-        return False
+
+async def enqueue_reminder_events_async(db: AsyncSession, reminders: List[Tuple[Task, int, int]]) -> None:
+    """
+    Write the reminders to the outbox inside the caller's transaction, as one
+    task.reminders event per user.
+
+    Args:
+        db: Async database session marking the reminders as sent
+        reminders: (task, minutes_until_due, lead_minutes) triples, in publish order
+    """
+    by_user: Dict[int, List[Tuple[Task, int, int]]] = {}
+    for reminder in reminders:
+        by_user.setdefault(reminder[0].user_id, []).append(reminder)
+    for user_id, user_reminders in by_user.items():
+        await enqueue_events_async(db, user_id, REMINDERS_TOPIC, [build_reminders_event(user_id, user_reminders)])
 
 
 def calculate_next_due_date(
@@ -185,12 +196,69 @@ def calculate_next_due_date(
         return base_date
 
 
+def create_recurring_task(event_data: Dict[str, Any], db: Session) -> Optional[Task]:
+    """
+    Create the next occurrence of a completed recurring task inside the
+    caller's transaction (flushed, not committed).
+
+    Args:
+        event_data: The task completion event data
+        db: Database session
+
+    Returns:
+        Optional[Task]: The new task, or None if the task does not recur
+    """
+    recurrence_str = event_data.get("recurrence")
+
+    # Only create new task if recurrence is set
+    if not recurrence_str:
+        logger.info(f"Task {event_data.get('task_id')} has no recurrence, skipping")
+        return None
+
+    # Parse recurrence
+    try:
+        recurrence = TaskRecurrence(recurrence_str)
+    except ValueError:
+        logger.warning(f"Invalid recurrence value: {recurrence_str}")
+        return None
+
+    # Calculate next due date
+    completed_at = event_data.get("completed_at")
+    base_date = datetime.fromisoformat(completed_at) if completed_at else None
+    next_due_date = calculate_next_due_date(recurrence, base_date)
+
+    # Create new task with same properties
+    new_task = Task(
+        title=event_data.get("title"),
+        description=event_data.get("description"),
+        status=TaskStatus.pending,
+        priority=TaskPriority(event_data.get("priority", "medium")),
+        due_date=next_due_date,
+        recurrence=recurrence,
+        user_id=event_data.get("user_id")
+    )
+    new_task.set_tags(event_data.get("tags", []))
+
+    new_task.change_version = bump_task_version(db, new_task.user_id)
+    db.add(new_task)
+    db.flush()
+    sync_reminder_schedule(db, new_task.user_id, [new_task.id])
+
+    logger.info(
+        f"Created recurring task {new_task.id} "
+        f"(from task {event_data.get('task_id')}) "
+        f"with due_date={next_due_date.isoformat()}"
+    )
+
+    return new_task
+
+
 def handle_recurring_task(event_data: Dict[str, Any], db: Session) -> Optional[Task]:
     """
     Handle recurring task logic when a task is completed.
 
     Creates a new task with the same properties but updated due date
-    if the task has a recurrence pattern.
+    if the task has a recurrence pattern, and commits it.
 
     Args:
         event_data: The task completion event data
@@ -200,50 +268,21 @@ def handle_recurring_task(event_data: Dict[str, Any], db: Session) -> Optional[T
         Optional[Task]: The newly created recurring task, or None if not recurring
     """
     try:
-        recurrence_str = event_data.get("recurrence")
-
-        # Only create new task if recurrence is set
-        if not recurrence_str:
-            logger.info(f"Task {event_data.get('task_id')} has no recurrence, skipping")
+        new_task = create_recurring_task(event_data, db)
+        if new_task is None:
             return None
-
-        # Parse recurrence
-        try:
-            recurrence = TaskRecurrence(recurrence_str)
-        except ValueError:
-            logger.warning(f"Invalid recurrence value: {recurrence_str}")
-            return None
-
-        # Calculate next due date
-        completed_at = event_data.get("completed_at")
-        base_date = datetime.fromisoformat(completed_at) if completed_at else None
-        next_due_date = calculate_next_due_date(recurrence, base_date)
-
-        # Create new task with same properties
-        new_task = Task(
-            title=event_data.get("title"),
-            description=event_data.get("description"),
-            status=TaskStatus.pending,
-            priority=TaskPriority(event_data.get("priority", "medium")),
-            due_date=next_due_date,
-            tags=json.dumps(event_data.get("tags", [])),
-            recurrence=recurrence,
-            user_id=event_data.get("user_id")
-        )
-
-        db.add(new_task)
         db.commit()
         db.refresh(new_task)
-
-        logger.info(
-            f"Created recurring task {new_task.id} "
-            f"(from task {event_data.get('task_id')}) "
-            f"with due_date={next_due_date.isoformat()}"
-        )
-
         return new_task
 
     except Exception as e:
         logger.error(f"Failed to handle recurring task: {str(e)}")
         db.rollback()
         return None
+
+
+async def create_recurring_task_async(event_data: Dict[str, Any], db: AsyncSession) -> Optional[Task]:
+    """
+    Async variant of create_recurring_task
+    """
+    return await db.run_sync(lambda session: create_recurring_task(event_data, session))
@@ -0,0 +1,144 @@
+"""
+Keyed executor: runs event-handling jobs concurrently, in order per key.
+
+The executor runs EVENT_WORKERS background tasks on the app's event loop,
+each draining its own bounded queue. A job goes to the worker its key
+hashes to, so jobs with the same key (a user's events) run one at a time
+in submission order, while jobs for other keys run in parallel on the
+other workers. A user's task.completed event and the recurring task it
+creates therefore never interleave with that user's next event.
+
+Queues hold at most EVENT_QUEUE_SIZE jobs each. submit never waits for
+room: when the key's queue is full it raises ExecutorBusyError, and the
+subscriber tells Dapr to redeliver (or drop) the events instead of
+holding the request open.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Workers, and jobs queued per worker
+EVENT_WORKERS = int(os.getenv("EVENT_WORKERS", "8"))
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "64"))
+
+Job = Callable[[], Awaitable[Any]]
+
+
+class ExecutorBusyError(Exception):
+    """Raised when a job cannot be queued: its queue is full or the executor is not running."""
+
+
+class KeyedExecutor:
+    """
+    Runs jobs on a fixed set of workers, sharded by key.
+    """
+
+    def __init__(self, workers: int = EVENT_WORKERS, queue_size: int = EVENT_QUEUE_SIZE):
+        self.workers = max(workers, 1)
+        self.queue_size = queue_size
+        self._queues: List["asyncio.Queue[Tuple[Job, asyncio.Future]]"] = []
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(self.workers)]
+        self._tasks = [loop.create_task(self._work(queue)) for queue in self._queues]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        # Jobs still queued are not run; their callers see a cancellation
+        for queue in self._queues:
+            while not queue.empty():
+                _, future = queue.get_nowait()
+                future.cancel()
+        self._tasks = []
+        self._queues = []
+
+    def submit(self, key: Any, job: Job) -> asyncio.Future:
+        """
+        Queue a job behind the earlier jobs of its key.
+
+        Args:
+            key: Ordering key (user_id as an int); jobs with equal keys run in
+                order, so callers normalize keys that may arrive as strings
+            job: Coroutine function to run
+
+        Returns:
+            asyncio.Future: Resolves to the job's result
+
+        Raises:
+            ExecutorBusyError: If the key's queue is full or the executor is stopped
+        """
+        if not self._queues:
+            raise ExecutorBusyError("executor is not running")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queues[hash(key) % self.workers].put_nowait((job, future))
+        except asyncio.QueueFull:
+            raise ExecutorBusyError(f"queue for key {key} is full") from None
+        return future
+
+    async def _work(self, queue: "asyncio.Queue[Tuple[Job, asyncio.Future]]"):
+        while True:
+            job, future = await queue.get()
+            try:
+                # Skip jobs whose caller has gone away
+                if not future.done():
+                    result = await job()
+                    if not future.done():
+                        future.set_result(result)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                queue.task_done()
+
+
+_executor: Optional[KeyedExecutor] = None
+
+
+async def start_event_executor() -> KeyedExecutor:
+    """
+    Start the process-wide executor on the running loop (app startup)
+    """
+    global _executor
+    if _executor is None:
+        _executor = KeyedExecutor()
+        _executor.start()
+    return _executor
+
+
+async def stop_event_executor():
+    """
+    Stop the executor (app shutdown, before the other background tasks)
+    """
+    global _executor
+    executor, _executor = _executor, None
+    if executor is not None:
+        await executor.stop()
+
+
+def submit_event_job(key: Any, job: Job) -> asyncio.Future:
+    """
+    Queue a job on the process-wide executor (see KeyedExecutor.submit)
+
+    Raises:
+        ExecutorBusyError: If the key's queue is full or the executor is not running
+    """
+    executor = _executor
+    if executor is None:
+        raise ExecutorBusyError("executor is not running")
+    return executor.submit(key, job)
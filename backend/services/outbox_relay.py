@@ -0,0 +1,250 @@
+"""
+Outbox relay: publishes committed outbox rows to Dapr in batches.
+
+The relay runs as a background task on the app's event loop. Each drain
+reads the oldest OUTBOX_BATCH_SIZE rows and bulk-publishes them per topic
+through the shared publisher, deleting what each topic's call delivered
+before moving on to the next topic, so a later topic's failure does not
+send earlier topics' events again. Reading and each delete are short
+transactions; none is open while the sidecar is called. Writers in this process wake it right after they commit; rows
+written by other processes (agent tools, MCP servers) are picked up by
+polling.
+
+Ordering: rows are published in ID (commit) order. When the sidecar
+rejects some entries of a bulk call, the failed row and every later row of
+the same user stay in the outbox and are retried together, so a user's
+events are never skipped; delivery is at least once. A failing user is
+held back with a backoff of their own, and drains skip their rows until
+it runs out, so one user's failing events do not stall everyone else's.
+On Postgres a session advisory lock, held for the duration of a drain,
+lets only one replica drain at a time, which keeps per-user order across
+replicas too.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+from database.connection import get_async_engine
+from database.outbox import delete_events_statement, pending_events_statement
+from services.dapr_publisher import publish_events
+from services.event_service import DAPR_PUBSUB_NAME
+
+logger = logging.getLogger(__name__)
+
+# Rows read (and published) per drain
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+
+# Seconds between polls when nobody wakes the relay
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1"))
+
+# Longest wait between retries while the sidecar keeps failing
+OUTBOX_MAX_BACKOFF = 30.0
+
+# pg advisory lock key held while a replica drains the outbox
+_OUTBOX_LOCK_KEY = 0x6F7574626F78
+
+
+class OutboxRelay:
+    """
+    Drains the outbox to Dapr until stopped.
+    """
+
+    def __init__(self, batch_size: int = OUTBOX_BATCH_SIZE, poll_interval: float = OUTBOX_POLL_INTERVAL):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Users whose events failed to publish: user_id -> (retry at, current backoff)
+        self._held: Dict[int, Tuple[float, float]] = {}
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self._task = self.loop.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Deliver what is already committed before the publisher closes
+        try:
+            await self.drain()
+        except Exception as e:
+            logger.error(f"Outbox drain on shutdown failed: {str(e)}")
+
+    def wake(self):
+        """
+        Ask the relay to drain now (callable from any thread)
+        """
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self):
+        delay = self.poll_interval
+        while True:
+            self._wake.clear()
+            try:
+                published, remaining = await self.drain_once()
+                delay = self.poll_interval
+            except Exception as e:
+                logger.error(f"Outbox relay failed to publish: {str(e)}")
+                # Back off without reacting to wakes while the sidecar is failing
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, OUTBOX_MAX_BACKOFF)
+                continue
+
+            if remaining and published:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain(self) -> int:
+        """
+        Publish everything in the outbox (until a drain makes no progress)
+
+        Returns:
+            int: Number of events published
+        """
+        total = 0
+        while True:
+            published, remaining = await self.drain_once()
+            total += published
+            if not (remaining and published):
+                return total
+
+    async def drain_once(self) -> Tuple[int, bool]:
+        """
+        Publish and delete one batch of outbox rows
+
+        Returns:
+            Tuple of (events published, whether more rows may be waiting)
+        """
+        engine = get_async_engine()
+        async with engine.connect() as conn:
+            postgres = conn.dialect.name == "postgresql"
+            if postgres:
+                locked = (await conn.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": _OUTBOX_LOCK_KEY}
+                )).scalar()
+                await conn.commit()
+                if not locked:
+                    # Another replica is draining
+                    return 0, False
+            try:
+                rows = (await conn.execute(pending_events_statement(self.batch_size, self._held_users()))).all()
+                await conn.commit()
+                if not rows:
+                    return 0, False
+
+                delivered, failed_users = await self._publish(conn, rows)
+            finally:
+                if postgres:
+                    await conn.rollback()
+                    await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _OUTBOX_LOCK_KEY})
+                    await conn.commit()
+
+        self._hold(failed_users, {row.user_id for row in rows} - failed_users)
+        if delivered < len(rows):
+            logger.error(
+                f"Outbox relay: {len(rows) - delivered} of {len(rows)} events kept for retry "
+                f"(users {sorted(failed_users)})"
+            )
+        return delivered, len(rows) == self.batch_size
+
+    def _held_users(self) -> List[int]:
+        """
+        Users whose rows are still held back after a failure
+        """
+        now = time.monotonic()
+        return [user_id for user_id, (retry_at, _) in self._held.items() if retry_at > now]
+
+    def _hold(self, failed_users: Set[int], delivered_users: Set[int]):
+        """
+        Back off failing users (doubling each time) and release those that got through
+        """
+        now = time.monotonic()
+        for user_id in failed_users:
+            _, backoff = self._held.get(user_id, (now, self.poll_interval / 2))
+            backoff = min(backoff * 2, OUTBOX_MAX_BACKOFF)
+            self._held[user_id] = (now + backoff, backoff)
+        for user_id in delivered_users:
+            self._held.pop(user_id, None)
+
+    async def _publish(self, conn, rows) -> Tuple[int, Set[int]]:
+        """
+        Bulk-publish rows per topic, deleting each topic's delivered rows
+        as soon as its call returns
+
+        Returns:
+            Tuple of (rows delivered and deleted, users with a failed row)
+        """
+        by_topic: Dict[str, List] = {}
+        for row in rows:
+            by_topic.setdefault(row.topic, []).append(row)
+
+        # Each failing user's rows are held back from their first failure on
+        first_failure: Dict[int, int] = {}
+
+        def held(row) -> bool:
+            return row.user_id in first_failure and row.id >= first_failure[row.user_id]
+
+        delivered = 0
+        for topic, topic_rows in by_topic.items():
+            sendable = [row for row in topic_rows if not held(row)]
+            if not sendable:
+                continue
+            failed = await publish_events(DAPR_PUBSUB_NAME, topic, [json.loads(row.payload) for row in sendable])
+            for row in (sendable[index] for index in failed):
+                first_failure[row.user_id] = min(row.id, first_failure.get(row.user_id, row.id))
+            published = [row.id for row in sendable if not held(row)]
+            if published:
+                await conn.execute(delete_events_statement(published))
+                await conn.commit()
+                delivered += len(published)
+        return delivered, set(first_failure)
+
+
+_relay: Optional[OutboxRelay] = None
+
+
+async def start_outbox_relay() -> OutboxRelay:
+    """
+    Start the process-wide relay on the running loop (app startup)
+    """
+    global _relay
+    if _relay is None:
+        _relay = OutboxRelay()
+        _relay.start()
+    return _relay
+
+
+async def stop_outbox_relay():
+    """
+    Stop the relay after a final drain (app shutdown, before the publisher closes)
+    """
+    global _relay
+    relay, _relay = _relay, None
+    if relay is not None:
+        await relay.stop()
+
+
+def wake_outbox_relay():
+    """
+    Tell the relay new events were committed; a no-op where no relay runs
+    (agent processes, MCP servers), whose rows the app's relay polls for
+    """
+    relay = _relay
+    if relay is not None:
+        relay.wake()
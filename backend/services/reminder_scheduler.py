@@ -0,0 +1,230 @@
+"""
+In-process reminder scheduler: fires task reminders on time.
+
+The scheduler keeps a min-heap of (remind_at, task_id, lead_minutes)
+timers for the unsent reminder_schedule rows due within the next
+REMINDER_HORIZON_MINUTES, and runs as a background task on the app's event
+loop, sleeping until the earliest timer. When timers fire, the reminders
+are claimed and their task.reminders events queued through
+send_task_reminders, so a reminder goes out at its time rather than at the
+next cron tick.
+
+    startup     the heap is loaded from the unsent-bucket index, overdue
+                reminders included
+    writes      whenever a transaction that rewrote reminder rows
+                (sync_reminder_schedule) commits, the task's timers are
+                replaced with the new ones
+    refill      every half horizon the next horizon is reloaded, picking up
+                rows written by other processes (MCP servers) and rows
+                that were beyond the horizon when written; a task whose
+                timers were replaced while the reload was reading keeps
+                the replaced timers, not the older snapshot
+
+A cancelled or rescheduled timer is dropped lazily: the heap entry stays
+until it surfaces and is skipped when it no longer matches the task's
+current timers. Every replica holds timers for every task; the claim's
+sent = false guard (and SKIP LOCKED on Postgres) makes sure only
+one of them queues the reminder. The /reminder-cron binding remains as a
+rare safety sweep.
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database.connection import get_async_engine
+from database.reminder_schedule import SCHEDULED_TIMERS_KEY
+from services.reminder_service import REMINDER_PAGE_SIZE, send_task_reminders, upcoming_reminders
+
+logger = logging.getLogger(__name__)
+
+# Minutes of upcoming reminders held in memory; reloaded every half horizon
+REMINDER_HORIZON_MINUTES = float(os.getenv("REMINDER_HORIZON_MINUTES", "30"))
+
+
+def _utc_naive(value: datetime) -> datetime:
+    """
+    Reminder times are compared as naive UTC, like the database stores them
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# task_id -> {lead_minutes: remind_at}
+Timers = Dict[int, Dict[int, datetime]]
+
+
+class ReminderScheduler:
+    """
+    Holds reminder timers for the next horizon and fires them until stopped.
+    """
+
+    def __init__(self, horizon_minutes: float = REMINDER_HORIZON_MINUTES, batch_size: int = REMINDER_PAGE_SIZE):
+        self.horizon = timedelta(minutes=horizon_minutes)
+        self.batch_size = batch_size
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._heap: List[Tuple[datetime, int, int]] = []
+        self._timers: Timers = {}
+        # Timers due on or after this are left for a refill
+        self._until = datetime.min
+        # Horizon of the refill in flight, if any
+        self._loading_until = datetime.min
+        # Bumped by every replace; task_id -> generation of its last replace
+        self._generation = 0
+        self._replaced: Dict[int, int] = {}
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self._task = self.loop.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def replace(self, timers: Dict[int, List[Tuple[int, datetime]]]):
+        """
+        Replace the timers of the given tasks; an empty list cancels them
+        (callable from any thread)
+        """
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._replace, timers)
+
+    def _replace(self, timers: Dict[int, List[Tuple[int, datetime]]]):
+        self._generation += 1
+        until = max(self._until, self._loading_until)
+        for task_id, entries in timers.items():
+            self._replaced[task_id] = self._generation
+            self._timers.pop(task_id, None)
+            for lead, remind_at in entries:
+                remind_at = _utc_naive(remind_at)
+                if remind_at >= until:
+                    # Beyond the horizon: a later refill loads it
+                    continue
+                self._timers.setdefault(task_id, {})[lead] = remind_at
+                heapq.heappush(self._heap, (remind_at, task_id, lead))
+                self._changed.set()
+
+    async def _refill(self):
+        until = datetime.utcnow() + self.horizon
+        started = self._generation
+        self._loading_until = until
+        try:
+            async with AsyncSession(get_async_engine(), expire_on_commit=False) as db:
+                rows = await upcoming_reminders(db, until)
+        finally:
+            self._loading_until = datetime.min
+        self._until = until
+        for task_id, lead, remind_at in rows:
+            if self._replaced.get(task_id, 0) > started:
+                # Replaced while the snapshot was read; the replace is newer
+                continue
+            self._timers.setdefault(task_id, {})[lead] = remind_at
+        self._replaced.clear()
+        # Rebuild rather than push, which also sheds cancelled entries
+        self._heap = [
+            (remind_at, task_id, lead)
+            for task_id, leads in self._timers.items() for lead, remind_at in leads.items()
+        ]
+        heapq.heapify(self._heap)
+        logger.debug(f"Reminder scheduler holds {len(self._heap)} timers until {until.isoformat()}")
+
+    def _pop_due(self, now: datetime) -> List[Tuple[int, int]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            remind_at, task_id, lead = heapq.heappop(self._heap)
+            leads = self._timers.get(task_id)
+            if leads is not None and leads.get(lead) == remind_at:
+                del leads[lead]
+                if not leads:
+                    del self._timers[task_id]
+                due.append((task_id, lead))
+        return due
+
+    async def _fire(self, reminders: List[Tuple[int, int]]):
+        for start in range(0, len(reminders), self.batch_size):
+            async with AsyncSession(get_async_engine(), expire_on_commit=False) as db:
+                await send_task_reminders(db, reminders[start:start + self.batch_size])
+
+    async def _run(self):
+        refill_interval = self.horizon.total_seconds() / 2
+        next_refill = self.loop.time()
+        while True:
+            if self.loop.time() >= next_refill:
+                try:
+                    await self._refill()
+                except Exception as e:
+                    logger.error(f"Reminder scheduler failed to load reminders: {str(e)}")
+                next_refill = self.loop.time() + refill_interval
+
+            reminders = self._pop_due(datetime.utcnow())
+            if reminders:
+                try:
+                    await self._fire(reminders)
+                except Exception as e:
+                    # The cron sweep picks these up
+                    logger.error(f"Reminder scheduler failed to send {len(reminders)} reminders: {str(e)}")
+                continue
+
+            self._changed.clear()
+            delay = next_refill - self.loop.time()
+            if self._heap:
+                delay = min(delay, (self._heap[0][0] - datetime.utcnow()).total_seconds())
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=max(delay, 0))
+            except asyncio.TimeoutError:
+                pass
+
+
+_scheduler: Optional[ReminderScheduler] = None
+
+
+async def start_reminder_scheduler() -> ReminderScheduler:
+    """
+    Start the process-wide scheduler on the running loop (app startup)
+    """
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ReminderScheduler()
+        _scheduler.start()
+    return _scheduler
+
+
+async def stop_reminder_scheduler():
+    """
+    Stop the scheduler (app shutdown, before the outbox relay)
+    """
+    global _scheduler
+    scheduler, _scheduler = _scheduler, None
+    if scheduler is not None:
+        await scheduler.stop()
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_committed_reminders(session: Session):
+    """
+    Hand the reminder rows a transaction wrote to the scheduler once they are committed
+    """
+    timers = session.info.pop(SCHEDULED_TIMERS_KEY, None)
+    scheduler = _scheduler
+    if timers and scheduler is not None:
+        scheduler.replace(timers)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_reminders(session: Session):
+    session.info.pop(SCHEDULED_TIMERS_KEY, None)
@@ -0,0 +1,278 @@
+"""
+Task reminders: the /reminder-cron safety sweep and the claims behind the
+in-process reminder scheduler (services/reminder_scheduler.py).
+
+Reminders come from reminder_schedule (see database/reminder_schedule.py):
+one row per task and lead time, read through the partial index on unsent
+rows by minute bucket. The sweep pages through the buckets up to the
+current minute in (bucket, task_id, lead_minutes) order, and each page is
+its own transaction:
+
+    1. read the page
+    2. bump the task version of each user with a due-time reminder on the
+       page, in user_id order
+    3. re-read the page's rows that are still due, leasing them (Postgres:
+       SELECT ... FOR UPDATE SKIP LOCKED)
+    4. one UPDATE ... SET sent = true WHERE (task_id, lead_minutes) IN (...)
+       AND sent = false RETURNING claims the reminders; due-time ones also
+       set tasks.reminder_sent
+    5. queue one task.reminders event per user in the outbox and commit
+
+Task writes lock the user's row (the version bump) before they rewrite the
+task's reminder rows, so the sweep takes its locks in the same order: the
+users first, then the reminder rows. A sweep and an edit of the same task
+then queue up on the user's row instead of deadlocking.
+
+Progress is committed page by page, so a run cut short by a timeout is
+picked up by the next tick, and the outbox relay bulk-publishes each page.
+
+Every replica receives the cron binding. On Postgres, SKIP LOCKED keeps
+concurrent runs off rows another run has leased; runs that reach the same
+users queue on their rows, and the later one finds the reminders sent. On
+other databases the write lock serializes the claims. Either way the
+sent = false guard on the claim means no reminder is queued twice. Within
+a process, a tick that arrives while the previous run is still going is
+skipped.
+
+The scheduler fires most reminders at their time through
+send_task_reminders, which claims the given rows the same way; the cron
+sweep only catches what no scheduler held a timer for.
+"""
+
+import asyncio
+import logging
+import math
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlmodel import case, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database.reminder_schedule import reminder_bucket
+from database.task_version import bump_task_version_async
+from models.todo_models import ReminderSchedule, Task, TaskStatus
+from services.event_service import enqueue_reminder_events_async
+from services.outbox_relay import wake_outbox_relay
+
+logger = logging.getLogger(__name__)
+
+# Reminders leased, marked and committed together
+REMINDER_PAGE_SIZE = int(os.getenv("REMINDER_PAGE_SIZE", "500"))
+
+# Held for the duration of a run in this process
+_run_lock = asyncio.Lock()
+
+_SCHEDULE_ORDER = (ReminderSchedule.bucket, ReminderSchedule.task_id, ReminderSchedule.lead_minutes)
+_SCHEDULE_KEY = tuple_(ReminderSchedule.task_id, ReminderSchedule.lead_minutes)
+
+
+def _due_reminders_query(now: datetime, lease: bool = False):
+    """
+    Unsent reminders of pending tasks that are due by `now`:
+    (task_id, lead_minutes, user_id, bucket), optionally leased
+    """
+    query = (
+        select(ReminderSchedule.task_id, ReminderSchedule.lead_minutes, ReminderSchedule.user_id, ReminderSchedule.bucket)
+        .join(Task, Task.id == ReminderSchedule.task_id)
+        .where(
+            ReminderSchedule.sent == False,
+            ReminderSchedule.bucket <= reminder_bucket(now),
+            ReminderSchedule.remind_at <= now,
+            Task.status == TaskStatus.pending
+        )
+    )
+    if lease:
+        # Rows another replica holds are skipped, not waited for
+        query = query.with_for_update(skip_locked=True, of=ReminderSchedule)
+    return query
+
+
+def _due_page_query(now: datetime, after: Optional[Tuple[datetime, int, int]], limit: int):
+    """
+    Next page of due reminders in (bucket, task_id, lead_minutes) order
+    """
+    query = _due_reminders_query(now)
+    if after is not None:
+        query = query.where(tuple_(*_SCHEDULE_ORDER) > tuple_(*after))
+    return query.order_by(*_SCHEDULE_ORDER).limit(limit)
+
+
+async def _lease_reminders(db: AsyncSession, now: datetime, rows) -> Tuple[Dict[int, int], list]:
+    """
+    Bump the task versions of the users with a due-time reminder among
+    `rows`, then lease those of the rows that are still due, in the caller's
+    transaction.
+
+    The bumps lock the users' rows before any reminder row is locked, the
+    order every task write takes them in. reminder_sent is part of the task
+    listings, so those users' versions have to move on anyway.
+
+    Returns:
+        (user_id -> bumped version, leased rows)
+    """
+    versions = {}
+    for user_id in sorted({row.user_id for row in rows if row.lead_minutes == 0}):
+        versions[user_id] = await bump_task_version_async(db, user_id)
+
+    # Re-read under lock (FOR UPDATE is Postgres-only): a write that held a
+    # user's row may have rescheduled, completed or deleted the task meanwhile
+    rows = (await db.exec(
+        _due_reminders_query(now, lease=True)
+        .where(_SCHEDULE_KEY.in_([(row.task_id, row.lead_minutes) for row in rows]))
+        .order_by(*_SCHEDULE_ORDER)
+    )).all()
+    return versions, rows
+
+
+async def _claim_reminders(db: AsyncSession, now: datetime, rows, versions: Dict[int, int]) -> int:
+    """
+    Mark leased reminder rows as sent and queue one task.reminders event per
+    user for them, in the caller's transaction
+
+    Args:
+        versions: Bumped task versions of the users with a due-time reminder (_lease_reminders)
+
+    Returns:
+        int: Number of reminders queued
+    """
+    if not rows:
+        return 0
+
+    claimed = (await db.exec(
+        update(ReminderSchedule)
+        .where(_SCHEDULE_KEY.in_([(row.task_id, row.lead_minutes) for row in rows]), ReminderSchedule.sent == False)
+        .values(sent=True)
+        .returning(ReminderSchedule.task_id, ReminderSchedule.lead_minutes)
+        .execution_options(synchronize_session=False)
+    )).all()
+    if not claimed:
+        return 0
+
+    due_now = [task_id for task_id, lead in claimed if lead == 0]
+    if due_now:
+        await db.exec(
+            update(Task)
+            .where(Task.id.in_(due_now), Task.reminder_sent == False)
+            .values(reminder_sent=True, updated_at=datetime.utcnow(), change_version=case(versions, value=Task.user_id))
+            .execution_options(synchronize_session=False)
+        )
+
+    tasks = {
+        task.id: task
+        for task in (await db.exec(select(Task).where(Task.id.in_({task_id for task_id, _ in claimed})))).all()
+    }
+    reminders = []
+    for task_id, lead in sorted(claimed, key=lambda key: (tasks[key[0]].due_date - timedelta(minutes=key[1]), key)):
+        task = tasks[task_id]
+        if lead == 0:
+            minutes_overdue = int((now - task.due_date).total_seconds() / 60)
+            logger.info(f"🔔 Sending Reminder for Task ID {task.id}: '{task.title}' (overdue by {minutes_overdue} minutes)")
+            reminders.append((task, -minutes_overdue, lead))  # Negative indicates overdue
+        else:
+            minutes_until_due = max(math.ceil((task.due_date - now).total_seconds() / 60), 0)
+            logger.info(f"🔔 Sending Reminder for Task ID {task.id}: '{task.title}' (due in {minutes_until_due} minutes)")
+            reminders.append((task, minutes_until_due, lead))
+    await enqueue_reminder_events_async(db, reminders)
+    return len(claimed)
+
+
+async def _remind_page(
+    db: AsyncSession,
+    now: datetime,
+    after: Optional[Tuple[datetime, int, int]],
+    page_size: int
+) -> Optional[Tuple[int, int, Tuple[datetime, int, int]]]:
+    """
+    Lease, mark and queue one page in one transaction
+
+    Returns:
+        (reminders leased, reminders queued, keyset position of the page's last row),
+        or None when no due reminder is left
+    """
+    page = (await db.exec(_due_page_query(now, after, page_size))).all()
+    if not page:
+        await db.rollback()
+        return None
+
+    versions, rows = await _lease_reminders(db, now, page)
+    claimed = await _claim_reminders(db, now, rows, versions)
+    await db.commit()
+    if claimed:
+        # Publish this page while the next one is being claimed
+        wake_outbox_relay()
+    last = page[-1]
+    return len(rows), claimed, (last.bucket, last.task_id, last.lead_minutes)
+
+
+async def send_task_reminders(db: AsyncSession, reminders: List[Tuple[int, int]]) -> int:
+    """
+    Queue specific reminders that have come due (the in-process reminder
+    scheduler's timers), in one transaction.
+
+    Reminders that were sent already, are not due yet, belong to a task that
+    is no longer pending or are leased by another replica are left alone.
+
+    Args:
+        db: Async database session (committed)
+        reminders: (task_id, lead_minutes) of the timers that fired
+
+    Returns:
+        int: Number of reminders queued
+    """
+    now = datetime.utcnow()
+    query = _due_reminders_query(now).where(_SCHEDULE_KEY.in_(reminders)).order_by(*_SCHEDULE_ORDER)
+    rows = (await db.exec(query)).all()
+    if not rows:
+        await db.rollback()
+        return 0
+
+    versions, rows = await _lease_reminders(db, now, rows)
+    claimed = await _claim_reminders(db, now, rows, versions)
+    await db.commit()
+    if claimed:
+        wake_outbox_relay()
+    return claimed
+
+
+async def upcoming_reminders(db: AsyncSession, until: datetime) -> List[Tuple[int, int, datetime]]:
+    """
+    (task_id, lead_minutes, remind_at) of every unsent reminder due before
+    `until`, overdue ones included
+    """
+    query = select(ReminderSchedule.task_id, ReminderSchedule.lead_minutes, ReminderSchedule.remind_at).where(
+        ReminderSchedule.sent == False,
+        ReminderSchedule.bucket <= reminder_bucket(until),
+        ReminderSchedule.remind_at < until
+    )
+    rows = (await db.exec(query)).all()
+    await db.rollback()
+    return [(row.task_id, row.lead_minutes, row.remind_at) for row in rows]
+
+
+async def send_due_reminders(db: AsyncSession, page_size: int = REMINDER_PAGE_SIZE) -> Optional[Tuple[int, int]]:
+    """
+    Queue every due reminder, one committed page at a time.
+
+    Args:
+        db: Async database session (committed after each page)
+        page_size: Reminders per page
+
+    Returns:
+        (reminders found, reminders queued), or None if a run is already in progress here
+    """
+    if _run_lock.locked():
+        return None
+
+    async with _run_lock:
+        now = datetime.utcnow()
+        found = sent = 0
+        after = None
+        while True:
+            page = await _remind_page(db, now, after, page_size)
+            if page is None:
+                return found, sent
+            leased, claimed, after = page
+            found += leased
+            sent += claimed
@@ -1,8 +1,9 @@
 from sqlmodel import Session, select
 from typing import List, Optional
 from backend.models.todo_models import Task, TaskStatus, TaskPriority, TaskRecurrence
+from backend.database.reminder_schedule import sync_reminder_schedule
+from backend.database.task_version import bump_task_version, record_task_deletions
 from datetime import datetime
-import json
 
 def create_task(
     session: Session,
@@ -24,10 +25,14 @@ def create_task(
         status=TaskStatus.pending,
         priority=priority,
         due_date=due_date,
-        tags=json.dumps(tags) if tags else "[]",
         recurrence=recurrence
     )
+    task.set_tags(tags)
     session.add(task)
+    task.change_version = bump_task_version(session, task.user_id)
+    if due_date is not None:
+        session.flush()  # assign task.id
+        sync_reminder_schedule(session, task.user_id, [task.id])
     session.commit()
     session.refresh(task)
     return task
@@ -74,12 +79,16 @@ def update_task(
     if due_date is not None:
         task.due_date = due_date
     if tags is not None:
-        task.tags = json.dumps(tags)
+        task.set_tags(tags)
     if recurrence is not None:
         task.recurrence = recurrence
 
     task.updated_at = datetime.utcnow()
+    task.version += 1
     session.add(task)
+    task.change_version = bump_task_version(session, task.user_id)
+    if status is not None or due_date is not None:
+        sync_reminder_schedule(session, task.user_id, [task.id])
     session.commit()
     session.refresh(task)
     return task
@@ -94,7 +103,10 @@ def complete_task(session: Session, task_id: int) -> Optional[Task]:
 
     task.status = TaskStatus.completed
     task.updated_at = datetime.utcnow()
+    task.version += 1
     session.add(task)
+    task.change_version = bump_task_version(session, task.user_id)
+    sync_reminder_schedule(session, task.user_id, [task.id])
     session.commit()
     session.refresh(task)
     return task
@@ -108,5 +120,7 @@ def delete_task(session: Session, task_id: int) -> bool:
         return False
 
     session.delete(task)
+    record_task_deletions(session, task.user_id, [task.id], bump_task_version(session, task.user_id))
+    sync_reminder_schedule(session, task.user_id, [task.id])
     session.commit()
     return True
\ No newline at end of file
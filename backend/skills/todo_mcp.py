@@ -8,14 +8,15 @@ Spec Reference: specs/skills/todo_management.md
 """
 
 import asyncio
-from contextlib import contextmanager
 from typing import Optional, List, Any
 from datetime import datetime
 
 from mcp import Server
 from sqlmodel import Session, select
 
-from backend.database.connection import engine
+from backend.database.deps import get_db_session
+from backend.database.reminder_schedule import sync_reminder_schedule
+from backend.database.task_version import bump_task_version, record_task_deletions
 from backend.models.todo_models import Task, TaskStatus
 
 
@@ -23,21 +24,6 @@ from backend.models.todo_models import Task, TaskStatus
 mcp_server = Server("todo-skill-mcp-server")
 
 
-@contextmanager
-def get_db_session():
-    """
-    Context manager for database sessions.
-
-    Yields:
-        Session: SQLModel database session
-    """
-    with Session(engine) as session:
-        try:
-            yield session
-        finally:
-            session.close()
-
-
 def _get_task_for_user(session: Session, task_id: int, user_id: str) -> Optional[Task]:
     """
     Retrieve a task by ID ensuring it belongs to the specified user.
@@ -95,6 +81,7 @@ async def add_task(user_id: str, title: str, description: str = "") -> dict:
                 status=TaskStatus.pending
             )
             session.add(task)
+            task.change_version = bump_task_version(session, task.user_id)
             session.commit()
             session.refresh(task)
 
@@ -203,7 +190,9 @@ async def update_task(
                 task.description = description
 
             task.updated_at = datetime.utcnow()
+            task.version += 1
             session.add(task)
+            task.change_version = bump_task_version(session, task.user_id)
             session.commit()
             session.refresh(task)
 
@@ -245,7 +234,10 @@ async def complete_task(user_id: str, task_id: int) -> dict:
         try:
             task.status = TaskStatus.completed
             task.updated_at = datetime.utcnow()
+            task.version += 1
             session.add(task)
+            task.change_version = bump_task_version(session, task.user_id)
+            sync_reminder_schedule(session, task.user_id, [task.id])
             session.commit()
 
             return {
@@ -283,6 +275,8 @@ async def delete_task(user_id: str, task_id: int) -> dict:
 
         try:
             session.delete(task)
+            record_task_deletions(session, task.user_id, [task.id], bump_task_version(session, task.user_id))
+            sync_reminder_schedule(session, task.user_id, [task.id])
             session.commit()
 
             return {
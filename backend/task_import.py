@@ -0,0 +1,243 @@
+"""
+High-volume task import from NDJSON.
+
+POST /api/tasks/import streams one TaskCreate object per line. Lines are
+validated and inserted a chunk at a time, so memory stays bounded by the
+chunk size rather than the upload:
+
+    Postgres  IDs are reserved from the tasks sequence in one query, then
+              tasks and task_tags rows go in through COPY, with the COPY
+              API of the driver in use (asyncpg, psycopg2 or psycopg)
+    others    one executemany INSERT ... RETURNING id for the tasks and one
+              executemany INSERT for their tags
+
+Each chunk commits on its own with one task version bump, together with
+the reminders of its tasks that have due dates, so an upload cut off part
+way keeps the chunks already imported. Lines that fail validation
+are skipped and reported. Imported tasks do not publish per-task events;
+the route queues a single tasks.imported summary instead.
+"""
+
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import insert, text
+from sqlalchemy.util import await_only
+from sqlmodel import Session
+
+from database.reminder_schedule import sync_reminder_schedule
+from database.task_version import bump_task_version
+from models.todo_models import Task, TaskCreate, TaskImportError, TaskImportResult, TaskTag
+
+# Lines validated and inserted (and committed) together
+IMPORT_CHUNK_SIZE = 1000
+
+# Skipped lines reported back in the response; the rest are only counted
+MAX_IMPORT_ERRORS = 100
+
+# Longest accepted NDJSON line
+MAX_IMPORT_LINE_BYTES = 64 * 1024
+
+_TASK_COPY_COLUMNS = (
+    "id", "title", "description", "status", "priority", "due_date", "recurrence",
+    "reminder_sent", "version", "change_version", "user_id", "created_at", "updated_at",
+)
+
+# Postgres drivers _copy_rows can COPY through
+_COPY_DRIVERS = ("asyncpg", "psycopg2", "psycopg")
+
+
+class InvalidImportError(ValueError):
+    """Raised when an import upload cannot be split into NDJSON lines."""
+
+
+async def iter_ndjson_chunks(stream: AsyncIterator[bytes], chunk_size: int = IMPORT_CHUNK_SIZE) -> AsyncIterator[List[bytes]]:
+    """
+    Split a streamed request body into chunks of NDJSON lines
+
+    Raises:
+        InvalidImportError: If a line is longer than MAX_IMPORT_LINE_BYTES
+    """
+    pending = b""
+    lines: List[bytes] = []
+    async for data in stream:
+        pending += data
+        *complete, pending = pending.split(b"\n")
+        lines.extend(complete)
+        while len(lines) >= chunk_size:
+            yield lines[:chunk_size]
+            lines = lines[chunk_size:]
+        # Full chunks already received are imported before an oversized line fails the upload
+        if len(pending) > MAX_IMPORT_LINE_BYTES:
+            raise InvalidImportError(f"Import lines are limited to {MAX_IMPORT_LINE_BYTES} bytes")
+    if pending:
+        lines.append(pending)
+    if lines:
+        yield lines
+
+
+def _copy_value(value: Any) -> str:
+    """
+    Encode a value for COPY ... FROM STDIN in text format
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_rows(db: Session, table: str, columns: Tuple[str, ...], rows: List[Tuple]) -> None:
+    """
+    COPY rows into a table in the session's transaction, through the raw
+    connection of whichever driver in _COPY_DRIVERS the session runs on
+    """
+    driver = db.get_bind().dialect.driver
+    dbapi_connection = db.connection().connection
+    if driver == "asyncpg":
+        # Binary COPY of the Python values, awaited from run_sync's greenlet
+        await_only(dbapi_connection.driver_connection.copy_records_to_table(
+            table, records=rows, columns=list(columns)
+        ))
+        return
+
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    data = "".join("\t".join(_copy_value(value) for value in row) + "\n" for row in rows)
+    cursor = dbapi_connection.cursor()
+    try:
+        if driver == "psycopg2":
+            cursor.copy_expert(statement, io.StringIO(data))
+        else:
+            with cursor.copy(statement) as copy:
+                copy.write(data)
+    finally:
+        cursor.close()
+
+
+class TaskImporter:
+    """
+    Imports chunks of NDJSON lines as new tasks for one user.
+
+    Call add() for each chunk in upload order, then result() for the totals.
+    add() takes the session first, so async callers can run it through
+    AsyncSession.run_sync.
+    """
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[TaskImportError] = []
+        self._line = 0
+
+    def _reject(self, line: int, error: str):
+        self.failed += 1
+        if len(self.errors) < MAX_IMPORT_ERRORS:
+            self.errors.append(TaskImportError(line=line, error=error))
+
+    def add(self, db: Session, lines: List[bytes]) -> int:
+        """
+        Validate a chunk of lines and insert the valid ones in one transaction
+
+        Returns:
+            int: Number of tasks inserted from the chunk
+        """
+        valid: List[TaskCreate] = []
+        for line in lines:
+            self._line += 1
+            if not line.strip():
+                continue
+            try:
+                valid.append(TaskCreate.model_validate(orjson.loads(line)))
+            except orjson.JSONDecodeError as e:
+                self._reject(self._line, f"Invalid JSON: {e}")
+            except ValidationError as e:
+                self._reject(self._line, str(e))
+        if not valid:
+            return 0
+
+        change_version = bump_task_version(db, self.user_id)
+        now = datetime.utcnow()
+        rows = [
+            {
+                "title": task.title,
+                "description": task.description,
+                "status": task.status,
+                "priority": task.priority,
+                "due_date": task.due_date,
+                "recurrence": task.recurrence,
+                "reminder_sent": False,
+                "version": 1,
+                "change_version": change_version,
+                "user_id": self.user_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for task in valid
+        ]
+        tags = [list(dict.fromkeys(task.tags or [])) for task in valid]
+
+        dialect = db.get_bind().dialect
+        if dialect.name == "postgresql" and dialect.driver in _COPY_DRIVERS:
+            task_ids = self._copy_chunk(db, rows, tags)
+        else:
+            task_ids = self._insert_chunk(db, rows, tags)
+        sync_reminder_schedule(db, self.user_id, [
+            task_id for task_id, task in zip(task_ids, valid) if task.due_date is not None
+        ])
+        db.commit()
+
+        self.imported += len(rows)
+        return len(rows)
+
+    def _insert_chunk(self, db: Session, rows: List[Dict[str, Any]], tags: List[List[str]]) -> List[int]:
+        task_ids = db.exec(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True), params=rows
+        ).scalars().all()
+        tag_rows = [
+            {"task_id": task_id, "tag": tag, "user_id": self.user_id}
+            for task_id, task_tags in zip(task_ids, tags) for tag in task_tags
+        ]
+        if tag_rows:
+            db.exec(insert(TaskTag), params=tag_rows)
+        return task_ids
+
+    def _copy_chunk(self, db: Session, rows: List[Dict[str, Any]], tags: List[List[str]]) -> List[int]:
+        task_ids = db.connection().execute(
+            text("SELECT nextval(pg_get_serial_sequence('tasks', 'id')) FROM generate_series(1, :count)"),
+            {"count": len(rows)}
+        ).scalars().all()
+        # Enum columns store member names
+        _copy_rows(db, "tasks", _TASK_COPY_COLUMNS, [
+            (
+                task_id, row["title"], row["description"], row["status"].name, row["priority"].name,
+                row["due_date"], row["recurrence"].name if row["recurrence"] else None,
+                row["reminder_sent"], row["version"], row["change_version"], row["user_id"],
+                row["created_at"], row["updated_at"],
+            )
+            for task_id, row in zip(task_ids, rows)
+        ])
+        tag_rows = [
+            (task_id, tag, self.user_id)
+            for task_id, task_tags in zip(task_ids, tags) for tag in task_tags
+        ]
+        if tag_rows:
+            _copy_rows(db, "task_tags", ("task_id", "tag", "user_id"), tag_rows)
+        return task_ids
+
+    def result(self) -> TaskImportResult:
+        """
+        Totals for everything added so far
+        """
+        return TaskImportResult(imported=self.imported, failed=self.failed, errors=self.errors)
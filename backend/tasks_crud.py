@@ -1,39 +1,578 @@
-from sqlmodel import Session, select
-from typing import List, Optional
-from models.todo_models import Task, TaskCreate, TaskUpdate, TaskRead, TaskStatus, TaskPriority, TaskRecurrence, Message, MessageRole
+from sqlmodel import Session, select, and_, or_, case, func, cast, Float, delete, insert, update
+from sqlalchemy import column, literal_column, table, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from pydantic import ValidationError
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from models.todo_models import (
+    Task, TaskTag, TaskTombstone, TaskChanges, TagCount, TaskCreate, TaskUpdate, TaskRead, TaskPage, TaskFilters, TaskSort, TaskStatus, TaskPriority, TaskRecurrence,
+    BulkOperationType, TaskBulkOperation, TaskBulkResult, TaskBulkResponse, Message, MessageRole,
+)
+from database.reminder_schedule import sync_reminder_schedule
+from database.task_version import SYNC_CURSOR_MAX_AGE, bump_task_version, get_task_version, record_task_deletions
+from services.event_service import enqueue_task_event, enqueue_task_events
+from pagination import DEFAULT_PAGE_SIZE, ExpiredCursorError, InvalidCursorError, decode_cursor, encode_cursor
 from datetime import datetime
-import json
+import logging
+import re
+import time
 
-def get_user_tasks(db: Session, user_id: int, status_filter: str = "all") -> List[TaskRead]:
+logger = logging.getLogger(__name__)
+
+# Upper bound on operations in one POST /api/tasks/bulk request
+MAX_BULK_OPERATIONS = 500
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when ?fields= names something that is not a task field."""
+
+
+class VersionConflictError(Exception):
+    """Raised when a guarded write targets a task whose version has moved on."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Task was modified (current version {current_version})")
+        self.current_version = current_version
+
+
+# TaskRead fields read straight from tasks columns (tags come from task_tags)
+_TASK_READ_COLUMNS = (
+    Task.id, Task.title, Task.description, Task.status, Task.priority, Task.due_date, Task.recurrence,
+    Task.reminder_sent, Task.version, Task.user_id, Task.created_at, Task.updated_at,
+)
+_TASK_READ_NAMES = tuple(column.key for column in _TASK_READ_COLUMNS)
+
+# Fields a client can select with ?fields=
+TASK_FIELDS = _TASK_READ_NAMES[:6] + ("tags",) + _TASK_READ_NAMES[6:]
+
+# Above this many tasks, fetch all of the user's tags at once instead of an IN list
+_TAG_IN_LIST_LIMIT = 500
+
+# Rows per server-side cursor batch when streaming an export; small enough
+# that each batch's tag lookup stays an IN list
+EXPORT_BATCH_SIZE = _TAG_IN_LIST_LIMIT
+
+
+def parse_task_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
     """
-    Get all tasks for a user, optionally filtered by status
+    Parse a comma-separated ?fields= list into task field names (in TaskRead
+    order); None means every field
+
+    Raises:
+        InvalidFieldsError: If a name is not a task field, or none is given
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(TASK_FIELDS)
+    if unknown:
+        raise InvalidFieldsError(f"Unknown task fields: {', '.join(sorted(unknown))}")
+    if not requested:
+        raise InvalidFieldsError("fields must name at least one task field")
+    return tuple(name for name in TASK_FIELDS if name in requested)
+
+
+def _to_task_read(task: Task) -> TaskRead:
+    """
+    Build the API representation of a task row.
+
+    Values come from the database, so the model is constructed without
+    re-validating them.
+    """
+    return TaskRead.model_construct(
+        id=task.id,
+        title=task.title,
+        description=task.description,
+        status=task.status,
+        priority=task.priority,
+        due_date=task.due_date,
+        tags=task.tag_names,
+        recurrence=task.recurrence,
+        reminder_sent=task.reminder_sent,
+        version=task.version,
+        user_id=task.user_id,
+        created_at=task.created_at,
+        updated_at=task.updated_at
+    )
+
+
+def _tags_by_task(db: Session, user_id: int, task_ids: List[int]) -> Dict[int, List[str]]:
+    """
+    Tag names per task ID, sorted, in one query
+    """
+    tags: Dict[int, List[str]] = {}
+    if not task_ids:
+        return tags
+
+    query = select(TaskTag.task_id, TaskTag.tag).where(TaskTag.user_id == user_id)
+    if len(task_ids) <= _TAG_IN_LIST_LIMIT:
+        query = query.where(TaskTag.task_id.in_(task_ids))
+    for task_id, tag in db.connection().execute(query.order_by(TaskTag.task_id, TaskTag.tag)):
+        tags.setdefault(task_id, []).append(tag)
+    return tags
+
+
+def _task_columns(fields: Optional[Tuple[str, ...]]) -> Tuple[Tuple, bool]:
+    """
+    Task columns to select for a sparse fieldset, and whether tags are needed
+    """
+    if fields is None:
+        return _TASK_READ_COLUMNS, True
+    return tuple(column for column in _TASK_READ_COLUMNS if column.key in fields), "tags" in fields
+
+
+def _task_items(db: Session, user_id: int, rows, columns: Tuple, with_tags: bool, sparse: bool) -> List[Tuple]:
+    """
+    Turn (task id, *columns, *extras) rows into (task id, TaskRead or dict, *extras)
+    tuples, loading tags for all of them with one query
+    """
+    names = tuple(column.key for column in columns)
+    tags = _tags_by_task(db, user_id, [row[0] for row in rows]) if with_tags else {}
+
+    end = len(columns) + 1
+    if not sparse:
+        construct = TaskRead.model_construct
+        return [
+            (row[0], construct(**dict(zip(names, row[1:end])), tags=tags.get(row[0], [])), *row[end:])
+            for row in rows
+        ]
+
+    results = []
+    for row in rows:
+        item = dict(zip(names, row[1:end]))
+        if with_tags:
+            item["tags"] = tags.get(row[0], [])
+        results.append((row[0], item, *row[end:]))
+    return results
+
+
+def _read_tasks(db: Session, user_id: int, query, *extra_columns, fields: Optional[Tuple[str, ...]] = None) -> List[Tuple]:
+    """
+    Run a task query for its TaskRead columns only.
+
+    Skips the ORM entirely: rows come back as plain tuples from the
+    session's connection and are turned into TaskRead models without
+    validation. Tags are loaded with one extra query for the whole result.
+
+    With fields (see parse_task_fields), only those columns are selected,
+    tags are only loaded if asked for, and each task is a plain dict of just
+    those fields.
+
+    Returns:
+        One (task id, TaskRead or dict, *extra column values) tuple per row, in query order
+    """
+    columns, with_tags = _task_columns(fields)
+    rows = db.connection().execute(query.with_only_columns(Task.id, *columns, *extra_columns)).all()
+    return _task_items(db, user_id, rows, columns, with_tags, sparse=fields is not None)
+
+
+def iter_user_task_batches(
+    db: Session,
+    user_id: int,
+    after: Optional[int] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[List[Any]]:
+    """
+    Stream all of a user's tasks in ID order, one batch at a time.
+
+    The tasks are read through a single server-side cursor (yield_per), so
+    only one batch is held in memory however many tasks the user has; tags
+    are loaded per batch.
+
+    Args:
+        db: Database session, kept open while the batches are consumed
+        user_id: Owner of the tasks
+        after: Resume after this task ID (the last one the client received)
+        fields: Sparse fieldset, as for _read_tasks
+        batch_size: Rows fetched from the cursor per batch
+
+    Yields:
+        List[Any]: TaskRead models (or dicts, with fields) for the next batch
     """
+    columns, with_tags = _task_columns(fields)
+    query = select(Task.id, *columns).where(Task.user_id == user_id).order_by(Task.id)
+    if after is not None:
+        query = query.where(Task.id > after)
+
+    result = db.connection().execution_options(yield_per=batch_size).execute(query)
+    try:
+        for rows in result.partitions():
+            yield [item for _, item in _task_items(db, user_id, rows, columns, with_tags, sparse=fields is not None)]
+    finally:
+        result.close()
+
+
+def _wake_relay():
+    """
+    Publish just-committed outbox events now instead of at the relay's next poll
+    """
+    from services.outbox_relay import wake_outbox_relay
+    wake_outbox_relay()
+
+
+def _user_tasks_query(user_id: int, filters: Optional[TaskFilters] = None):
+    """
+    Base query for a user's tasks with the listing filters applied in SQL
+    """
+    filters = filters or TaskFilters()
     query = select(Task).where(Task.user_id == user_id)
 
-    if status_filter != "all":
+    if filters.status_filter != "all":
         try:
-            status_enum = TaskStatus(status_filter)
+            status_enum = TaskStatus(filters.status_filter)
             query = query.where(Task.status == status_enum)
         except ValueError:
             # Invalid status, return empty list or all tasks
             pass
 
-    tasks = db.exec(query).all()
-    return [TaskRead.from_orm(task) if hasattr(TaskRead, 'from_orm') else
-            TaskRead(
-                id=task.id,
-                title=task.title,
-                description=task.description,
-                status=task.status,
-                priority=task.priority,
-                due_date=task.due_date,
-                tags=json.loads(task.tags) if task.tags else [],
-                recurrence=task.recurrence,
-                reminder_sent=task.reminder_sent,
-                user_id=task.user_id,
-                created_at=task.created_at,
-                updated_at=task.updated_at
-            ) for task in tasks]
+    if filters.priority is not None:
+        query = query.where(Task.priority == filters.priority)
+    if filters.recurrence is not None:
+        query = query.where(Task.recurrence == filters.recurrence)
+    if filters.due_before is not None:
+        query = query.where(Task.due_date < filters.due_before)
+    if filters.due_after is not None:
+        query = query.where(Task.due_date >= filters.due_after)
+    if filters.overdue is not None:
+        is_overdue = and_(
+            Task.status == TaskStatus.pending,
+            Task.due_date.isnot(None),
+            Task.due_date < datetime.utcnow()
+        )
+        query = query.where(is_overdue if filters.overdue else ~is_overdue)
+    if filters.tag:
+        # Served by the (user_id, tag, task_id) index on task_tags
+        tagged = select(TaskTag.task_id).where(TaskTag.user_id == user_id, TaskTag.tag == filters.tag)
+        query = query.where(Task.id.in_(tagged))
+
+    return query
+
+# Priority levels in ascending order of importance
+_PRIORITY_RANK = {priority: rank for rank, priority in enumerate(TaskPriority)}
+
+def _sort_key(sort: Optional[TaskSort], dialect_name: str):
+    """
+    Resolve a sort option to (column expression, descending, cursor value codec).
+
+    The codec is (task column holding the sort value, encode for the cursor,
+    decode back to what the column expression compares against).
+    """
+    if sort is None:
+        return None, False, None
+
+    descending = sort.value.startswith("-")
+    field = sort.value.lstrip("-")
+
+    if field == "priority":
+        # Postgres compares native enums in declaration order (low < urgent),
+        # so the (user_id, priority, id) index serves the sort directly.
+        # Other backends store the name as text, so rank it explicitly.
+        if dialect_name == "postgresql":
+            return Task.priority, descending, (Task.priority, lambda value: value.value, TaskPriority)
+        rank = case(_PRIORITY_RANK, value=Task.priority)
+        return rank, descending, (
+            Task.priority, lambda value: value.value, lambda value: _PRIORITY_RANK[TaskPriority(value)]
+        )
+
+    column = Task.due_date if field == "due_date" else Task.created_at
+    return column, descending, (
+        column,
+        lambda value: value.isoformat() if value else None,
+        datetime.fromisoformat
+    )
+
+def _keyset_after(column, value, last_id: int, descending: bool):
+    """
+    Rows strictly after (value, last_id) in ORDER BY column [DESC] NULLS LAST, id
+    """
+    if value is None:
+        # Already inside the trailing NULL block
+        return and_(column.is_(None), Task.id > last_id)
+
+    beyond = column < value if descending else column > value
+    return or_(beyond, and_(column == value, Task.id > last_id), column.is_(None))
+
+def get_user_tasks(db: Session, user_id: int, status_filter: str = "all") -> List[TaskRead]:
+    """
+    Get all tasks for a user, optionally filtered by status
+    """
+    query = _user_tasks_query(user_id, TaskFilters(status_filter=status_filter)).order_by(Task.id)
+    return [task for _, task in _read_tasks(db, user_id, query)]
+
+def get_user_tasks_page(
+    db: Session,
+    user_id: int,
+    filters: Optional[TaskFilters] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None
+) -> TaskPage:
+    """
+    Get one page of a user's filtered tasks using keyset pagination.
+
+    Rows are ordered by the requested sort column (NULLs last) with id as the
+    tie-breaker, or by id alone when no sort is given. The cursor holds the
+    sort value and id of the last row of the previous page, so each page is
+    an index range scan on (user_id, <sort column>, id) no matter how deep
+    the client pages. With fields, items carry only those fields.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or from another sort
+    """
+    filters = filters or TaskFilters()
+    sort_name = filters.sort.value if filters.sort else None
+    column, descending, codec = _sort_key(filters.sort, db.get_bind().dialect.name)
+    query = _user_tasks_query(user_id, filters)
+
+    if cursor:
+        payload = decode_cursor(cursor)
+        last_id = payload.get("id")
+        if not isinstance(last_id, int) or payload.get("s") != sort_name:
+            raise InvalidCursorError(f"Invalid cursor: {cursor}")
+
+        if column is None:
+            query = query.where(Task.id > last_id)
+        else:
+            value = payload.get("v")
+            try:
+                value = codec[2](value) if value is not None else None
+            except (KeyError, ValueError) as e:
+                raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+            query = query.where(_keyset_after(column, value, last_id, descending))
+
+    if column is None:
+        query = query.order_by(Task.id)
+    else:
+        ordered = column.desc() if descending else column.asc()
+        query = query.order_by(ordered.nulls_last(), Task.id)
+
+    # Fetch one extra row to learn whether another page exists; the sort
+    # value rides along for the cursor whether or not it is a selected field
+    sort_columns = (codec[0],) if codec is not None else ()
+    rows = _read_tasks(db, user_id, query.limit(limit + 1), *sort_columns, fields=fields)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        payload = {"s": sort_name, "id": last[0]}
+        if codec is not None:
+            payload["v"] = codec[1](last[2])
+        next_cursor = encode_cursor(payload)
+
+    return TaskPage.model_construct(items=[task for _, task, *_ in rows], next_cursor=next_cursor)
+
+def _search_terms(q: str) -> List[str]:
+    """
+    Split a free-text query into lower-case word terms
+    """
+    return re.findall(r"\w+", q.lower())
+
+def _word_prefix(column, term: str):
+    """
+    Whether a word in a text column starts with the term (case-insensitive)
+    """
+    # Terms are word characters, of which only _ is a LIKE wildcard
+    pattern = term.replace("_", "\\_")
+    lowered = func.lower(column)
+    return or_(lowered.like(f"{pattern}%", escape="\\"), lowered.like(f"% {pattern}%", escape="\\"))
+
+def _like_score_query(user_id: int, terms: List[str]):
+    """
+    (id, score) of a user's tasks matching any of the terms, without a text
+    index: a LIKE scan over the user's tasks, scoring 2 per term found in
+    the title and 1 per term found in the description.
+    """
+    score = sum(
+        case((_word_prefix(Task.title, term), 2), else_=0) + case((_word_prefix(Task.description, term), 1), else_=0)
+        for term in terms
+    )
+    matches = [or_(_word_prefix(Task.title, term), _word_prefix(Task.description, term)) for term in terms]
+    return select(Task.id.label("id"), cast(score, Float).label("score")).where(Task.user_id == user_id, or_(*matches))
+
+def _search_score_query(user_id: int, terms: List[str], dialect_name: str):
+    """
+    Subquery of (id, score) for a user's tasks matching any of the terms,
+    where a higher score is a better match.
+
+    Terms are OR-ed and prefix-matched, so "the dentist one" finds
+    "Dentist appointment" (stop words are ignored by the text index).
+    Databases without a text index fall back to _like_score_query.
+    """
+    if dialect_name == "postgresql":
+        tsquery = func.to_tsquery("english", " | ".join(f"{term}:*" for term in terms))
+        search_vector = literal_column("tasks.search_vector")
+        score = cast(func.ts_rank_cd(search_vector, tsquery), Float)
+        query = select(Task.id.label("id"), score.label("score")).where(
+            Task.user_id == user_id,
+            search_vector.op("@@")(tsquery)
+        )
+    elif dialect_name == "sqlite":
+        fts = table("tasks_fts", column("rowid"))
+        match = " OR ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+        # bm25() is lower-is-better; negate it so both backends rank descending
+        score = -func.bm25(literal_column("tasks_fts"))
+        query = select(Task.id.label("id"), score.label("score")).join(
+            fts, fts.c.rowid == Task.id
+        ).where(
+            Task.user_id == user_id,
+            text("tasks_fts MATCH :match").bindparams(match=match)
+        )
+    else:
+        query = _like_score_query(user_id, terms)
+
+    # Materialized so the score can be filtered on for keyset pagination
+    # (SQLite only allows bm25() in the MATCH query itself)
+    return query.cte("task_search")
+
+def search_user_tasks(
+    db: Session,
+    user_id: int,
+    q: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None
+) -> TaskPage:
+    """
+    Full-text search over a user's task titles and descriptions.
+
+    Results are ranked by relevance (best first, id as tie-breaker) and
+    paginated with a (score, id) keyset cursor bound to the query string.
+    With fields, items carry only those fields.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or from another query
+    """
+    terms = _search_terms(q)
+    if not terms:
+        return TaskPage(items=[])
+
+    ranked = _search_score_query(user_id, terms, db.get_bind().dialect.name)
+    query = select(Task).join(ranked, ranked.c.id == Task.id)
+
+    if cursor:
+        payload = decode_cursor(cursor)
+        last_id, last_score = payload.get("id"), payload.get("r")
+        if payload.get("q") != q or not isinstance(last_id, int) or not isinstance(last_score, (int, float)):
+            raise InvalidCursorError(f"Invalid cursor: {cursor}")
+        query = query.where(or_(
+            ranked.c.score < last_score,
+            and_(ranked.c.score == last_score, Task.id > last_id)
+        ))
+
+    rows = _read_tasks(
+        db, user_id, query.order_by(ranked.c.score.desc(), Task.id).limit(limit + 1), ranked.c.score, fields=fields
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last_id, _, last_score = rows[-1]
+        next_cursor = encode_cursor({"q": q, "r": last_score, "id": last_id})
+
+    return TaskPage.model_construct(items=[task for _, task, _ in rows], next_cursor=next_cursor)
+
+def get_user_tag_counts(db: Session, user_id: int) -> List[TagCount]:
+    """
+    Number of tasks per tag for a user, most used first
+    """
+    count = func.count(TaskTag.task_id)
+    query = (
+        select(TaskTag.tag, count)
+        .where(TaskTag.user_id == user_id)
+        .group_by(TaskTag.tag)
+        .order_by(count.desc(), TaskTag.tag)
+    )
+    return [TagCount(tag=tag, count=n) for tag, n in db.exec(query).all()]
+
+def get_task_changes(
+    db: Session,
+    user_id: int,
+    since: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    fields: Optional[Tuple[str, ...]] = None
+) -> TaskChanges:
+    """
+    Tasks created or updated, and IDs of tasks deleted, after a sync cursor.
+
+    Every write stamps its rows with the user's new task version, so the
+    changes after a cursor are an index range scan on (user_id,
+    change_version, id) over tasks and over tombstones. Without a cursor
+    the result is a full snapshot of the user's tasks (and no tombstones).
+    Reads stop at the user's current version, which every write below it
+    has already committed, so the returned cursor never skips a change.
+    With fields, changed tasks carry only those fields.
+
+    Cursors record when the sync they continue started. Tombstones are
+    purged after a retention period, so a cursor older than
+    SYNC_CURSOR_MAX_AGE is refused and the client starts over from a
+    snapshot.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+        ExpiredCursorError: If the cursor is older than SYNC_CURSOR_MAX_AGE
+    """
+    now = int(time.time())
+    after_version, after_id, issued_at = -1, None, now
+    if since:
+        payload = decode_cursor(since)
+        after_version, after_id, issued_at = payload.get("cv"), payload.get("id"), payload.get("at")
+        if not isinstance(after_version, int) or not isinstance(after_id, (int, type(None))):
+            raise InvalidCursorError(f"Invalid cursor: {since}")
+        if not isinstance(issued_at, int) or now - issued_at > SYNC_CURSOR_MAX_AGE.total_seconds():
+            raise ExpiredCursorError(f"Sync cursor expired: {since}")
+
+    upto_version = get_task_version(db, user_id)
+
+    def window(version_column, id_column):
+        after = version_column > after_version
+        if after_id is not None:
+            after = or_(after, and_(version_column == after_version, id_column > after_id))
+        return and_(after, version_column <= upto_version)
+
+    tasks = _read_tasks(
+        db,
+        user_id,
+        select(Task)
+        .where(Task.user_id == user_id, window(Task.change_version, Task.id))
+        .order_by(Task.change_version, Task.id)
+        .limit(limit + 1),
+        Task.change_version,
+        fields=fields
+    )
+    tombstones = []
+    if since:
+        tombstones = db.exec(
+            select(TaskTombstone.change_version, TaskTombstone.task_id)
+            .where(TaskTombstone.user_id == user_id, window(TaskTombstone.change_version, TaskTombstone.task_id))
+            .order_by(TaskTombstone.change_version, TaskTombstone.task_id)
+            .limit(limit + 1)
+        ).all()
+
+    # Merge both streams in (version, id) order and cut the page
+    merged = sorted(
+        [(change_version, task_id, task) for task_id, task, change_version in tasks]
+        + [(version, task_id, None) for version, task_id in tombstones],
+        key=lambda change: (change[0], change[1])
+    )
+    has_more = len(merged) > limit
+    merged = merged[:limit]
+
+    if has_more:
+        last_version, last_id, _ = merged[-1]
+        # Tombstones past this page are still due, so the sync keeps its start time
+        cursor = encode_cursor({"cv": last_version, "id": last_id, "at": issued_at})
+    else:
+        cursor = encode_cursor({"cv": max(upto_version, after_version), "at": now})
+
+    return TaskChanges.model_construct(
+        changed=[task for _, _, task in merged if task is not None],
+        deleted=[task_id for _, task_id, task in merged if task is None],
+        cursor=cursor,
+        has_more=has_more
+    )
 
 def get_task_by_id(db: Session, task_id: int, user_id: int) -> Optional[Task]:
     """
@@ -42,9 +581,9 @@ def get_task_by_id(db: Session, task_id: int, user_id: int) -> Optional[Task]:
     query = select(Task).where(Task.id == task_id).where(Task.user_id == user_id)
     return db.exec(query).first()
 
-def create_task_for_user(db: Session, task_data: TaskCreate, user_id: int) -> TaskRead:
+def _new_task(task_data: TaskCreate, user_id: int) -> Task:
     """
-    Create a new task for a user and publish task.created event
+    Build (but do not add) a new task row from create data
     """
     task = Task(
         title=task_data.title,
@@ -52,125 +591,382 @@ def create_task_for_user(db: Session, task_data: TaskCreate, user_id: int) -> Ta
         status=task_data.status if task_data.status else TaskStatus.pending,
         priority=task_data.priority if task_data.priority else TaskPriority.medium,
         due_date=task_data.due_date,
-        tags=json.dumps(task_data.tags) if task_data.tags else "[]",
         recurrence=task_data.recurrence,
         user_id=user_id
     )
+    task.set_tags(task_data.tags)
+    return task
+
+def _insert_task(db: Session, task_data: TaskCreate, user_id: int) -> Task:
+    """
+    Insert and commit a new task row together with its task.created event
+    """
+    task = _new_task(task_data, user_id)
+    task.change_version = bump_task_version(db, user_id)
     db.add(task)
+    db.flush()
+    if task.due_date is not None:
+        sync_reminder_schedule(db, user_id, [task.id])
+    enqueue_task_event(db, "task.created", task)
     db.commit()
     db.refresh(task)
+    return task
 
-    # Publish task.created event to Dapr pub/sub
-    try:
-        from services.event_service import publish_task_event
-        import asyncio
-        # Run the async function in a new event loop
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        loop.run_until_complete(publish_task_event("task.created", task))
-    except Exception as e:
-        # Log error but don't fail the creation
-        import logging
-        logging.error(f"Failed to publish task.created event: {str(e)}")
-
-    return TaskRead(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        status=task.status,
-        priority=task.priority,
-        due_date=task.due_date,
-        tags=json.loads(task.tags) if task.tags else [],
-        recurrence=task.recurrence,
-        reminder_sent=task.reminder_sent,
-        user_id=task.user_id,
-        created_at=task.created_at,
-        updated_at=task.updated_at
+def create_task_for_user(db: Session, task_data: TaskCreate, user_id: int) -> TaskRead:
+    """
+    Create a new task for a user and publish task.created event
+    """
+    task = _insert_task(db, task_data, user_id)
+    _wake_relay()
+    return _to_task_read(task)
+
+def _write_guard(task_id: int, user_id: int, expected_version: Optional[int]):
+    """
+    WHERE clause for a single-task write, optionally pinned to a version
+    """
+    guard = [Task.id == task_id, Task.user_id == user_id]
+    if expected_version is not None:
+        guard.append(Task.version == expected_version)
+    return guard
+
+def _missing_or_conflict(db: Session, task_id: int, user_id: int) -> None:
+    """
+    Explain a guarded write that matched no row: returns None when the task
+    does not exist, raises VersionConflictError when its version moved on
+    """
+    db.rollback()
+    current = db.exec(select(Task.version).where(Task.id == task_id, Task.user_id == user_id)).first()
+    if current is not None:
+        raise VersionConflictError(current)
+    return None
+
+def _apply_task_update(
+    db: Session,
+    task_id: int,
+    user_id: int,
+    task_update: TaskUpdate,
+    expected_version: Optional[int] = None
+) -> Optional[Task]:
+    """
+    Apply and commit a partial update, together with its task.updated or
+    task.completed event (task.completed if the update completed the task).
+
+    The write is a single UPDATE ... WHERE id AND user_id [AND version]
+    RETURNING, with no read before it and no refresh after it. Only a write
+    that matches nothing pays a second query, to tell 404 from a conflict.
+
+    Raises:
+        VersionConflictError: If expected_version is given and does not match
+    """
+    # Update only the fields that are provided
+    values = task_update.model_dump(exclude_none=True, exclude={"tags"})
+    change_version = bump_task_version(db, user_id)
+    statement = (
+        update(Task)
+        .values(**values, version=Task.version + 1, change_version=change_version, updated_at=datetime.utcnow())
+        .returning(Task)
+        .execution_options(populate_existing=True)
     )
+    guard = _write_guard(task_id, user_id, expected_version)
+
+    task = None
+    event_type = "task.updated"
+    if task_update.status == TaskStatus.completed:
+        # Try the pending -> completed transition first, so whether this
+        # update completed the task is known without reading it beforehand
+        task = db.exec(statement.where(*guard, Task.status != TaskStatus.completed)).scalar_one_or_none()
+        if task is not None:
+            event_type = "task.completed"
+    if task is None:
+        task = db.exec(statement.where(*guard)).scalar_one_or_none()
+    if task is None:
+        return _missing_or_conflict(db, task_id, user_id)
+
+    if task_update.tags is not None:
+        task.set_tags(task_update.tags)
+        db.flush()
+    else:
+        task.tag_links  # load tags before the task is detached
+    if "due_date" in values or "status" in values:
+        sync_reminder_schedule(db, user_id, [task_id])
+    enqueue_task_event(db, event_type, task)
 
-def update_task(db: Session, task_id: int, user_id: int, task_update: TaskUpdate) -> Optional[TaskRead]:
+    # Detach so the returned row stays readable after commit without a refresh
+    db.expunge(task)
+    db.commit()
+    return task
+
+def update_task(
+    db: Session,
+    task_id: int,
+    user_id: int,
+    task_update: TaskUpdate,
+    expected_version: Optional[int] = None
+) -> Optional[TaskRead]:
     """
     Update a task for a user and publish task.updated or task.completed event
+
+    Raises:
+        VersionConflictError: If expected_version is given and does not match
     """
-    task = get_task_by_id(db, task_id, user_id)
+    task = _apply_task_update(db, task_id, user_id, task_update, expected_version)
     if not task:
         return None
 
-    # Track if status changed to completed
-    was_completed = False
-    if task_update.status is not None and task_update.status == TaskStatus.completed:
-        if task.status != TaskStatus.completed:
-            was_completed = True
+    _wake_relay()
+    return _to_task_read(task)
 
-    # Update only the fields that are provided
-    if task_update.title is not None:
-        task.title = task_update.title
-    if task_update.description is not None:
-        task.description = task_update.description
-    if task_update.status is not None:
-        task.status = task_update.status
-    if task_update.priority is not None:
-        task.priority = task_update.priority
-    if task_update.due_date is not None:
-        task.due_date = task_update.due_date
-    if task_update.tags is not None:
-        task.tags = json.dumps(task_update.tags)
-    if task_update.recurrence is not None:
-        task.recurrence = task_update.recurrence
+def delete_task(db: Session, task_id: int, user_id: int, expected_version: Optional[int] = None) -> bool:
+    """
+    Delete a task for a user with a single DELETE ... RETURNING, leaving a
+    tombstone for delta sync
 
-    task.updated_at = datetime.utcnow()
-    db.add(task)
+    Raises:
+        VersionConflictError: If expected_version is given and does not match
+    """
+    change_version = bump_task_version(db, user_id)
+    deleted = db.exec(
+        delete(Task)
+        .where(*_write_guard(task_id, user_id, expected_version))
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if deleted is None:
+        _missing_or_conflict(db, task_id, user_id)
+        return False
+
+    # SQLite does not enforce the task_tags cascade
+    db.exec(delete(TaskTag).where(TaskTag.task_id == task_id))
+    record_task_deletions(db, user_id, [task_id], change_version)
+    sync_reminder_schedule(db, user_id, [task_id])
     db.commit()
-    db.refresh(task)
+    return True
+
+def _apply_bulk_operations(
+    db: Session,
+    user_id: int,
+    operations: List[TaskBulkOperation]
+) -> List[TaskBulkResult]:
+    """
+    Apply a list of create/update/delete operations, and write their events
+    to the outbox, in one transaction.
+
+    Statements are set-based rather than per item: creates go out as one
+    batched INSERT, updates carrying the same changes share one
+    UPDATE ... WHERE id IN (...), and deletes are one DELETE ... WHERE id IN
+    (...). Items that fail validation or target a task the user does not own
+    are reported and skipped; everything else commits together.
+
+    Returns:
+        List[TaskBulkResult]: Per-item results in request order
+    """
+    results: List[Optional[TaskBulkResult]] = [None] * len(operations)
+    creates: List[Tuple[int, Task]] = []
+    # Updates grouped by identical changes: key -> (column values, tags, [(index, task_id)])
+    update_groups: Dict[tuple, Tuple[Dict[str, Any], Optional[List[str]], List[Tuple[int, int]]]] = {}
+    deletes: List[Tuple[int, int]] = []
+    seen_ids = set()
+
+    def reject(index: int, status: str, error: str):
+        operation = operations[index]
+        results[index] = TaskBulkResult(
+            index=index, op=operation.op, status=status, task_id=operation.task_id, error=error
+        )
+
+    for index, operation in enumerate(operations):
+        if operation.op == BulkOperationType.create:
+            try:
+                task_data = TaskCreate.model_validate(operation.data or {})
+            except ValidationError as e:
+                reject(index, "invalid", str(e))
+                continue
+            creates.append((index, _new_task(task_data, user_id)))
+            continue
+
+        if operation.task_id is None:
+            reject(index, "invalid", "task_id is required")
+            continue
+        if operation.task_id in seen_ids:
+            reject(index, "invalid", "task_id appears more than once in the request")
+            continue
+        seen_ids.add(operation.task_id)
+
+        if operation.op == BulkOperationType.delete:
+            deletes.append((index, operation.task_id))
+            continue
 
-    # Publish events to Dapr pub/sub
-    try:
-        from services.event_service import publish_task_event
-        import asyncio
-        # Run the async function in a new event loop
         try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        # Publish task.completed event if status changed to completed
-        if was_completed:
-            loop.run_until_complete(publish_task_event("task.completed", task))
-        else:
-            # Publish task.updated event for all other updates
-            loop.run_until_complete(publish_task_event("task.updated", task))
-    except Exception as e:
-        # Log error but don't fail the update
-        import logging
-        logging.error(f"Failed to publish task event: {str(e)}")
-
-    return TaskRead(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        status=task.status,
-        priority=task.priority,
-        due_date=task.due_date,
-        tags=json.loads(task.tags) if task.tags else [],
-        recurrence=task.recurrence,
-        reminder_sent=task.reminder_sent,
-        user_id=task.user_id,
-        created_at=task.created_at,
-        updated_at=task.updated_at
-    )
+            task_update = TaskUpdate.model_validate(operation.data or {})
+        except ValidationError as e:
+            reject(index, "invalid", str(e))
+            continue
+        # Only the fields that are provided are changed, as in update_task
+        values = task_update.model_dump(exclude_none=True, exclude={"tags"})
+        tags = list(dict.fromkeys(task_update.tags)) if task_update.tags is not None else None
+        key = (tuple(sorted(values.items())), tuple(tags) if tags is not None else None)
+        update_groups.setdefault(key, (values, tags, []))[2].append((index, operation.task_id))
+
+    # One lookup for ownership and the pre-update status of every targeted task
+    current_status = {}
+    if seen_ids:
+        current_status = dict(db.exec(
+            select(Task.id, Task.status).where(Task.user_id == user_id, Task.id.in_(seen_ids))
+        ).all())
+    for index, task_id in [item for _, _, group in update_groups.values() for item in group] + deletes:
+        if task_id not in current_status:
+            reject(index, "not_found", "Task not found")
 
-def delete_task(db: Session, task_id: int, user_id: int) -> bool:
+    # One version for the whole batch, taken before any task is written
+    change_version = None
+    if creates or current_status:
+        change_version = bump_task_version(db, user_id)
+
+    if creates:
+        for _, task in creates:
+            task.change_version = change_version
+        db.add_all([task for _, task in creates])
+        db.flush()
+
+    updated: Dict[int, str] = {}
+    # Tasks whose reminders have to be rescheduled
+    rescheduled = [task.id for _, task in creates if task.due_date is not None]
+    now = datetime.utcnow()
+    for values, tags, group in update_groups.values():
+        ids = [task_id for _, task_id in group if task_id in current_status]
+        if not ids:
+            continue
+
+        db.exec(
+            update(Task)
+            .where(Task.user_id == user_id, Task.id.in_(ids))
+            .values(**values, version=Task.version + 1, change_version=change_version, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if tags is not None:
+            db.exec(delete(TaskTag).where(TaskTag.task_id.in_(ids)))
+            if tags:
+                db.exec(insert(TaskTag), params=[
+                    {"task_id": task_id, "tag": tag, "user_id": user_id} for task_id in ids for tag in tags
+                ])
+
+        if "due_date" in values or "status" in values:
+            rescheduled.extend(ids)
+        completing = values.get("status") == TaskStatus.completed
+        for task_id in ids:
+            # Publish task.completed if status changed to completed, task.updated otherwise
+            was_completed = completing and current_status[task_id] != TaskStatus.completed
+            updated[task_id] = "task.completed" if was_completed else "task.updated"
+
+    deleted = [task_id for _, task_id in deletes if task_id in current_status]
+    if deleted:
+        # task_tags rows are removed explicitly; SQLite does not enforce the cascade
+        db.exec(delete(TaskTag).where(TaskTag.task_id.in_(deleted)))
+        db.exec(
+            delete(Task)
+            .where(Task.user_id == user_id, Task.id.in_(deleted))
+            .execution_options(synchronize_session=False)
+        )
+        record_task_deletions(db, user_id, deleted, change_version)
+        rescheduled.extend(deleted)
+    sync_reminder_schedule(db, user_id, rescheduled)
+
+    # Reload everything written in one query (tags come with one selectin query)
+    created_ids = [task.id for _, task in creates]
+    written = {}
+    if created_ids or updated:
+        written = {
+            task.id: task for task in db.exec(
+                select(Task)
+                .where(Task.id.in_(created_ids + list(updated)))
+                .execution_options(populate_existing=True)
+            ).all()
+        }
+
+    for index, task in creates:
+        results[index] = TaskBulkResult(
+            index=index, op=BulkOperationType.create, status="created", task_id=task.id,
+            task=_to_task_read(written[task.id])
+        )
+    for _, _, group in update_groups.values():
+        for index, task_id in group:
+            if results[index] is None:
+                results[index] = TaskBulkResult(
+                    index=index, op=BulkOperationType.update, status="updated", task_id=task_id,
+                    task=_to_task_read(written[task_id])
+                )
+    for index, task_id in deletes:
+        if results[index] is None:
+            results[index] = TaskBulkResult(index=index, op=BulkOperationType.delete, status="deleted", task_id=task_id)
+
+    # Events in request order, committed with the changes
+    events = []
+    for result in results:
+        if result.status == "created":
+            events.append(("task.created", written[result.task_id]))
+        elif result.status == "updated":
+            events.append((updated[result.task_id], written[result.task_id]))
+    enqueue_task_events(db, events)
+
+    db.commit()
+    return results
+
+def bulk_mutate_tasks(db: Session, user_id: int, operations: List[TaskBulkOperation]) -> TaskBulkResponse:
+    """
+    Apply a batch of task operations for a user in one transaction; the
+    resulting task events go out through the outbox in one batch
+    """
+    results = _apply_bulk_operations(db, user_id, operations)
+    _wake_relay()
+    return TaskBulkResponse(results=results)
+
+
+# =============================================================================
+# Async variants for async routes
+#
+# Each runs the sync implementation above through AsyncSession.run_sync, which
+# drives the same ORM code over the async driver without blocking the event
+# loop. Events go through the outbox exactly as for the sync versions.
+# =============================================================================
+
+async def get_user_tasks_async(db: AsyncSession, user_id: int, status_filter: str = "all") -> List[TaskRead]:
     """
-    Delete a task for a user
+    Async variant of get_user_tasks
     """
-    task = get_task_by_id(db, task_id, user_id)
+    return await db.run_sync(get_user_tasks, user_id, status_filter)
+
+async def get_task_by_id_async(db: AsyncSession, task_id: int, user_id: int) -> Optional[Task]:
+    """
+    Async variant of get_task_by_id
+    """
+    return await db.run_sync(get_task_by_id, task_id, user_id)
+
+async def create_task_for_user_async(db: AsyncSession, task_data: TaskCreate, user_id: int) -> TaskRead:
+    """
+    Async variant of create_task_for_user
+    """
+    task = await db.run_sync(_insert_task, task_data, user_id)
+    _wake_relay()
+    return _to_task_read(task)
+
+async def update_task_async(
+    db: AsyncSession,
+    task_id: int,
+    user_id: int,
+    task_update: TaskUpdate,
+    expected_version: Optional[int] = None
+) -> Optional[TaskRead]:
+    """
+    Async variant of update_task
+    """
+    task = await db.run_sync(_apply_task_update, task_id, user_id, task_update, expected_version)
     if not task:
-        return False
+        return None
 
-    db.delete(task)
-    db.commit()
-    return True
\ No newline at end of file
+    _wake_relay()
+    return _to_task_read(task)
+
+async def delete_task_async(db: AsyncSession, task_id: int, user_id: int, expected_version: Optional[int] = None) -> bool:
+    """
+    Async variant of delete_task
+    """
+    return await db.run_sync(delete_task, task_id, user_id, expected_version)
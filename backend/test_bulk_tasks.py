@@ -0,0 +1,150 @@
+"""
+POST /api/tasks/bulk (tasks_crud._apply_bulk_operations).
+"""
+
+from datetime import datetime, timedelta
+
+from sqlmodel import select
+
+from models.todo_models import ReminderSchedule, Task, TaskBulkOperation, TaskCreate, TaskStatus, TaskTombstone
+from tasks_crud import bulk_mutate_tasks, create_task_for_user
+
+
+def _create(db, user_id, title, **fields):
+    return create_task_for_user(db, TaskCreate(title=title, **fields), user_id).id
+
+
+def _bulk(db, user_id, *operations):
+    return bulk_mutate_tasks(db, user_id, [TaskBulkOperation(**operation) for operation in operations]).results
+
+
+def _task_events(outbox_events, user_id):
+    return [
+        (payload["event_type"], payload["task_id"])
+        for topic, payload in outbox_events(user_id) if topic == "task-events"
+    ]
+
+
+def test_results_come_back_in_request_order(db, user_id):
+    keep = _create(db, user_id, "keep")
+    drop = _create(db, user_id, "drop")
+
+    results = _bulk(
+        db, user_id,
+        {"op": "delete", "task_id": drop},
+        {"op": "create", "data": {"title": "new"}},
+        {"op": "update", "task_id": keep, "data": {"title": "kept"}},
+        {"op": "create", "data": {}},
+    )
+
+    assert [(result.index, result.op.value, result.status) for result in results] == [
+        (0, "delete", "deleted"),
+        (1, "create", "created"),
+        (2, "update", "updated"),
+        (3, "create", "invalid"),
+    ]
+    assert results[1].task.title == "new"
+    assert results[2].task.title == "kept" and results[2].task.version == 2
+
+
+def test_duplicate_task_id_is_rejected(db, user_id):
+    task_id = _create(db, user_id, "once")
+
+    results = _bulk(
+        db, user_id,
+        {"op": "update", "task_id": task_id, "data": {"title": "first"}},
+        {"op": "delete", "task_id": task_id},
+    )
+
+    assert [result.status for result in results] == ["updated", "invalid"]
+    assert "more than once" in results[1].error
+    db.expire_all()
+    assert db.get(Task, task_id).title == "first"
+
+
+def test_tasks_of_another_user_are_not_found(db, user_id, make_user):
+    other_task = _create(db, make_user(), "not yours")
+
+    results = _bulk(
+        db, user_id,
+        {"op": "update", "task_id": other_task, "data": {"title": "stolen"}},
+        {"op": "delete", "task_id": other_task + 1000},
+    )
+
+    assert [result.status for result in results] == ["not_found", "not_found"]
+    db.expire_all()
+    assert db.get(Task, other_task).title == "not yours"
+
+
+def test_grouped_updates_keep_their_own_tags(db, user_id):
+    first, second, third = (_create(db, user_id, f"t{n}", tags=["old"]) for n in range(3))
+
+    # Same column changes, different tags: separate groups
+    results = _bulk(
+        db, user_id,
+        {"op": "update", "task_id": first, "data": {"priority": "high", "tags": ["a"]}},
+        {"op": "update", "task_id": second, "data": {"priority": "high", "tags": ["b", "b"]}},
+        {"op": "update", "task_id": third, "data": {"priority": "high"}},
+    )
+
+    assert [(result.task.priority.value, result.task.tags) for result in results] == [
+        ("high", ["a"]), ("high", ["b"]), ("high", ["old"]),
+    ]
+
+
+def test_completion_events_only_for_tasks_that_were_pending(db, user_id, outbox_events):
+    pending = _create(db, user_id, "pending")
+    done = _create(db, user_id, "done", status=TaskStatus.completed)
+    renamed = _create(db, user_id, "renamed")
+    before = len(outbox_events(user_id))
+
+    _bulk(
+        db, user_id,
+        {"op": "update", "task_id": renamed, "data": {"title": "renamed again"}},
+        {"op": "update", "task_id": pending, "data": {"status": "completed"}},
+        {"op": "update", "task_id": done, "data": {"status": "completed"}},
+        {"op": "create", "data": {"title": "created"}},
+    )
+
+    events = _task_events(outbox_events, user_id)[before:]
+    assert [event_type for event_type, _ in events] == ["task.updated", "task.completed", "task.updated", "task.created"]
+    assert [task_id for _, task_id in events[:3]] == [renamed, pending, done]
+
+
+def test_deletes_leave_tombstones_and_drop_reminders(db, user_id):
+    due = datetime.utcnow().replace(microsecond=0) + timedelta(hours=2)
+    doomed = [_create(db, user_id, f"doomed {n}", due_date=due) for n in range(2)]
+    kept = _create(db, user_id, "kept", due_date=due)
+
+    results = _bulk(db, user_id, *({"op": "delete", "task_id": task_id} for task_id in doomed))
+
+    assert [result.status for result in results] == ["deleted", "deleted"]
+    tombstones = db.exec(
+        select(TaskTombstone.task_id, TaskTombstone.change_version).where(TaskTombstone.user_id == user_id)
+    ).all()
+    assert sorted(task_id for task_id, _ in tombstones) == doomed
+    # One version for the whole batch
+    assert len({version for _, version in tombstones}) == 1
+    scheduled = db.exec(select(ReminderSchedule.task_id).where(ReminderSchedule.user_id == user_id)).all()
+    assert scheduled == [kept]
+
+
+def test_bulk_endpoint_caps_operations(client, auth_headers):
+    from tasks_crud import MAX_BULK_OPERATIONS
+
+    operations = [{"op": "create", "data": {"title": "x"}}] * (MAX_BULK_OPERATIONS + 1)
+    response = client.post("/api/tasks/bulk", json={"operations": operations}, headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+def test_bulk_endpoint_reports_each_operation(client, auth_headers):
+    response = client.post("/api/tasks/bulk", json={"operations": [
+        {"op": "create", "data": {"title": "via api"}},
+        {"op": "update", "data": {"title": "no id"}},
+    ]}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert [(result["status"], result["error"]) for result in response.json()["results"]] == [
+        ("created", None), ("invalid", "task_id is required"),
+    ]
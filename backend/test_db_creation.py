@@ -1,12 +1,13 @@
-from sqlmodel import SQLModel, Field, create_engine, Session, select
+from sqlmodel import SQLModel, Field, Session, select
 from typing import Optional
 from datetime import datetime
 
 # Define a simple User model
 from backend.models.todo_models import User
+from backend.database.connection import get_engine
 
 # Create engine
-engine = create_engine("sqlite:///./test_todo.db", echo=True)
+engine = get_engine("sqlite:///./test_todo.db")
 
 def test_create_user():
     # Create tables
@@ -0,0 +1,119 @@
+"""
+Dedupe store for event subscribers (services/event_dedupe.py).
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import services.event_dedupe as event_dedupe
+from models.todo_models import ProcessedEvent
+from services.event_dedupe import claim_event, is_duplicate_event, remember_event
+
+CONSUMER = "test-consumer"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(event_dedupe, "_recent", OrderedDict())
+
+
+@pytest.fixture
+def event_id():
+    return uuid.uuid4().hex
+
+
+def _run(async_engine, work):
+    async def run():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            return await work(session)
+    return asyncio.run(run())
+
+
+def test_cache_hit_answers_without_the_database(event_id):
+    remember_event(CONSUMER, event_id)
+
+    # A session that cannot execute anything
+    assert asyncio.run(is_duplicate_event(SimpleNamespace(), CONSUMER, event_id))
+
+
+def test_cache_keeps_the_most_recent_events(monkeypatch):
+    monkeypatch.setattr(event_dedupe, "DEDUPE_CACHE_SIZE", 2)
+    remember_event(CONSUMER, "a")
+    remember_event(CONSUMER, "b")
+    asyncio.run(is_duplicate_event(SimpleNamespace(), CONSUMER, "a"))
+
+    remember_event(CONSUMER, "c")
+
+    assert list(event_dedupe._recent) == [(CONSUMER, "a"), (CONSUMER, "c")]
+
+
+def test_database_hit_after_the_cache_forgot(async_engine, event_id):
+    async def claim(session):
+        claimed = await claim_event(session, CONSUMER, event_id)
+        await session.commit()
+        return claimed
+
+    assert _run(async_engine, claim)
+    assert not _run(async_engine, lambda session: is_duplicate_event(session, "other-consumer", event_id))
+
+    assert _run(async_engine, lambda session: is_duplicate_event(session, CONSUMER, event_id))
+    # Found in the table, so the next redelivery is answered from memory
+    assert (CONSUMER, event_id) in event_dedupe._recent
+
+
+def test_concurrent_redelivery_loses_the_claim_without_an_error(async_engine, event_id):
+    async def both_deliveries(session):
+        # Both deliveries checked before either committed
+        assert not await is_duplicate_event(session, CONSUMER, event_id)
+        async with AsyncSession(async_engine) as first:
+            assert await claim_event(first, CONSUMER, event_id)
+            await first.commit()
+        return await claim_event(session, CONSUMER, event_id)
+
+    assert _run(async_engine, both_deliveries) is False
+
+
+def test_rolled_back_purge_is_retried_by_the_next_claim(async_engine, monkeypatch):
+    monkeypatch.setattr(event_dedupe, "_next_purge", 0.0)
+
+    async def claim_and_roll_back(session):
+        await claim_event(session, CONSUMER, uuid.uuid4().hex)
+        await session.rollback()
+
+    async def claim_and_commit(session):
+        await claim_event(session, CONSUMER, uuid.uuid4().hex)
+        await session.commit()
+
+    _run(async_engine, claim_and_roll_back)
+    assert event_dedupe._next_purge == 0.0
+
+    _run(async_engine, claim_and_commit)
+    assert event_dedupe._next_purge > time.monotonic()
+
+
+def test_purge_drops_only_expired_entries(db, async_engine, monkeypatch):
+    monkeypatch.setattr(event_dedupe, "_next_purge", 0.0)
+    expired = uuid.uuid4().hex
+    db.add(ProcessedEvent(
+        consumer=CONSUMER, event_id=expired,
+        processed_at=datetime.utcnow() - timedelta(hours=event_dedupe.PROCESSED_EVENT_TTL_HOURS + 1),
+    ))
+    db.commit()
+    fresh = uuid.uuid4().hex
+
+    async def claim(session):
+        await claim_event(session, CONSUMER, fresh)
+        await session.commit()
+
+    _run(async_engine, claim)
+
+    remaining = set(db.exec(select(ProcessedEvent.event_id).where(ProcessedEvent.event_id.in_([expired, fresh]))).all())
+    assert remaining == {fresh}
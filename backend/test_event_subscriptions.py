@@ -0,0 +1,212 @@
+"""
+Dapr subscription deliveries: main._handle_event_batch and the event executor.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlmodel import select
+
+import main
+from models.todo_models import ProcessedEvent
+from services.keyed_executor import ExecutorBusyError, KeyedExecutor
+
+CONSUMER = "test-subscriber"
+
+
+def _entry(entry_id, **data):
+    return {"entryId": entry_id, "event": {"data": data}}
+
+
+def _statuses(response):
+    return [(status["entryId"], status["status"]) for status in response["statuses"]]
+
+
+class RecordingHandler:
+    """
+    An event handler that records the (user_id, n) of each event it handles
+    """
+
+    def __init__(self):
+        self.seen = []
+
+    async def __call__(self, db, event_data):
+        self.seen.append((event_data.get("user_id"), event_data.get("n")))
+        return {"status": "success"}
+
+
+@pytest.fixture
+def deliver(monkeypatch, async_engine):
+    """
+    Runs a bulk delivery against its own started executor and the test database
+    """
+    monkeypatch.setattr(main, "get_async_engine", lambda: async_engine)
+
+    def deliver(entries, handle_event, workers=4):
+        async def run():
+            executor = KeyedExecutor(workers=workers)
+            executor.start()
+            monkeypatch.setattr(main, "submit_event_job", executor.submit)
+            try:
+                return await main._handle_event_batch({"entries": entries}, CONSUMER, handle_event)
+            finally:
+                await executor.stop()
+        return asyncio.run(run())
+
+    return deliver
+
+
+def test_string_and_int_user_ids_share_one_order(deliver):
+    handler = RecordingHandler()
+
+    response = deliver([
+        _entry("a", user_id=1, n=1),
+        _entry("b", user_id="1", n=2),
+        _entry("c", user_id=2, n=3),
+        _entry("d", user_id=" 1", n=4),
+    ], handler)
+
+    assert _statuses(response) == [("a", "SUCCESS"), ("b", "SUCCESS"), ("c", "SUCCESS"), ("d", "SUCCESS")]
+    assert [n for user_id, n in handler.seen if user_id != 2] == [1, 2, 4]
+
+
+def test_events_without_a_usable_user_id_are_dropped(deliver):
+    handler = RecordingHandler()
+
+    response = deliver([
+        _entry("a", user_id="abc", n=1),
+        _entry("b", n=2),
+        _entry("c", user_id=[1], n=3),
+        _entry("d", user_id=5, n=4),
+    ], handler)
+
+    assert _statuses(response) == [("a", "DROP"), ("b", "DROP"), ("c", "DROP"), ("d", "SUCCESS")]
+    assert handler.seen == [(5, 4)]
+
+
+def test_dispatch_keys_the_executor_by_int_user_id(monkeypatch):
+    keys = []
+
+    def submit(key, job):
+        keys.append(key)
+        raise ExecutorBusyError("full")
+
+    monkeypatch.setattr(main, "submit_event_job", submit)
+    asyncio.run(main._handle_event_batch(
+        {"entries": [_entry("a", user_id="7"), _entry("b", user_id=7), _entry("c", user_id="8")]},
+        CONSUMER, RecordingHandler()
+    ))
+
+    assert keys == [7, 8]
+
+
+@pytest.mark.parametrize("overflow_status", ["RETRY", "DROP"])
+def test_full_queue_answers_the_overflow_status(monkeypatch, overflow_status):
+    def busy(key, job):
+        raise ExecutorBusyError(f"queue for key {key} is full")
+
+    monkeypatch.setattr(main, "submit_event_job", busy)
+    monkeypatch.setattr(main, "EVENT_OVERFLOW_STATUS", overflow_status)
+    handler = RecordingHandler()
+
+    response = asyncio.run(main._handle_event_batch(
+        {"entries": [_entry("a", user_id=1), _entry("b", user_id=2), {"entryId": "c"}]}, CONSUMER, handler
+    ))
+
+    assert _statuses(response) == [("a", overflow_status), ("b", overflow_status), ("c", "DROP")]
+    assert handler.seen == []
+
+
+class WritingHandler:
+    """
+    An event handler that writes a processed_events row named by the
+    event's "row", or raises for events with "fail"
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, db, event_data):
+        self.calls += 1
+        if event_data.get("fail"):
+            raise ValueError("cannot handle this event")
+        db.add(ProcessedEvent(consumer=CONSUMER, event_id=event_data["row"], processed_at=datetime.utcnow()))
+        return {"status": event_data.get("result", "success")}
+
+
+def _rows(db, *names):
+    return sorted(db.exec(select(ProcessedEvent.event_id).where(ProcessedEvent.event_id.in_(names))).all())
+
+
+def test_handler_results_map_to_entry_statuses(deliver):
+    prefix = uuid.uuid4().hex
+    response = deliver([
+        _entry("ok", user_id=1, row=f"{prefix}-1"),
+        _entry("retry", user_id=2, row=f"{prefix}-2", result="RETRY"),
+        _entry("drop", user_id=3, row=f"{prefix}-3", result="DROP"),
+        _entry("error", user_id=4, row=f"{prefix}-4", result="error"),
+        _entry("ignored", user_id=5, row=f"{prefix}-5", result="ignored"),
+    ], WritingHandler())
+
+    assert _statuses(response) == [
+        ("ok", "SUCCESS"), ("retry", "RETRY"), ("drop", "DROP"), ("error", "DROP"), ("ignored", "SUCCESS"),
+    ]
+
+
+def test_malformed_entries_are_dropped_in_place(deliver):
+    handler = RecordingHandler()
+
+    response = deliver([
+        {"entryId": "no-event"},
+        {"entryId": "not-a-dict", "event": "task.completed"},
+        {"entryId": "bad-data", "event": {"data": ["x"]}},
+        {"entryId": "raw", "event": {"user_id": 1, "n": 1}},
+        _entry("wrapped", user_id=1, n=2),
+    ], handler)
+
+    assert _statuses(response) == [
+        ("no-event", "DROP"), ("not-a-dict", "DROP"), ("bad-data", "DROP"), ("raw", "SUCCESS"), ("wrapped", "SUCCESS"),
+    ]
+    assert handler.seen == [(1, 1), (1, 2)]
+    assert deliver([], handler) == {"statuses": []}
+
+
+def test_unknown_event_types_succeed_without_effect(deliver):
+    response = deliver([
+        _entry("created", user_id=1, event_type="task.created", task_id=1),
+        _entry("untyped", user_id=1, task_id=2),
+    ], main._task_completed_event)
+
+    assert _statuses(response) == [("created", "SUCCESS"), ("untyped", "SUCCESS")]
+
+
+def test_failing_event_falls_back_to_one_transaction_each(deliver, db):
+    prefix = uuid.uuid4().hex
+    handler = WritingHandler()
+
+    response = deliver([
+        _entry("first", user_id=1, row=f"{prefix}-1"),
+        _entry("bad", user_id=1, fail=True),
+        _entry("last", user_id=1, row=f"{prefix}-3"),
+    ], handler)
+
+    assert _statuses(response) == [("first", "SUCCESS"), ("bad", "DROP"), ("last", "SUCCESS")]
+    # Two events into the batch, then each of the three on its own
+    assert handler.calls == 5
+    assert _rows(db, f"{prefix}-1", f"{prefix}-3") == sorted([f"{prefix}-1", f"{prefix}-3"])
+
+
+def test_commit_failure_falls_back_and_retries_the_conflicting_event(deliver, db):
+    prefix = uuid.uuid4().hex
+    # The first two write the same row: the batch's commit fails, and so
+    # does the second event's own commit
+    response = deliver([
+        _entry("first", user_id=1, row=f"{prefix}-dup"),
+        _entry("duplicate", user_id=1, row=f"{prefix}-dup"),
+        _entry("other", user_id=1, row=f"{prefix}-other"),
+    ], WritingHandler())
+
+    assert _statuses(response) == [("first", "SUCCESS"), ("duplicate", "RETRY"), ("other", "SUCCESS")]
+    assert _rows(db, f"{prefix}-dup", f"{prefix}-other") == sorted([f"{prefix}-dup", f"{prefix}-other"])
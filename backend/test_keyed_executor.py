@@ -0,0 +1,111 @@
+"""
+Keyed executor (services/keyed_executor.py): order per key, parallelism
+across keys, bounded queues.
+"""
+
+import asyncio
+
+import pytest
+
+from services.keyed_executor import ExecutorBusyError, KeyedExecutor
+
+
+def _run(work, **options):
+    async def run():
+        executor = KeyedExecutor(**options)
+        executor.start()
+        try:
+            return await work(executor)
+        finally:
+            await executor.stop()
+    return asyncio.run(run())
+
+
+def test_jobs_with_one_key_run_in_submission_order():
+    done = []
+
+    def job(n, delay):
+        async def run():
+            await asyncio.sleep(delay)
+            done.append(n)
+            return n
+        return run
+
+    async def work(executor):
+        # Earlier jobs take longer, yet finish first
+        futures = [executor.submit(7, job(n, 0.01 * (5 - n))) for n in range(5)]
+        return await asyncio.gather(*futures)
+
+    assert _run(work, workers=4) == [0, 1, 2, 3, 4]
+    assert done == [0, 1, 2, 3, 4]
+
+
+def test_other_keys_run_while_one_key_waits():
+    async def work(executor):
+        release = asyncio.Event()
+
+        async def blocked():
+            await release.wait()
+            return "blocked"
+
+        async def quick():
+            return "quick"
+
+        slow = executor.submit(0, blocked)
+        # Key 1 hashes to the other worker and is not held up by key 0
+        assert await asyncio.wait_for(executor.submit(1, quick), timeout=1) == "quick"
+        assert not slow.done()
+        release.set()
+        return await slow
+
+    assert _run(work, workers=2) == "blocked"
+
+
+def test_full_queue_raises_busy_instead_of_waiting():
+    async def work(executor):
+        release = asyncio.Event()
+
+        async def blocked():
+            await release.wait()
+
+        executor.submit(0, blocked)
+        # Let the worker take the first job, so one more fits in the queue
+        await asyncio.sleep(0)
+        executor.submit(0, blocked)
+        with pytest.raises(ExecutorBusyError):
+            executor.submit(0, blocked)
+        release.set()
+
+    _run(work, workers=1, queue_size=1)
+
+
+def test_job_errors_reach_the_caller_and_the_worker_goes_on():
+    async def work(executor):
+        async def failing():
+            raise ValueError("bad event")
+
+        async def fine():
+            return "ok"
+
+        with pytest.raises(ValueError):
+            await executor.submit(0, failing)
+        return await executor.submit(0, fine)
+
+    assert _run(work, workers=1) == "ok"
+
+
+def test_stopped_executor_is_busy_and_cancels_queued_jobs():
+    async def run():
+        executor = KeyedExecutor(workers=1, queue_size=4)
+        with pytest.raises(ExecutorBusyError):
+            executor.submit(0, asyncio.sleep)
+        executor.start()
+        release = asyncio.Event()
+        running = executor.submit(0, release.wait)
+        await asyncio.sleep(0)
+        queued = executor.submit(0, release.wait)
+        await executor.stop()
+        return running, queued
+
+    running, queued = asyncio.run(run())
+    assert running.cancelled() and queued.cancelled()
@@ -0,0 +1,162 @@
+"""
+Outbox relay (services/outbox_relay.py): per-topic deletes, per-user order,
+backoff of failing users and the drain lock.
+"""
+
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import delete, text
+from sqlmodel import Session, select
+
+import services.outbox_relay as outbox_relay
+from database.outbox import enqueue_events
+from models.todo_models import OutboxEvent, User
+from services.outbox_relay import OutboxRelay
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+class FakePublisher:
+    """
+    Stands in for publish_events: records (topic, [n]) per call and fails
+    the events whose n is in fail, or the whole call for a topic in down
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.fail = set()
+        self.down = set()
+
+    async def __call__(self, pubsub_name, topic, events):
+        self.calls.append((topic, [event["n"] for event in events]))
+        if topic in self.down:
+            raise ConnectionError(f"{topic} is down")
+        return [index for index, event in enumerate(events) if event["n"] in self.fail]
+
+
+@pytest.fixture
+def publisher(monkeypatch):
+    publisher = FakePublisher()
+    monkeypatch.setattr(outbox_relay, "publish_events", publisher)
+    return publisher
+
+
+@pytest.fixture
+def relay_db(db, async_engine, monkeypatch):
+    """
+    An empty outbox the relay drains through the test's async engine
+    """
+    db.exec(delete(OutboxEvent))
+    db.commit()
+    monkeypatch.setattr(outbox_relay, "get_async_engine", lambda: async_engine)
+    return db
+
+
+def _enqueue(db, user_id, topic, *numbers):
+    enqueue_events(db, user_id, topic, [{"n": n} for n in numbers])
+    db.commit()
+
+
+def _pending_numbers(db):
+    return [json.loads(payload)["n"] for payload in db.exec(select(OutboxEvent.payload).order_by(OutboxEvent.id)).all()]
+
+
+def test_topic_failure_does_not_resend_earlier_topics(relay_db, user_id, publisher):
+    _enqueue(relay_db, user_id, "task-events", 1)
+    _enqueue(relay_db, user_id, "reminders", 2)
+    _enqueue(relay_db, user_id, "task-events", 3)
+    relay = OutboxRelay()
+
+    publisher.down = {"reminders"}
+    with pytest.raises(ConnectionError):
+        asyncio.run(relay.drain_once())
+    assert _pending_numbers(relay_db) == [2]
+
+    publisher.down = set()
+    assert asyncio.run(relay.drain_once()) == (1, False)
+    assert publisher.calls == [("task-events", [1, 3]), ("reminders", [2]), ("reminders", [2])]
+    assert _pending_numbers(relay_db) == []
+
+
+def test_failed_event_holds_back_the_users_later_events(relay_db, make_user, publisher):
+    first, second = make_user(), make_user()
+    _enqueue(relay_db, first, "task-events", 1, 2)
+    _enqueue(relay_db, first, "reminders", 3)
+    _enqueue(relay_db, second, "task-events", 4)
+    relay = OutboxRelay()
+
+    publisher.fail = {2}
+    assert asyncio.run(relay.drain_once()) == (2, False)
+    # 3 comes after the failed 2, so it is not sent ahead of it
+    assert publisher.calls == [("task-events", [1, 2, 4])]
+    assert _pending_numbers(relay_db) == [2, 3]
+
+    publisher.fail = set()
+    relay._held.clear()
+    asyncio.run(relay.drain_once())
+    assert publisher.calls[1:] == [("task-events", [2]), ("reminders", [3])]
+    assert _pending_numbers(relay_db) == []
+
+
+def test_failing_user_backs_off_without_stalling_others(relay_db, make_user, publisher, monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(outbox_relay, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    failing, other = make_user(), make_user()
+    relay = OutboxRelay(poll_interval=1.0)
+
+    _enqueue(relay_db, failing, "task-events", 1)
+    publisher.fail = {1}
+    asyncio.run(relay.drain_once())
+    assert relay._held[failing] == (1001.0, 1.0)
+
+    # While held, the user's rows are not read; other users still get through
+    _enqueue(relay_db, other, "task-events", 2)
+    asyncio.run(relay.drain_once())
+    assert publisher.calls[1:] == [("task-events", [2])]
+
+    # Each further failure doubles the wait
+    clock.now = 1001.5
+    asyncio.run(relay.drain_once())
+    assert relay._held[failing] == (1003.5, 2.0)
+
+    clock.now = 1004.0
+    publisher.fail = set()
+    assert asyncio.run(relay.drain_once()) == (1, False)
+    assert failing not in relay._held
+    assert _pending_numbers(relay_db) == []
+
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="set TEST_POSTGRES_URL to run against Postgres")
+def test_only_one_replica_drains_at_a_time_on_postgres(publisher, monkeypatch):
+    from database.connection import get_async_engine, get_engine
+    from database.migrations import run_migrations
+
+    engine = get_engine(TEST_POSTGRES_URL)
+    run_migrations(engine)
+    with Session(engine) as db:
+        user = User(email=f"relay-{os.getpid()}-{id(publisher)}@example.com", name="Relay", password="x")
+        db.add(user)
+        db.commit()
+        _enqueue(db, user.id, "task-events", 1)
+
+    async def drain_once():
+        async_engine = get_async_engine(TEST_POSTGRES_URL)
+        monkeypatch.setattr(outbox_relay, "get_async_engine", lambda: async_engine)
+        try:
+            return await OutboxRelay().drain_once()
+        finally:
+            await async_engine.dispose()
+
+    # Another replica holds the drain lock
+    with engine.connect() as other_replica:
+        other_replica.execute(text("SELECT pg_advisory_lock(:key)"), {"key": outbox_relay._OUTBOX_LOCK_KEY})
+        assert asyncio.run(drain_once()) == (0, False)
+        assert publisher.calls == []
+        other_replica.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": outbox_relay._OUTBOX_LOCK_KEY})
+
+    asyncio.run(drain_once())
+    assert any(1 in numbers for _, numbers in publisher.calls)
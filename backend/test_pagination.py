@@ -0,0 +1,114 @@
+"""
+Keyset pagination of GET /api/tasks (pagination.py, tasks_crud.get_user_tasks_page).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.todo_models import TaskCreate, TaskFilters, TaskPriority, TaskSort
+from pagination import InvalidCursorError, decode_cursor, encode_cursor
+from tasks_crud import create_task_for_user, get_user_tasks_page
+
+BASE = datetime(2030, 1, 1, 9, 0)
+
+
+def _create(db, user_id, title, **fields):
+    return create_task_for_user(db, TaskCreate(title=title, **fields), user_id).id
+
+
+def _all_pages(db, user_id, sort=None, limit=2):
+    """Titles page by page, following next_cursor to the end"""
+    pages, cursor = [], None
+    while True:
+        page = get_user_tasks_page(db, user_id, TaskFilters(sort=sort), limit=limit, cursor=cursor)
+        pages.append([task.title for task in page.items])
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    payload = {"s": "-due_date", "id": 42, "v": "2030-01-01T09:00:00"}
+    cursor = encode_cursor(payload)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == payload
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor!", encode_cursor(["id", 1]), "e30"])
+def test_malformed_cursor_is_rejected(db, user_id, cursor):
+    with pytest.raises(InvalidCursorError):
+        get_user_tasks_page(db, user_id, cursor=cursor)
+
+
+def test_pages_cover_every_task_once_in_id_order(db, user_id):
+    for n in range(5):
+        _create(db, user_id, f"t{n}")
+
+    assert _all_pages(db, user_id) == [["t0", "t1"], ["t2", "t3"], ["t4"]]
+
+
+def test_due_date_sort_keeps_nulls_last_ascending(db, user_id):
+    _create(db, user_id, "no date a")
+    _create(db, user_id, "late", due_date=BASE + timedelta(days=2))
+    _create(db, user_id, "early", due_date=BASE)
+    _create(db, user_id, "no date b")
+    _create(db, user_id, "middle", due_date=BASE + timedelta(days=1))
+
+    assert _all_pages(db, user_id, TaskSort.due_date) == [["early", "middle"], ["late", "no date a"], ["no date b"]]
+
+
+def test_due_date_sort_keeps_nulls_last_descending(db, user_id):
+    _create(db, user_id, "no date a")
+    _create(db, user_id, "late", due_date=BASE + timedelta(days=2))
+    _create(db, user_id, "early", due_date=BASE)
+    _create(db, user_id, "no date b")
+    _create(db, user_id, "middle", due_date=BASE + timedelta(days=1))
+
+    assert _all_pages(db, user_id, TaskSort.due_date_desc) == [["late", "middle"], ["early", "no date a"], ["no date b"]]
+
+
+@pytest.mark.parametrize("sort", [TaskSort.due_date, TaskSort.due_date_desc, TaskSort.priority_desc])
+def test_page_boundary_is_stable_across_equal_sort_values(db, user_id, sort):
+    for n in range(7):
+        _create(db, user_id, f"t{n}", due_date=BASE, priority=TaskPriority.high)
+
+    # Ties are broken by id, so no task is repeated or skipped at a page edge
+    assert _all_pages(db, user_id, sort, limit=3) == [["t0", "t1", "t2"], ["t3", "t4", "t5"], ["t6"]]
+
+
+def test_priority_sort_ranks_by_importance(db, user_id):
+    _create(db, user_id, "low", priority=TaskPriority.low)
+    _create(db, user_id, "urgent", priority=TaskPriority.urgent)
+    _create(db, user_id, "medium", priority=TaskPriority.medium)
+    _create(db, user_id, "high", priority=TaskPriority.high)
+
+    assert _all_pages(db, user_id, TaskSort.priority_desc) == [["urgent", "high"], ["medium", "low"]]
+    assert _all_pages(db, user_id, TaskSort.priority) == [["low", "medium"], ["high", "urgent"]]
+
+
+def test_cursor_from_another_sort_is_rejected(db, user_id):
+    for n in range(3):
+        _create(db, user_id, f"t{n}", due_date=BASE)
+    cursor = get_user_tasks_page(db, user_id, TaskFilters(sort=TaskSort.due_date), limit=1).next_cursor
+
+    with pytest.raises(InvalidCursorError):
+        get_user_tasks_page(db, user_id, TaskFilters(sort=TaskSort.priority), limit=1, cursor=cursor)
+
+
+def test_api_answers_tampered_cursor_with_400(client, db, user_id, auth_headers):
+    for n in range(3):
+        _create(db, user_id, f"t{n}", due_date=BASE)
+    response = client.get("/api/tasks", params={"sort": "due_date", "limit": 1}, headers=auth_headers)
+    assert response.status_code == 200
+    cursor = response.json()["next_cursor"]
+
+    tampered = encode_cursor({**decode_cursor(cursor), "v": "not a date"})
+    for bad in (tampered, cursor[:-3], "%%%"):
+        response = client.get("/api/tasks", params={"sort": "due_date", "limit": 1, "cursor": bad}, headers=auth_headers)
+        assert response.status_code == 400, bad
+
+    response = client.get("/api/tasks", params={"sort": "due_date", "limit": 1, "cursor": cursor}, headers=auth_headers)
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()["items"]] == ["t1"]
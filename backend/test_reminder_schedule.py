@@ -0,0 +1,111 @@
+"""
+Reminder rows written by sync_reminder_schedule and the task write paths.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlmodel import select
+
+from database.reminder_schedule import SCHEDULED_TIMERS_KEY, reminder_bucket, set_reminder_leads, sync_reminder_schedule
+from models.todo_models import ReminderSchedule, Task, TaskCreate, TaskStatus, TaskUpdate
+from tasks_crud import create_task_for_user, delete_task, update_task
+
+
+def _due_in(hours: float) -> datetime:
+    return datetime.utcnow().replace(microsecond=0) + timedelta(hours=hours)
+
+
+def _schedule(db, user_id):
+    """(task_id, lead_minutes, remind_at, sent) of a user's reminder rows"""
+    rows = db.exec(
+        select(ReminderSchedule.task_id, ReminderSchedule.lead_minutes, ReminderSchedule.remind_at, ReminderSchedule.sent)
+        .where(ReminderSchedule.user_id == user_id)
+        .order_by(ReminderSchedule.task_id, ReminderSchedule.lead_minutes)
+    ).all()
+    return [tuple(row) for row in rows]
+
+
+def test_sync_schedules_due_time_and_upcoming_lead_reminders(db, user_id):
+    set_reminder_leads(db, user_id, [60, 1440])
+    due = _due_in(2)
+    task = Task(title="Dentist", user_id=user_id, status=TaskStatus.pending, due_date=due)
+    db.add(task)
+    db.flush()
+
+    sync_reminder_schedule(db, user_id, [task.id])
+
+    # The day-before reminder is already in the past, so it is not scheduled
+    assert _schedule(db, user_id) == [
+        (task.id, 0, due, False),
+        (task.id, 60, due - timedelta(minutes=60), False),
+    ]
+    bucket = db.exec(select(ReminderSchedule.bucket).where(ReminderSchedule.task_id == task.id, ReminderSchedule.lead_minutes == 60)).one()
+    assert bucket == reminder_bucket(due - timedelta(minutes=60))
+    assert sorted(db.info[SCHEDULED_TIMERS_KEY][task.id]) == [(0, due), (60, due - timedelta(minutes=60))]
+    db.rollback()
+
+
+def test_sync_skips_sent_due_time_reminder(db, user_id):
+    task = Task(title="Sent", user_id=user_id, status=TaskStatus.pending, due_date=_due_in(1), reminder_sent=True)
+    db.add(task)
+    db.flush()
+
+    sync_reminder_schedule(db, user_id, [task.id])
+
+    assert _schedule(db, user_id) == []
+    db.rollback()
+
+
+def test_create_schedules_only_tasks_with_due_date(db, user_id):
+    due = _due_in(3)
+    dated = create_task_for_user(db, TaskCreate(title="Dated", due_date=due), user_id)
+    create_task_for_user(db, TaskCreate(title="Someday"), user_id)
+
+    assert _schedule(db, user_id) == [(dated.id, 0, due, False)]
+
+
+def test_update_moves_reminders_with_due_date(db, user_id):
+    task = create_task_for_user(db, TaskCreate(title="Moved", due_date=_due_in(3)), user_id)
+    due = _due_in(5)
+
+    update_task(db, task.id, user_id, TaskUpdate(due_date=due))
+
+    assert _schedule(db, user_id) == [(task.id, 0, due, False)]
+
+
+def test_title_update_keeps_reminders(db, user_id):
+    due = _due_in(3)
+    task = create_task_for_user(db, TaskCreate(title="Renamed", due_date=due), user_id)
+
+    update_task(db, task.id, user_id, TaskUpdate(title="Renamed again"))
+
+    assert _schedule(db, user_id) == [(task.id, 0, due, False)]
+
+
+def test_completing_cancels_and_reopening_restores_reminders(db, user_id):
+    due = _due_in(3)
+    task = create_task_for_user(db, TaskCreate(title="Done", due_date=due), user_id)
+
+    update_task(db, task.id, user_id, TaskUpdate(status=TaskStatus.completed))
+    assert _schedule(db, user_id) == []
+
+    update_task(db, task.id, user_id, TaskUpdate(status=TaskStatus.pending))
+    assert _schedule(db, user_id) == [(task.id, 0, due, False)]
+
+
+def test_delete_removes_reminders(db, user_id):
+    task = create_task_for_user(db, TaskCreate(title="Gone", due_date=_due_in(3)), user_id)
+
+    assert delete_task(db, task.id, user_id)
+
+    assert _schedule(db, user_id) == []
+
+
+def test_lead_time_change_reschedules_pending_tasks(db, user_id):
+    due = _due_in(3)
+    task = create_task_for_user(db, TaskCreate(title="Lead", due_date=due), user_id)
+
+    set_reminder_leads(db, user_id, [30])
+    db.commit()
+
+    assert _schedule(db, user_id) == [(task.id, 0, due, False), (task.id, 30, due - timedelta(minutes=30), False)]
@@ -0,0 +1,185 @@
+"""
+In-process reminder scheduler (services/reminder_scheduler.py).
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import select
+
+import services.reminder_scheduler as reminder_scheduler
+from database.reminder_schedule import sync_reminder_schedule
+from models.todo_models import ReminderSchedule, Task, TaskCreate
+from services.reminder_scheduler import ReminderScheduler
+from tasks_crud import create_task_for_user
+
+
+def _scheduler(horizon_minutes=30):
+    """A scheduler that holds every timer within the horizon, without its background task"""
+    scheduler = ReminderScheduler(horizon_minutes=horizon_minutes)
+    scheduler._until = datetime.utcnow() + scheduler.horizon
+    return scheduler
+
+
+def test_due_timers_pop_in_time_order():
+    scheduler = _scheduler()
+    now = datetime.utcnow()
+
+    scheduler._replace({
+        1: [(0, now - timedelta(minutes=1)), (15, now - timedelta(minutes=3))],
+        2: [(0, now - timedelta(minutes=2))],
+        3: [(0, now + timedelta(minutes=5))],
+    })
+
+    assert scheduler._pop_due(now) == [(1, 15), (2, 0), (1, 0)]
+    assert scheduler._pop_due(now) == []
+    assert list(scheduler._timers) == [3]
+
+
+def test_replaced_and_cancelled_timers_are_skipped():
+    scheduler = _scheduler()
+    now = datetime.utcnow()
+    scheduler._replace({1: [(0, now - timedelta(minutes=2))], 2: [(0, now - timedelta(minutes=1))]})
+
+    # Their old heap entries stay until they surface, then no longer match
+    scheduler._replace({1: [(0, now + timedelta(minutes=5))], 2: []})
+
+    assert scheduler._pop_due(now) == []
+    assert scheduler._pop_due(now + timedelta(minutes=5)) == [(1, 0)]
+
+
+def test_timers_beyond_the_horizon_are_left_for_a_refill():
+    scheduler = _scheduler(horizon_minutes=30)
+
+    scheduler._replace({1: [(0, datetime.utcnow() + timedelta(hours=2))]})
+
+    assert scheduler._timers == {} and scheduler._heap == []
+
+
+@pytest.fixture
+def gated_snapshot(monkeypatch, async_engine):
+    """
+    Replaces upcoming_reminders with a snapshot that is returned once the
+    test opens the gate, so a refill can be caught halfway
+    """
+    monkeypatch.setattr(reminder_scheduler, "get_async_engine", lambda: async_engine)
+    snapshot = {"rows": [], "gate": None}
+
+    async def upcoming_reminders(db, until):
+        await snapshot["gate"].wait()
+        return snapshot["rows"]
+
+    monkeypatch.setattr(reminder_scheduler, "upcoming_reminders", upcoming_reminders)
+    return snapshot
+
+
+def test_replace_during_a_refill_wins_over_the_snapshot(gated_snapshot):
+    now = datetime.utcnow()
+    # The snapshot was read before tasks 1 and 2 changed
+    gated_snapshot["rows"] = [
+        (1, 0, now + timedelta(minutes=5)), (2, 0, now + timedelta(minutes=6)), (3, 0, now + timedelta(minutes=7)),
+    ]
+
+    async def run():
+        scheduler = ReminderScheduler(horizon_minutes=30)
+        gated_snapshot["gate"] = asyncio.Event()
+        refill = asyncio.create_task(scheduler._refill())
+        await asyncio.sleep(0)
+        # Before the first refill finishes nothing is in the horizon yet;
+        # the replace must still be kept
+        scheduler._replace({1: [(0, now + timedelta(minutes=10))], 2: []})
+        gated_snapshot["gate"].set()
+        await refill
+        return scheduler
+
+    scheduler = asyncio.run(run())
+
+    assert scheduler._timers == {1: {0: now + timedelta(minutes=10)}, 3: {0: now + timedelta(minutes=7)}}
+    assert sorted(scheduler._heap) == [(now + timedelta(minutes=7), 3, 0), (now + timedelta(minutes=10), 1, 0)]
+
+
+def test_later_refill_takes_the_snapshot_again(gated_snapshot):
+    now = datetime.utcnow()
+    gated_snapshot["rows"] = [(1, 0, now + timedelta(minutes=5))]
+
+    async def run():
+        scheduler = ReminderScheduler(horizon_minutes=30)
+        gated_snapshot["gate"] = asyncio.Event()
+        gated_snapshot["gate"].set()
+        scheduler._replace({1: []})
+        await scheduler._refill()
+        return scheduler
+
+    # The replace came before the refill started, so the snapshot is newer
+    assert asyncio.run(run())._timers == {1: {0: now + timedelta(minutes=5)}}
+
+
+@pytest.fixture
+def running_scheduler(monkeypatch):
+    """
+    Runs a test body on a loop with a process-wide scheduler that only
+    collects timers (its background task is not started)
+    """
+    def run(body):
+        async def main():
+            scheduler = _scheduler()
+            scheduler.loop = asyncio.get_running_loop()
+            monkeypatch.setattr(reminder_scheduler, "_scheduler", scheduler)
+            body()
+            # replace() hands the timers over with call_soon_threadsafe
+            await asyncio.sleep(0)
+            return scheduler
+        return asyncio.run(main())
+    return run
+
+
+def test_committed_reminder_rows_reach_the_scheduler(db, user_id, running_scheduler):
+    due = datetime.utcnow().replace(microsecond=0) + timedelta(minutes=20)
+    created = {}
+
+    def write():
+        created["id"] = create_task_for_user(db, TaskCreate(title="Soon", due_date=due), user_id).id
+
+    scheduler = running_scheduler(write)
+
+    assert scheduler._timers[created["id"]] == {0: due}
+
+
+def test_rolled_back_reminder_rows_never_reach_the_scheduler(db, user_id, running_scheduler):
+    due = datetime.utcnow().replace(microsecond=0) + timedelta(minutes=20)
+    task_id = create_task_for_user(db, TaskCreate(title="Soon"), user_id).id
+
+    def write_and_roll_back():
+        task = db.get(Task, task_id)
+        task.due_date = due
+        sync_reminder_schedule(db, user_id, [task_id])
+        db.rollback()
+        # A later, unrelated commit must not hand over the discarded timers
+        db.commit()
+
+    scheduler = running_scheduler(write_and_roll_back)
+
+    assert task_id not in scheduler._timers
+
+
+def test_running_scheduler_fires_overdue_reminders(db, user_id, async_engine, monkeypatch):
+    monkeypatch.setattr(reminder_scheduler, "get_async_engine", lambda: async_engine)
+    task = create_task_for_user(
+        db, TaskCreate(title="Overdue", due_date=datetime.utcnow() - timedelta(minutes=5)), user_id
+    )
+
+    async def run():
+        scheduler = ReminderScheduler(horizon_minutes=30)
+        scheduler.start()
+        try:
+            for _ in range(100):
+                await asyncio.sleep(0.02)
+                db.expire_all()
+                if db.exec(select(ReminderSchedule.sent).where(ReminderSchedule.task_id == task.id)).all() == [True]:
+                    return True
+            return False
+        finally:
+            await scheduler.stop()
+
+    assert asyncio.run(run())
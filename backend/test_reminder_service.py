@@ -0,0 +1,146 @@
+"""
+Reminder claims: the /reminder-cron sweep and send_task_reminders.
+"""
+
+import asyncio
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database.reminder_schedule import sync_reminder_schedule
+from database.task_version import bump_task_version, get_task_version
+from models.todo_models import OutboxEvent, ReminderSchedule, Task, TaskCreate, TaskStatus, User
+from services.reminder_service import send_due_reminders, send_task_reminders
+from tasks_crud import create_task_for_user
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+def _overdue_task(db, user_id, minutes=5):
+    return create_task_for_user(
+        db, TaskCreate(title="Overdue", due_date=datetime.utcnow() - timedelta(minutes=minutes)), user_id
+    )
+
+
+def _sent(db, task_id):
+    return db.exec(select(ReminderSchedule.sent).where(ReminderSchedule.task_id == task_id)).all()
+
+
+def test_sweep_claims_due_reminders_once(db, user_id, async_engine):
+    task = _overdue_task(db, user_id)
+    version = get_task_version(db, user_id)
+
+    async def sweep():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            return await send_due_reminders(session)
+
+    found, sent = asyncio.run(sweep())
+    assert found >= 1 and sent >= 1
+    db.expire_all()
+    assert _sent(db, task.id) == [True]
+    assert db.get(Task, task.id).reminder_sent
+    assert get_task_version(db, user_id) == version + 1
+    events = db.exec(select(OutboxEvent.payload).where(OutboxEvent.user_id == user_id, OutboxEvent.topic == "reminders")).all()
+    assert len(events) == 1
+
+    # Nothing left to claim
+    assert asyncio.run(sweep()) == (0, 0)
+
+
+def test_send_task_reminders_skips_completed_tasks(db, user_id, async_engine):
+    task = _overdue_task(db, user_id)
+    db.get(Task, task.id).status = TaskStatus.completed
+    db.commit()
+
+    async def fire():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            return await send_task_reminders(session, [(task.id, 0)])
+
+    assert asyncio.run(fire()) == 0
+    assert _sent(db, task.id) == [False]
+
+
+def test_sweep_locks_users_before_reminder_rows(db, user_id, async_engine):
+    """Writers bump users.task_version before rewriting reminder rows; the sweep must too"""
+    _overdue_task(db, user_id)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        compiled = context.compiled.statement if context.compiled is not None else None
+        leases = getattr(compiled, "_for_update_arg", None) is not None
+        statements.append(("LEASE " if leases else "") + " ".join(statement.split()).upper())
+
+    async def sweep():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            return await send_due_reminders(session)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        asyncio.run(sweep())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    bump = next(i for i, sql in enumerate(statements) if sql.startswith("UPDATE USERS"))
+    lease = next(i for i, sql in enumerate(statements) if sql.startswith("LEASE "))
+    claim = next(i for i, sql in enumerate(statements) if sql.startswith("UPDATE REMINDER_SCHEDULE"))
+    assert bump < lease < claim
+    assert not any(sql.startswith("LEASE ") for sql in statements[:bump])
+
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="set TEST_POSTGRES_URL to run against Postgres")
+def test_sweep_and_task_write_do_not_deadlock_on_postgres():
+    """
+    A task write holding the user's row rewrites the reminder rows while a
+    sweep is claiming them, on two connections
+    """
+    from database.connection import get_async_engine, get_engine
+    from database.migrations import run_migrations
+
+    engine = get_engine(TEST_POSTGRES_URL)
+    run_migrations(engine)
+    with Session(engine) as db:
+        user = User(email=f"deadlock-{datetime.utcnow().timestamp()}@example.com", name="Deadlock", password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+        task_id = _overdue_task(db, user_id).id
+
+    sweep_errors = []
+
+    def sweep():
+        async def run():
+            async_engine = get_async_engine(TEST_POSTGRES_URL)
+            try:
+                async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                    await send_task_reminders(session, [(task_id, 0)])
+            finally:
+                await async_engine.dispose()
+        try:
+            asyncio.run(run())
+        except Exception as e:
+            sweep_errors.append(e)
+
+    with Session(engine) as writer:
+        # Like every task write: bump the user's version first...
+        bump_task_version(writer, user_id)
+        thread = threading.Thread(target=sweep)
+        thread.start()
+        # ...let the sweep reach the user's row lock...
+        thread.join(timeout=1.0)
+        # ...then rewrite the reminder rows the sweep wants to lease
+        task = writer.get(Task, task_id)
+        task.due_date = datetime.utcnow() + timedelta(hours=1)
+        sync_reminder_schedule(writer, user_id, [task_id])
+        writer.commit()
+
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert sweep_errors == []
+    with Session(engine) as db:
+        # The sweep waited for the write and found the reminder rescheduled
+        assert _sent(db, task_id) == [False]
@@ -1,12 +1,13 @@
-from sqlmodel import SQLModel, Field, create_engine, Session
+from sqlmodel import SQLModel, Field, Session
 from sqlalchemy import Column, Integer
 from typing import Optional
 from datetime import datetime
 
 from backend.models.todo_models import User
+from backend.database.connection import get_engine
 
 # Create engine
-engine = create_engine("sqlite:///./test_explicit_todo.db", echo=True)
+engine = get_engine("sqlite:///./test_explicit_todo.db")
 
 # Create tables
 SQLModel.metadata.create_all(engine)
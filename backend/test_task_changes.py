@@ -0,0 +1,128 @@
+"""
+Delta sync: GET /api/tasks/changes, tombstones and their retention.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import select
+
+import database.task_version as task_version
+from database.task_version import SYNC_CURSOR_MAX_AGE, purge_task_tombstones, record_task_deletions
+from models.todo_models import TaskCreate, TaskTombstone, TaskUpdate
+from pagination import decode_cursor, encode_cursor
+from tasks_crud import create_task_for_user, delete_task, get_task_changes, update_task
+
+
+def _create(db, user_id, title):
+    return create_task_for_user(db, TaskCreate(title=title), user_id).id
+
+
+def _changes(client, auth_headers, **params):
+    response = client.get("/api/tasks/changes", params=params, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_snapshot_then_creates_updates_and_deletes_since_cursor(client, db, user_id, auth_headers):
+    untouched = _create(db, user_id, "untouched")
+    updated = _create(db, user_id, "updated")
+    deleted = _create(db, user_id, "deleted")
+
+    snapshot = _changes(client, auth_headers)
+    assert sorted(task["id"] for task in snapshot["changed"]) == [untouched, updated, deleted]
+    assert snapshot["deleted"] == [] and not snapshot["has_more"]
+
+    update_task(db, updated, user_id, TaskUpdate(title="updated twice"))
+    update_task(db, updated, user_id, TaskUpdate(title="updated three times"))
+    delete_task(db, deleted, user_id)
+    created = _create(db, user_id, "created")
+
+    delta = _changes(client, auth_headers, since=snapshot["cursor"])
+    assert [(task["id"], task["title"]) for task in delta["changed"]] == [(updated, "updated three times"), (created, "created")]
+    assert delta["deleted"] == [deleted]
+
+    # Nothing new: an empty delta and a cursor that stays usable
+    quiet = _changes(client, auth_headers, since=delta["cursor"])
+    assert quiet["changed"] == [] and quiet["deleted"] == []
+
+
+def test_task_created_and_deleted_between_syncs_is_only_a_tombstone(client, db, user_id, auth_headers):
+    cursor = _changes(client, auth_headers)["cursor"]
+    short_lived = _create(db, user_id, "short lived")
+    delete_task(db, short_lived, user_id)
+
+    delta = _changes(client, auth_headers, since=cursor)
+
+    assert delta["changed"] == []
+    assert delta["deleted"] == [short_lived]
+
+
+def test_has_more_pages_through_tasks_and_tombstones_in_order(client, db, user_id, auth_headers):
+    cursor = _changes(client, auth_headers)["cursor"]
+    first, second, third = (_create(db, user_id, f"t{n}") for n in range(3))
+    delete_task(db, second, user_id)
+
+    seen = []
+    while True:
+        page = _changes(client, auth_headers, since=cursor, limit=1)
+        seen += [("changed", task["id"]) for task in page["changed"]] + [("deleted", task_id) for task_id in page["deleted"]]
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            break
+
+    assert seen == [("changed", first), ("changed", third), ("deleted", second)]
+
+
+def test_cursor_past_retention_gets_410(client, db, user_id, auth_headers):
+    cursor = decode_cursor(_changes(client, auth_headers)["cursor"])
+    expired = encode_cursor({**cursor, "at": int(time.time() - SYNC_CURSOR_MAX_AGE.total_seconds()) - 60})
+    legacy = encode_cursor({"cv": cursor["cv"]})
+
+    for since in (expired, legacy):
+        response = client.get("/api/tasks/changes", params={"since": since}, headers=auth_headers)
+        assert response.status_code == 410
+        assert "resync without since" in response.json()["detail"]
+
+    response = client.get("/api/tasks/changes", params={"since": "garbage!"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_purge_drops_only_tombstones_past_retention(db, user_id):
+    old, recent = _create(db, user_id, "old"), _create(db, user_id, "recent")
+    delete_task(db, old, user_id)
+    delete_task(db, recent, user_id)
+    tombstone = db.exec(select(TaskTombstone).where(TaskTombstone.task_id == old)).one()
+    tombstone.deleted_at = datetime.utcnow() - timedelta(days=60)
+    db.commit()
+
+    purge_task_tombstones(db, datetime.utcnow() - timedelta(days=30))
+    db.commit()
+
+    remaining = db.exec(select(TaskTombstone.task_id).where(TaskTombstone.user_id == user_id)).all()
+    assert remaining == [recent]
+
+
+@pytest.fixture
+def purge_due(monkeypatch):
+    monkeypatch.setattr(task_version, "_next_purge", 0.0)
+
+
+def test_rolled_back_purge_is_retried_by_the_next_deletion(db, user_id, purge_due):
+    record_task_deletions(db, user_id, [999999], 1)
+    db.rollback()
+    assert task_version._next_purge == 0.0
+
+    record_task_deletions(db, user_id, [999999], 1)
+    db.commit()
+    assert task_version._next_purge > time.monotonic()
+
+
+def test_changes_after_cursor_never_skip_a_write(db, user_id):
+    first = get_task_changes(db, user_id)
+    task_id = _create(db, user_id, "later")
+
+    delta = get_task_changes(db, user_id, first.cursor)
+
+    assert [task.id for task in delta.changed] == [task_id]
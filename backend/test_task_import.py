@@ -0,0 +1,161 @@
+"""
+NDJSON task import: POST /api/tasks/import (task_import.TaskImporter).
+"""
+
+import json
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlmodel import select
+
+import task_import
+from models.todo_models import ReminderSchedule, Task, TaskTag
+from task_import import IMPORT_CHUNK_SIZE, MAX_IMPORT_ERRORS, MAX_IMPORT_LINE_BYTES, TaskImporter
+
+
+def _line(**fields) -> bytes:
+    return json.dumps(fields).encode()
+
+
+def _titles(db, user_id):
+    return db.exec(select(Task.title).where(Task.user_id == user_id).order_by(Task.id)).all()
+
+
+def _import(client, auth_headers, content):
+    return client.post(
+        "/api/tasks/import", content=content, headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+    )
+
+
+def test_malformed_lines_are_reported_by_line_number(db, user_id):
+    importer = TaskImporter(user_id)
+
+    importer.add(db, [
+        _line(title="first"),
+        b"{not json",
+        b"",
+        _line(description="no title"),
+        _line(title=["second"]),
+        _line(title="third"),
+    ])
+
+    result = importer.result()
+    assert (result.imported, result.failed) == (2, 3)
+    assert [error.line for error in result.errors] == [2, 4, 5]
+    assert result.errors[0].error.startswith("Invalid JSON")
+    assert _titles(db, user_id) == ["first", "third"]
+
+
+def test_line_numbers_continue_across_chunks(db, user_id):
+    importer = TaskImporter(user_id)
+
+    importer.add(db, [_line(title="a"), _line(title="b")])
+    importer.add(db, [b"[]", _line(title="c")])
+
+    assert [error.line for error in importer.result().errors] == [3]
+
+
+def test_error_list_is_capped_but_failures_are_counted(db, user_id):
+    importer = TaskImporter(user_id)
+
+    importer.add(db, [b"nope"] * (MAX_IMPORT_ERRORS + 5))
+
+    result = importer.result()
+    assert result.failed == MAX_IMPORT_ERRORS + 5
+    assert len(result.errors) == MAX_IMPORT_ERRORS
+    assert _titles(db, user_id) == []
+
+
+def test_tags_and_reminders_are_written_with_the_tasks(db, user_id):
+    due = datetime.utcnow().replace(microsecond=0) + timedelta(hours=3)
+    importer = TaskImporter(user_id)
+
+    importer.add(db, [
+        _line(title="tagged", tags=["home", "home", "errand"]),
+        _line(title="due", due_date=due.isoformat()),
+    ])
+
+    tagged, due_task = db.exec(select(Task).where(Task.user_id == user_id).order_by(Task.id)).all()
+    tags = db.exec(select(TaskTag.tag).where(TaskTag.task_id == tagged.id).order_by(TaskTag.tag)).all()
+    assert tags == ["errand", "home"]
+    # Both tasks share the chunk's version
+    assert tagged.change_version == due_task.change_version
+    scheduled = db.exec(select(ReminderSchedule.task_id).where(ReminderSchedule.user_id == user_id)).all()
+    assert set(scheduled) == {due_task.id}
+
+
+def test_endpoint_imports_and_records_one_event(client, db, user_id, auth_headers, outbox_events):
+    body = b"\n".join([_line(title="one"), b"broken", _line(title="two")])
+
+    response = _import(client, auth_headers, body)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["imported"], result["failed"]) == (2, 1)
+    assert [error["line"] for error in result["errors"]] == [2]
+    assert _titles(db, user_id) == ["one", "two"]
+    events = [payload for topic, payload in outbox_events(user_id) if topic == "task-events"]
+    assert [(event["event_type"], event["imported"], event["failed"]) for event in events] == [("tasks.imported", 2, 1)]
+
+
+def test_oversized_line_keeps_the_chunks_already_committed(client, db, user_id, auth_headers, outbox_events):
+    body = b"\n".join(_line(title=f"task {n}") for n in range(IMPORT_CHUNK_SIZE)) + b"\n"
+
+    response = _import(client, auth_headers, body + b"x" * (MAX_IMPORT_LINE_BYTES + 1))
+
+    assert response.status_code == 400
+    assert f"{IMPORT_CHUNK_SIZE} tasks were imported before the error" in response.json()["detail"]
+    assert len(_titles(db, user_id)) == IMPORT_CHUNK_SIZE
+    events = [payload for topic, payload in outbox_events(user_id) if topic == "task-events"]
+    assert [(event["event_type"], event["imported"]) for event in events] == [("tasks.imported", IMPORT_CHUNK_SIZE)]
+
+
+def test_failed_chunk_is_rolled_back_and_earlier_chunks_stay(db, user_id, monkeypatch):
+    importer = TaskImporter(user_id)
+    importer.add(db, [_line(title="kept")])
+
+    def broken_schedule(*args):
+        raise RuntimeError("lost the connection")
+
+    monkeypatch.setattr(task_import, "sync_reminder_schedule", broken_schedule)
+    with pytest.raises(RuntimeError):
+        importer.add(db, [_line(title="lost")])
+    db.rollback()
+
+    assert _titles(db, user_id) == ["kept"]
+    assert importer.imported == 1
+
+
+class _Psycopg2Cursor:
+    def __init__(self, copied):
+        self.copied = copied
+
+    def copy_expert(self, statement, file):
+        self.copied.append((statement, file.read()))
+
+    def close(self):
+        pass
+
+
+class _PsycopgCursor(_Psycopg2Cursor):
+    @contextmanager
+    def copy(self, statement):
+        data = []
+        yield SimpleNamespace(write=data.append)
+        self.copied.append((statement, "".join(data)))
+
+
+@pytest.mark.parametrize("driver, cursor_class", [("psycopg2", _Psycopg2Cursor), ("psycopg", _PsycopgCursor)])
+def test_copy_uses_the_drivers_copy_api(driver, cursor_class):
+    copied = []
+    dbapi_connection = SimpleNamespace(cursor=lambda: cursor_class(copied))
+    session = SimpleNamespace(
+        get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(driver=driver)),
+        connection=lambda: SimpleNamespace(connection=dbapi_connection),
+    )
+
+    task_import._copy_rows(session, "task_tags", ("task_id", "tag", "user_id"), [(1, "a\tb", 7), (2, None, 7)])
+
+    assert copied == [("COPY task_tags (task_id, tag, user_id) FROM STDIN", "1\ta\\tb\t7\n2\t\\N\t7\n")]
@@ -0,0 +1,96 @@
+"""
+Full-text task search: GET /api/tasks/search (tasks_crud.search_user_tasks).
+"""
+
+import pytest
+
+import tasks_crud
+from models.todo_models import TaskCreate
+from pagination import InvalidCursorError
+from tasks_crud import create_task_for_user, search_user_tasks
+
+
+def _create(db, user_id, title, description=None):
+    return create_task_for_user(db, TaskCreate(title=title, description=description), user_id).id
+
+
+def _titles(page):
+    return [task.title for task in page.items]
+
+
+def _all_pages(db, user_id, q, limit):
+    ids, cursor = [], None
+    while True:
+        page = search_user_tasks(db, user_id, q, limit=limit, cursor=cursor)
+        ids += [task.id for task in page.items]
+        cursor = page.next_cursor
+        if cursor is None:
+            return ids
+
+
+@pytest.fixture(params=["native", "like"])
+def search_backend(request, monkeypatch):
+    """Run a test on the database's text index and on the LIKE fallback"""
+    if request.param == "like":
+        search_score_query = tasks_crud._search_score_query
+        monkeypatch.setattr(
+            tasks_crud, "_search_score_query",
+            lambda user_id, terms, dialect_name: search_score_query(user_id, terms, "other")
+        )
+    return request.param
+
+
+def test_prefix_terms_match_words(db, user_id, search_backend):
+    _create(db, user_id, "Dentist appointment")
+    _create(db, user_id, "Buy groceries", "milk and bread")
+
+    assert _titles(search_user_tasks(db, user_id, "the dent one")) == ["Dentist appointment"]
+    assert _titles(search_user_tasks(db, user_id, "BREA")) == ["Buy groceries"]
+    assert _titles(search_user_tasks(db, user_id, "ntist")) == []
+
+
+def test_tasks_matching_more_terms_rank_first(db, user_id, search_backend):
+    # Unrelated tasks keep the terms rare, as bm25's weighting expects
+    for n in range(10):
+        _create(db, user_id, f"Errand {n}")
+    _create(db, user_id, "Plumber visit")
+    _create(db, user_id, "Dentist plumber bill")
+    _create(db, user_id, "Dentist visit")
+
+    results = _titles(search_user_tasks(db, user_id, "dentist plumber"))
+
+    assert results[0] == "Dentist plumber bill"
+    assert sorted(results[1:]) == ["Dentist visit", "Plumber visit"]
+
+
+def test_search_is_scoped_to_the_user(db, user_id, make_user, search_backend):
+    _create(db, make_user(), "Dentist for someone else")
+
+    assert search_user_tasks(db, user_id, "dentist").items == []
+
+
+def test_cursor_continues_across_equal_scores(db, user_id, search_backend):
+    task_ids = [_create(db, user_id, "Water the plants") for _ in range(7)]
+
+    # Equal scores are ordered by id; no task is repeated or skipped
+    assert _all_pages(db, user_id, "plants", limit=3) == task_ids
+
+
+def test_cursor_is_bound_to_the_query(db, user_id):
+    for _ in range(3):
+        _create(db, user_id, "Water the plants")
+    cursor = search_user_tasks(db, user_id, "plants", limit=1).next_cursor
+
+    with pytest.raises(InvalidCursorError):
+        search_user_tasks(db, user_id, "water", limit=1, cursor=cursor)
+
+
+def test_search_endpoint(client, db, user_id, auth_headers):
+    _create(db, user_id, "Dentist appointment")
+
+    response = client.get("/api/tasks/search", params={"q": "dentist", "fields": "id,title"}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert [item["title"] for item in response.json()["items"]] == ["Dentist appointment"]
+    bad = client.get("/api/tasks/search", params={"q": "dentist", "cursor": "nope"}, headers=auth_headers)
+    assert bad.status_code == 400
@@ -0,0 +1,99 @@
+"""
+Task versions and conditional writes: If-Match on PUT and DELETE /api/tasks/{id}.
+"""
+
+import pytest
+
+from models.todo_models import TaskCreate, TaskUpdate
+from tasks_crud import VersionConflictError, create_task_for_user, update_task
+
+
+def _create(db, user_id, title="task", **fields):
+    return create_task_for_user(db, TaskCreate(title=title, **fields), user_id)
+
+
+def test_update_with_current_version_succeeds(client, db, user_id, auth_headers):
+    task = _create(db, user_id)
+
+    response = client.put(f"/api/tasks/{task.id}", json={"title": "new"}, headers={**auth_headers, "If-Match": '"1"'})
+
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    assert response.headers["ETag"] == '"2"'
+
+
+def test_update_with_stale_version_gets_412_and_leaves_task(client, db, user_id, auth_headers):
+    task = _create(db, user_id, "original")
+    client.put(f"/api/tasks/{task.id}", json={"title": "moved on"}, headers=auth_headers)
+
+    response = client.put(f"/api/tasks/{task.id}", json={"title": "stale"}, headers={**auth_headers, "If-Match": '"1"'})
+
+    assert response.status_code == 412
+    assert response.headers["ETag"] == '"2"'
+    current = client.get("/api/tasks", headers=auth_headers).json()["items"]
+    assert [(item["title"], item["version"]) for item in current] == [("moved on", 2)]
+
+
+@pytest.mark.parametrize("if_match", ['W/"1"', "1", '"abc"'])
+def test_weak_or_foreign_etag_never_matches(client, db, user_id, auth_headers, if_match):
+    task = _create(db, user_id)
+
+    response = client.put(f"/api/tasks/{task.id}", json={"title": "x"}, headers={**auth_headers, "If-Match": if_match})
+
+    assert response.status_code == 412
+
+
+def test_wildcard_if_match_is_unconditional(client, db, user_id, auth_headers):
+    task = _create(db, user_id)
+    client.put(f"/api/tasks/{task.id}", json={"title": "v2"}, headers=auth_headers)
+
+    response = client.put(f"/api/tasks/{task.id}", json={"title": "v3"}, headers={**auth_headers, "If-Match": "*"})
+
+    assert response.status_code == 200
+    assert response.json()["version"] == 3
+
+
+def test_missing_task_is_404_not_412(client, db, user_id, make_user, auth_headers):
+    others = _create(db, make_user(), "not yours")
+    conditional = {**auth_headers, "If-Match": '"1"'}
+
+    for task_id in (others.id, others.id + 100000):
+        assert client.put(f"/api/tasks/{task_id}", json={"title": "x"}, headers=conditional).status_code == 404
+        assert client.delete(f"/api/tasks/{task_id}", headers=conditional).status_code == 404
+
+
+def test_delete_honours_if_match(client, db, user_id, auth_headers):
+    task = _create(db, user_id)
+    client.put(f"/api/tasks/{task.id}", json={"title": "v2"}, headers=auth_headers)
+
+    stale = client.delete(f"/api/tasks/{task.id}", headers={**auth_headers, "If-Match": '"1"'})
+    assert stale.status_code == 412
+    assert stale.headers["ETag"] == '"2"'
+
+    assert client.delete(f"/api/tasks/{task.id}", headers={**auth_headers, "If-Match": '"2"'}).status_code == 204
+    assert client.delete(f"/api/tasks/{task.id}", headers={**auth_headers, "If-Match": '"2"'}).status_code == 404
+
+
+def test_tag_only_update_bumps_versions(client, db, user_id, auth_headers):
+    task = _create(db, user_id, tags=["a"])
+    list_etag = client.get("/api/tasks", headers=auth_headers).headers["ETag"]
+
+    response = client.put(f"/api/tasks/{task.id}", json={"tags": ["b"]}, headers={**auth_headers, "If-Match": '"1"'})
+
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    assert response.json()["tags"] == ["b"]
+    # The listing's ETag moves on too, so a cached list is not answered with 304
+    listing = client.get("/api/tasks", headers={**auth_headers, "If-None-Match": list_etag})
+    assert listing.status_code == 200
+    assert listing.headers["ETag"] != list_etag
+
+
+def test_conflict_reports_current_version(db, user_id):
+    task = _create(db, user_id)
+    update_task(db, task.id, user_id, TaskUpdate(title="v2"))
+
+    with pytest.raises(VersionConflictError) as conflict:
+        update_task(db, task.id, user_id, TaskUpdate(title="stale"), expected_version=1)
+
+    assert conflict.value.current_version == 2
@@ -78,7 +78,7 @@ def verify_database_models():
         # Check if Task has all required fields
         required_fields = [
             'id', 'title', 'description', 'status', 'priority', 
-            'due_date', 'tags', 'recurrence', 'reminder_sent', 
+            'due_date', 'recurrence', 'reminder_sent', 
             'user_id', 'created_at', 'updated_at'
         ]
         
@@ -90,6 +90,13 @@ def verify_database_models():
             else:
                 print(f"✗ Task.{field} MISSING")
                 return False
+
+        # Tags are stored in the task_tags table
+        if hasattr(Task, 'tag_links'):
+            print("✓ Task.tag_links exists (task_tags)")
+        else:
+            print("✗ Task.tag_links MISSING")
+            return False
         
         # Verify enums
         print(f"✓ TaskPriority enum: {[p.value for p in TaskPriority]}")
@@ -109,14 +116,14 @@ def verify_event_service():
     
     try:
         from services.event_service import (
-            publish_task_completed_event,
-            publish_task_reminder_event,
+            enqueue_task_event,
+            enqueue_reminder_events_async,
             handle_recurring_task,
             calculate_next_due_date
         )
         
-        print("✓ publish_task_completed_event imported")
-        print("✓ publish_task_reminder_event imported")
+        print("✓ enqueue_task_event imported")
+        print("✓ enqueue_reminder_events_async imported")
         print("✓ handle_recurring_task imported")
         print("✓ calculate_next_due_date imported")
         